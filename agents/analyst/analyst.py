@@ -16,6 +16,7 @@ Usage:
 """
 
 import argparse
+import hashlib
 import json
 import os
 import sys
@@ -23,9 +24,18 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Optional, Any
 
+# PATH SETUP: project root for shared/ and agents.* imports
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
 # Import data sources
 from sources.propublica import ProPublicaAPI
 from sources.signals import get_signals_for_target
+from sources.trends import compute_trend
+from shared.deadline import Deadline
+from shared.peer_index import benchmarks as peer_benchmarks
+from shared.profile_diff import change_event, describe
 
 
 # =============================================================================
@@ -38,6 +48,9 @@ SCHEMA_VERSION = "1.0.0"
 # Output directories (relative to workspace)
 DEFAULT_OUTPUT_BASE = Path(__file__).parent.parent.parent / "knowledge_base" / "prospects"
 
+# V2-LITE is only started with at least this much of the target's deadline left
+V2_MIN_SECONDS = float(os.environ.get('V2_MIN_SECONDS', '20'))
+
 # State mappings for region detection
 STATE_TO_REGION = {
     # Northeast
@@ -110,17 +123,24 @@ def generate_blinded_name(org_type: str, region: str) -> str:
     return f"Representative {type_str} ({region_str})"
 
 
-def determine_distress_level(expense_ratio: float, runway_years: Optional[float], signals: list) -> str:
-    """Determine overall distress level based on financial metrics and signals."""
+def determine_distress_level(
+    expense_ratio: float,
+    runway_years: Optional[float],
+    signals: list,
+    trend: Optional[Dict[str, Any]] = None
+) -> str:
+    """Determine overall distress level based on financial metrics, signals and multi-year trend."""
     critical_signals = sum(1 for s in signals if s.get('severity') == 'critical')
     warning_signals = sum(1 for s in signals if s.get('severity') == 'warning')
+    deficit_streak = (trend or {}).get('consecutive_deficit_years', 0)
     
     # Critical: Deficit spending >120% OR runway < 2 years OR 2+ critical signals
     if expense_ratio and expense_ratio > 1.2 or (runway_years and runway_years < 2) or critical_signals >= 2:
         return "critical"
     
-    # Elevated: Deficit spending OR runway < 4 years OR 1 critical signal
-    if expense_ratio and expense_ratio > 1.0 or (runway_years and runway_years < 4) or critical_signals >= 1:
+    # Elevated: Deficit spending OR runway < 4 years OR 1 critical signal OR 3+ straight deficit years
+    if (expense_ratio and expense_ratio > 1.0 or (runway_years and runway_years < 4) or critical_signals >= 1
+            or deficit_streak >= 3):
         return "elevated"
     
     # Watch: Borderline metrics OR warning signals
@@ -130,6 +150,46 @@ def determine_distress_level(expense_ratio: float, runway_years: Optional[float]
     return "stable"
 
 
+def calculate_metrics(financial_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Derived V1 metrics of one filing (also used by the national sweep).
+    
+    Returns:
+        Dict with operating_surplus_deficit, expense_ratio, runway_years, tuition_dependency
+    """
+    total_revenue = financial_data.get('total_revenue') or 0
+    total_expenses = financial_data.get('total_expenses') or 0
+    net_assets = financial_data.get('net_assets') or 0
+    operating_surplus_deficit = total_revenue - total_expenses
+    
+    # BUG FIX #1: Expense ratio (expenses / revenue) - NULL SAFETY
+    if total_revenue > 0 and total_expenses is not None:
+        expense_ratio = round(total_expenses / total_revenue, 3)
+    else:
+        expense_ratio = None
+    
+    # BUG FIX #2: Runway years (only if deficit) - NULL SAFETY
+    if operating_surplus_deficit < 0 and net_assets > 0:
+        annual_deficit = abs(operating_surplus_deficit)
+        runway_years = round(net_assets / annual_deficit, 1)
+    else:
+        runway_years = None
+    
+    # BUG FIX #3: Tuition dependency - NULL SAFETY (handles 0 correctly)
+    tuition_revenue = financial_data.get('tuition_revenue')
+    if tuition_revenue is not None and total_revenue > 0:
+        tuition_dependency = round(tuition_revenue / total_revenue, 3)
+    else:
+        tuition_dependency = None
+    
+    return {
+        'operating_surplus_deficit': operating_surplus_deficit,
+        'expense_ratio': expense_ratio,
+        'runway_years': runway_years,
+        'tuition_dependency': tuition_dependency,
+    }
+
+
 # =============================================================================
 # JSON PROFILE GENERATION (Schema v1.0.0) - WITH NULL SAFETY FIXES
 # =============================================================================
@@ -169,27 +229,11 @@ def build_profile_json(
     fiscal_year = financial_data.get('filing_year', datetime.now().year - 1)
     
     # Calculate derived metrics
-    operating_surplus_deficit = total_revenue - total_expenses
-    
-    # BUG FIX #1: Expense ratio (expenses / revenue) - NULL SAFETY
-    if total_revenue > 0 and total_expenses is not None:
-        expense_ratio = round(total_expenses / total_revenue, 3)
-    else:
-        expense_ratio = None
-    
-    # BUG FIX #2: Runway years (only if deficit) - NULL SAFETY
-    if operating_surplus_deficit < 0 and net_assets > 0:
-        annual_deficit = abs(operating_surplus_deficit)
-        runway_years = round(net_assets / annual_deficit, 1)
-    else:
-        runway_years = None
-    
-    # BUG FIX #3: Tuition dependency - NULL SAFETY (handles 0 correctly)
-    tuition_revenue = financial_data.get('tuition_revenue')
-    if tuition_revenue is not None and total_revenue > 0:
-        tuition_dependency = round(tuition_revenue / total_revenue, 3)
-    else:
-        tuition_dependency = None
+    calculated = calculate_metrics(financial_data)
+    operating_surplus_deficit = calculated['operating_surplus_deficit']
+    expense_ratio = calculated['expense_ratio']
+    runway_years = calculated['runway_years']
+    tuition_dependency = calculated['tuition_dependency']
     
     # Determine institution type and region
     state = org_info.get('state', '')
@@ -209,11 +253,15 @@ def build_profile_json(
             "source_url": sig.get('url')
         })
     
+    # Multi-year trend from the filing history fetched alongside the latest filing
+    trend = compute_trend(financial_data.get('history'))
+    
     # Determine distress level
     distress_level = determine_distress_level(
         expense_ratio or 0,
         runway_years,
-        schema_signals
+        schema_signals,
+        trend
     )
     
     # Build the complete profile
@@ -237,6 +285,7 @@ def build_profile_json(
             "ein": ein_formatted,
             "type": org_type,
             "classification": org_info.get('classification'),
+            "ntee_code": org_info.get('ntee_code'),
             "location": {
                 "city": org_info.get('city'),
                 "state": state,
@@ -256,7 +305,7 @@ def build_profile_json(
             "total_expenses": total_expenses,
             "operating_surplus_deficit": operating_surplus_deficit,
             "net_assets": net_assets,
-            "tuition_revenue": tuition_revenue,
+            "tuition_revenue": financial_data.get('tuition_revenue'),
             "contributions": financial_data.get('contributions'),
             "investment_income": financial_data.get('investment_income'),
             "calculated": {
@@ -264,6 +313,7 @@ def build_profile_json(
                 "runway_years": runway_years,
                 "tuition_dependency": tuition_dependency
             },
+            "trend": trend,
             "data_source": {
                 "form": "IRS-990",
                 "tax_period": str(fiscal_year),
@@ -313,6 +363,9 @@ def build_profile_json(
         }
     }
     
+    # Peer percentiles from the in-memory index (no extra I/O per profile)
+    profile["benchmarks"] = peer_benchmarks(profile)
+    
     return profile
 
 
@@ -342,6 +395,59 @@ def format_signals_markdown(signals: list) -> str:
     return "\n".join(output)
 
 
+def format_trend_markdown(trend: Optional[Dict[str, Any]]) -> str:
+    """Multi-year trend table (empty when fewer than two filings are on record)."""
+    if not trend or trend.get('years_covered', 0) < 2:
+        return ""
+    
+    def pct(value):
+        return f"{value:+.1%}" if value is not None else "N/A"
+    
+    burn = trend.get('net_asset_burn_per_year')
+    direction = trend.get('runway_direction')
+    return f"""
+### Multi-Year Trend (FY{trend['first_year']}–FY{trend['last_year']})
+
+| Indicator | Value |
+|-----------|-------|
+| **Revenue CAGR** | {pct(trend.get('revenue_cagr'))} |
+| **Expense CAGR** | {pct(trend.get('expense_cagr'))} |
+| **Deficit Years** | {trend.get('deficit_years', 0)} of {trend['years_covered']} ({trend.get('consecutive_deficit_years', 0)} consecutive) |
+| **Net Asset Burn** | {fmt_currency(burn) + "/yr" if burn else "None"} |
+| **Runway Trajectory** | {direction.capitalize() if direction else "—"} |
+"""
+
+
+BENCHMARK_LABELS = {
+    "expense_ratio": "Expense Ratio",
+    "tuition_dependency": "Tuition Dependency",
+    "runway_years": "Runway (Years)",
+    "revenue_cagr": "Revenue CAGR",
+}
+
+
+def format_benchmarks_markdown(benchmarks: Optional[Dict[str, Any]]) -> str:
+    """Peer percentile table (empty until the peer index has enough institutions)."""
+    metrics = (benchmarks or {}).get('metrics') or {}
+    if not metrics:
+        return ""
+    
+    rows = []
+    for metric, entry in metrics.items():
+        for slice_key, found in entry['slices'].items():
+            cohort = "All institutions" if slice_key == "all" else slice_key.split(":", 1)[1]
+            rows.append(
+                f"| **{BENCHMARK_LABELS.get(metric, metric)}** | {cohort} | "
+                f"Worse than {found['worse_than_pct']}% | {found['peers']} |"
+            )
+    return """
+### Peer Benchmarking
+
+| Metric | Cohort | Position | Peers |
+|--------|--------|----------|-------|
+""" + "\n".join(rows) + "\n"
+
+
 def generate_markdown_dossier(
     target_name: str,
     ein: str,
@@ -422,7 +528,7 @@ def generate_markdown_dossier(
 |-----------|-------|----------------|
 | **Expense Ratio** | {f"{expense_ratio:.1%}" if expense_ratio else "N/A"} | {"⚠️ Deficit spending" if expense_ratio and expense_ratio > 1.0 else "✓ Within budget" if expense_ratio else "—"} |
 | **Runway (Years)** | {f"{runway_years:.1f}" if runway_years else "N/A"} | {"🔴 Critical (<2 years)" if runway_years and runway_years < 2 else "🟡 Limited (<4 years)" if runway_years and runway_years < 4 else "—" if runway_years else "No deficit"} |
-
+{format_trend_markdown(profile.get('financials', {}).get('trend'))}{format_benchmarks_markdown(profile.get('benchmarks'))}
 ---
 
 ## Distress Signals
@@ -512,6 +618,100 @@ For use in external materials (pitch decks, case studies):
     return dossier
 
 
+# =============================================================================
+# INPUT FINGERPRINT (skip regeneration when nothing changed)
+# =============================================================================
+
+def _digest(value: Any) -> str:
+    canonical = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def coarse_benchmarks(benchmarks: Optional[Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+    """Peer positions by decile ({metric: {slice: 0-10}}); peer counts are left out."""
+    return {
+        metric: {slice_key: found['worse_than_pct'] // 10 for slice_key, found in entry['slices'].items()}
+        for metric, entry in ((benchmarks or {}).get('metrics') or {}).items()
+    }
+
+
+def compute_input_fingerprint(
+    target_name: str,
+    ein: str,
+    financial_data: Dict[str, Any],
+    org_info: Dict[str, Any],
+    signals: list,
+    v2_enabled: bool = False,
+    benchmarks: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    SHA-256 over the V1 inputs that shape the dossier: the filing (year,
+    values, history), org metadata, signal list, peer position (by decile,
+    so the benchmark table is refreshed when the cohort moves the target
+    but not for every new peer), whether V2 is enabled and the agent/schema
+    versions. Computed before the V2 phase so a match skips the paid calls;
+    V2 output (LLM prose) is never hashed here. Generation timestamps are
+    deliberately excluded.
+    """
+    return _digest({
+        "agent": AGENT_VERSION,
+        "schema": SCHEMA_VERSION,
+        "target": target_name,
+        "ein": format_ein(ein),
+        "financials": financial_data,
+        "org": org_info,
+        "signals": signals,
+        "benchmarks": coarse_benchmarks(benchmarks),
+        "v2_enabled": v2_enabled,
+    })
+
+
+def v2_source_digest(v2_block: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Digest of the sources the V2 intel cites (per category), not of its wording."""
+    intel = v2_block.get('real_time_intel') if isinstance(v2_block, dict) else None
+    if not intel:
+        return None
+    return _digest(sorted(
+        (category, (signal or {}).get('source'), (signal or {}).get('credibility'))
+        for category, signal in intel.items()
+    ))
+
+
+def reuse_v2_block(profile: Dict[str, Any], previous: Dict[str, Any]) -> None:
+    """Carry the stored V2 block (and its metadata) over into a fresh V1 profile."""
+    for key in ('profile_version', 'v2_signals'):
+        if key in previous:
+            profile[key] = previous[key]
+    profile.setdefault('metadata', {}).update(previous.get('metadata') or {})
+
+
+def read_previous_profile(json_path: Path) -> Optional[Dict[str, Any]]:
+    """The profile currently on disk (None if missing/unreadable)."""
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return previous if isinstance(previous, dict) else None
+
+
+def write_through(profile: Dict[str, Any], json_path: Path) -> None:
+    """
+    Propagate a freshly written profile to the derived stores: profile store
+    (ranking queries), version history (time travel), peer index
+    (benchmarks) and similarity index. Each one is best effort.
+    """
+    from shared.peer_index import update_index
+    from shared.profile_history import record_profile
+    from shared.profile_store import save_profile
+    from shared.similarity import index_profile
+    
+    save_profile(profile, json_path)
+    record_profile(profile)
+    update_index(profile)
+    index_profile(profile, json_path)
+
+
 # =============================================================================
 # MAIN ORCHESTRATOR
 # =============================================================================
@@ -521,7 +721,9 @@ def generate_dossier(
     target_name: str,
     ein: str,
     output_dir: str = None,
-    enable_v2_lite: bool = False
+    enable_v2_lite: bool = False,
+    force: bool = False,
+    deadline: Optional[Deadline] = None
 ) -> Dict[str, str]:
     """
     Generate complete dossier package for a target institution.
@@ -535,11 +737,17 @@ def generate_dossier(
         ein: Employer Identification Number (format: XX-XXXXXXX)
         output_dir: Optional output directory path
         enable_v2_lite: Enable V2.0-LITE intelligence layer (opt-in)
+        force: Rewrite outputs even if the input fingerprint is unchanged
+        deadline: Time budget for this target (default: DOSSIER_DEADLINE_SECONDS
+            from now). Stages it cuts short mark the profile meta.partial.
         
     Returns:
-        Dict with paths: {'markdown': path, 'json': path, 'elapsed_seconds': float}
+        Dict with paths: {'markdown': path, 'json': path, 'elapsed_seconds': float,
+        'status': 'written' | 'unchanged', 'change': shared.profile_diff event or None,
+        'partial': bool}
     """
     start_time = datetime.now()
+    deadline = deadline or Deadline()
     
     print(f"[ANALYST] ══════════════════════════════════════════════════")
     print(f"[ANALYST] Charter & Stone — Deep Dive Analyst Agent {AGENT_VERSION}")
@@ -556,7 +764,7 @@ def generate_dossier(
     print("[ANALYST] Fetching ProPublica data...")
     try:
         # Support both tuple return (financial_data, org_info) and dict return
-        api_result = api.get_organization_financials(ein)
+        api_result = api.get_organization_financials(ein, timeout=deadline.timeout(10))
         if isinstance(api_result, tuple):
             financial_data, org_info = api_result
         else:
@@ -595,8 +803,55 @@ def generate_dossier(
     )
     print(f"[ANALYST] ✓ Profile built (distress_level: {profile['signals']['distress_level']})")
 
+    # Determine output paths
+    if output_dir is None:
+        output_dir = DEFAULT_OUTPUT_BASE
+    else:
+        output_dir = Path(output_dir)
+    
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    # File naming: use EIN for JSON (unique), name for markdown (readable)
+    ein_clean = ein.replace('-', '').replace(' ', '')
+    json_filename = f"{ein_clean}_profile.json"
+    md_filename = f"{sanitize_filename(target_name)}_dossier.md"
+    
+    json_path = output_dir / json_filename
+    md_path = output_dir / md_filename
+    
+    # Skip the paid V2 phase, rendering and writing when every V1 input matches
+    # the last complete run (a partial run or a failed V2 phase is retried)
+    fingerprint = compute_input_fingerprint(
+        target_name, ein, financial_data, org_info, signals, v2_enabled=enable_v2_lite,
+        benchmarks=profile.get('benchmarks')
+    )
+    profile['meta']['input_fingerprint'] = fingerprint
+    previous = read_previous_profile(json_path)
+    previous_meta = (previous or {}).get('meta', {})
+    inputs_match = (previous_meta.get('input_fingerprint') == fingerprint and not previous_meta.get('partial')
+                    and previous_meta.get('v2_status') != 'failed')
+    if not force and md_path.exists() and inputs_match:
+        elapsed = (datetime.now() - start_time).total_seconds()
+        print(f"[ANALYST] ✓ UNCHANGED — inputs match {json_path.name}; nothing rewritten ({elapsed:.2f}s)")
+        return {
+            'markdown': str(md_path),
+            'json': str(json_path),
+            'elapsed_seconds': elapsed,
+            'status': 'unchanged',
+            'change': None,
+            'partial': deadline.partial
+        }
+
     # PHASE 5-6: V2-LITE ENHANCEMENT (NEW)
-    if enable_v2_lite:
+    if enable_v2_lite and not force and inputs_match and (previous or {}).get('v2_signals'):
+        # Only the outputs are missing: reuse the stored intel instead of paying again
+        reuse_v2_block(profile, previous)
+        print("[ANALYST] [V2] ✓ Inputs unchanged; reusing stored V2 intelligence")
+    elif enable_v2_lite and not deadline.allows(V2_MIN_SECONDS):
+        deadline.skip("v2_lite")
+        print(f"[ANALYST] [V2] Skipped (deadline): {deadline.remaining():.1f}s left, "
+              f"needs {V2_MIN_SECONDS:.0f}s")
+    elif enable_v2_lite:
         print("[ANALYST] [V2] Enhancing profile with real-time intelligence...")
         from agents.analyst.core import enhance_profile_with_v2_lite
 
@@ -605,16 +860,50 @@ def generate_dossier(
                 v1_profile=profile,
                 university_name=target_name,
                 ein=ein,
-                enable_v2=True
+                enable_v2=True,
+                deadline=deadline
             )
 
-            v2_block = profile.get('v2_signals', {})
-            print(f"[ANALYST] [V2] ✓ Composite score: {v2_block.get('composite_score')}")
-            print(f"[ANALYST] [V2] ✓ Urgency: {v2_block.get('urgency_flag')}")
+            gate = profile.get('metadata', {}).get('v2_gate')
+            failed_stages = profile.get('metadata', {}).get('v2_failed_stages')
+            if gate and not gate['run']:
+                print(f"[ANALYST] [V2] Skipped ({gate['reason']}): V1 base {gate['base_score']}, "
+                      f"urgency {gate['v1_urgency_flag']}")
+            else:
+                v2_block = profile.get('v2_signals', {})
+                print(f"[ANALYST] [V2] ✓ Composite score: {v2_block.get('composite_score')}")
+                print(f"[ANALYST] [V2] ✓ Urgency: {v2_block.get('urgency_flag')}")
+            if failed_stages:
+                # Degraded intel is written but never reused: the next run retries V2
+                profile['meta']['v2_status'] = 'failed'
+                print(f"[ANALYST] [V2] ⚠️  Failed stages: {', '.join(failed_stages)} (retried next run)")
 
         except Exception as e:
+            profile['meta']['v2_status'] = 'failed'
             print(f"[ANALYST] [V2] ⚠️  V2-LITE enhancement failed: {e}")
-            print("[ANALYST] [V2] ⚠️  Continuing with V1-only profile")
+            print("[ANALYST] [V2] ⚠️  Continuing with V1-only profile (retried next run)")
+    
+    # Same cited sources as last time: keep the stored findings so reworded
+    # model prose alone never shows up as a change (scores stay fresh)
+    v2_sources = v2_source_digest(profile.get('v2_signals'))
+    if v2_sources:
+        if v2_sources == previous_meta.get('v2_sources'):
+            profile['v2_signals']['real_time_intel'] = previous['v2_signals']['real_time_intel']
+        profile['meta']['v2_sources'] = v2_sources
+    
+    if deadline.partial:
+        profile['meta']['partial'] = True
+        profile['meta']['deadline'] = deadline.to_dict()
+        print(f"[ANALYST] ⚠️  Partial profile: deadline cut {', '.join(deadline.skipped)}")
+    
+    # Classify what moved since the previous version (None: nothing material to report)
+    change = change_event(previous, profile)
+    if change:
+        change['fingerprint'] = fingerprint
+    if change and change['materiality'] != 'new':
+        print(f"[ANALYST] Δ {change['materiality'].upper()} change since last profile:")
+        for delta in change['changes']:
+            print(f"[ANALYST]   • {describe(delta)}")
     
     # Generate markdown dossier
     print("[ANALYST] Generating markdown dossier...")
@@ -627,27 +916,13 @@ def generate_dossier(
     )
     print("[ANALYST] ✓ Markdown dossier generated")
     
-    # Determine output paths
-    if output_dir is None:
-        output_dir = DEFAULT_OUTPUT_BASE
-    else:
-        output_dir = Path(output_dir)
-    
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
-    # File naming: use EIN for JSON (unique), name for markdown (readable)
-    ein_clean = ein.replace('-', '').replace(' ', '')
-    json_filename = f"{ein_clean}_profile.json"
-    md_filename = f"{sanitize_filename(target_name)}_dossier.md"
-    
-    json_path = output_dir / json_filename
-    md_path = output_dir / md_filename
-    
     # Write JSON profile
     print(f"[ANALYST] Writing JSON: {json_path}")
     with open(json_path, 'w', encoding='utf-8') as f:
         json.dump(profile, f, indent=2, ensure_ascii=False)
     
+    write_through(profile, json_path)
+    
     # Write markdown dossier
     print(f"[ANALYST] Writing Markdown: {md_path}")
     with open(md_path, 'w', encoding='utf-8') as f:
@@ -663,7 +938,10 @@ def generate_dossier(
     return {
         'markdown': str(md_path),
         'json': str(json_path),
-        'elapsed_seconds': elapsed
+        'elapsed_seconds': elapsed,
+        'status': 'written',
+        'change': change,
+        'partial': deadline.partial
     }
 
 
@@ -685,6 +963,11 @@ def main():
         "--output",
         help="Custom output directory (optional)"
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate even if inputs are unchanged since the last run"
+    )
     
     args = parser.parse_args()
     
@@ -692,12 +975,14 @@ def main():
     paths = generate_dossier(
         target_name=args.target,
         ein=args.ein,
-        output_dir=args.output
+        output_dir=args.output,
+        force=args.force
     )
     
     print(f"\n📄 Markdown Dossier: {paths['markdown']}")
     print(f"📊 JSON Profile:     {paths['json']}")
     print(f"⏱️  Elapsed Time:     {paths['elapsed_seconds']:.2f}s")
+    print(f"🔁 Status:           {paths['status']}")
 
 
 if __name__ == "__main__":
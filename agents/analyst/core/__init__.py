@@ -6,13 +6,17 @@ Orchestration and pipeline management for Analyst V2.0-LITE.
 
 from .orchestrator import (
     AnalystV2Orchestrator,
-    enhance_profile_with_v2_lite
+    V2Gate,
+    enhance_profile_with_v2_lite,
+    get_v2_gate
 )
 
 __version__ = "2.0.0-LITE"
 
 __all__ = [
     'AnalystV2Orchestrator',
+    'V2Gate',
     'enhance_profile_with_v2_lite',
+    'get_v2_gate',
     '__version__',
 ]
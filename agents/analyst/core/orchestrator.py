@@ -4,15 +4,26 @@ Coordinates V1 (IRS 990) and V2 (real-time intelligence) analysis.
 
 Orchestration Flow:
   Phase 1-4: V1 pipeline (existing 990 analysis)
+  Gate:    V2Gate decides whether V2 can move the urgency flag (and fits the budget)
   Phase 5: V2-LITE real-time intelligence layer (NEW)
   Phase 6: Composite scoring and profile merge
 
+Gating: V2 amplification is bounded (+10/+15/+20, composite capped at 100),
+so from some V1 base scores every possible V2 outcome lands on the same
+urgency flag (e.g. base 100, or a stable institution that cannot reach 75).
+Those targets skip the 3 Perplexity queries + Claude call. A process-wide
+gate (get_v2_gate) also enforces V2_BUDGET_USD across a cohort run and
+reports the spend it skipped. Admitted targets are then checked against
+the persistent daily/per-run budgets in shared.spend, at the priority of
+the flag one trusted signal could reach (IMMEDIATE first when money is tight).
+
 Authorization: OPERATION_SNIPER_FINAL_AUTHORIZATION_V2_LITE.md
 """
 
 import json
 import sys
 import os
+import threading
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
@@ -30,6 +41,98 @@ from agents.analyst.sources.v2_lite import (
     extract_signals,
     calculate_composite_score
 )
+from agents.analyst.sources.v2_lite.classification import (
+    AMPLIFICATION,
+    reachable_urgency_flags,
+    urgency_flag,
+    v1_base_score
+)
+from shared import spend
+from shared.deadline import Deadline
+
+# Estimated cost of one V2 run (3 Perplexity queries + 1 Claude extraction)
+V2_RUN_COST_USD = float(os.environ.get('V2_RUN_COST_USD', '0.05'))
+
+
+class V2Gate:
+    """
+    Per-target V2 admission: run only when V2 can change the urgency flag,
+    the estimated cost fits the remaining budget (None = unlimited) and the
+    shared.spend ledger admits it.
+    """
+    
+    def __init__(self, budget_usd: Optional[float] = None, cost_per_run_usd: float = V2_RUN_COST_USD):
+        self.budget_usd = budget_usd
+        self.cost_per_run_usd = cost_per_run_usd
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.spent_usd = 0.0
+        self.skipped: Dict[str, int] = {}
+    
+    def admit(self, v1_profile: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Decide whether to run V2 for one profile; admitted runs are charged.
+        
+        Returns:
+            {'run': bool, 'reason': str, 'base_score', 'v1_urgency_flag', 'priority',
+             'reachable_flags', 'cost_usd'}
+        """
+        base_score = v1_base_score(v1_profile.get('signals', v1_profile))
+        reachable = reachable_urgency_flags(base_score)
+        decision = {
+            "run": False,
+            "reason": "admitted",
+            "base_score": int(base_score),
+            "v1_urgency_flag": urgency_flag(base_score),
+            "priority": urgency_flag(min(base_score + max(AMPLIFICATION.values()), 100)),
+            "reachable_flags": reachable,
+            "cost_usd": self.cost_per_run_usd
+        }
+        
+        with self._lock:
+            if len(reachable) < 2:
+                decision["reason"] = "flag_locked"
+            elif self.budget_usd is not None and self.spent_usd + self.cost_per_run_usd > self.budget_usd + 1e-9:
+                decision["reason"] = "budget_exhausted"
+            else:
+                ledger = spend.admit(self.cost_per_run_usd, decision["priority"])
+                if ledger["admitted"]:
+                    decision["run"] = True
+                    decision["reservation_id"] = ledger.get("reservation_id")
+                    self.runs += 1
+                    self.spent_usd += self.cost_per_run_usd
+                else:
+                    decision["reason"] = ledger["reason"]
+            if not decision["run"]:
+                self.skipped[decision["reason"]] = self.skipped.get(decision["reason"], 0) + 1
+        return decision
+    
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            skipped = sum(self.skipped.values())
+            return {
+                "runs": self.runs,
+                "spent_usd": round(self.spent_usd, 4),
+                "budget_usd": self.budget_usd,
+                "remaining_usd": (round(self.budget_usd - self.spent_usd, 4)
+                                  if self.budget_usd is not None else None),
+                "skipped": dict(self.skipped),
+                "skipped_spend_usd": round(skipped * self.cost_per_run_usd, 4)
+            }
+
+
+_gate: Optional[V2Gate] = None
+_gate_lock = threading.Lock()
+
+
+def get_v2_gate() -> V2Gate:
+    """Process-wide gate; V2_BUDGET_USD (unset = unlimited) caps spend across all targets."""
+    global _gate
+    with _gate_lock:
+        if _gate is None:
+            budget = os.environ.get('V2_BUDGET_USD')
+            _gate = V2Gate(budget_usd=float(budget) if budget else None)
+        return _gate
 
 
 class AnalystV2Orchestrator:
@@ -38,25 +141,29 @@ class AnalystV2Orchestrator:
     Manages Phase 5-6: Real-time intelligence and composite scoring.
     """
     
-    def __init__(self, enable_v2_lite: bool = True):
+    def __init__(self, enable_v2_lite: bool = True, gate: Optional[V2Gate] = None):
         """
         Initialize orchestrator.
         
         Args:
             enable_v2_lite: Toggle V2-LITE features on/off (default: enabled)
+            gate: Optional V2Gate deciding per target whether V2 runs (default: always run)
         """
         self.enable_v2_lite = enable_v2_lite
+        self.gate = gate
         self.system_prompt_path = (
             analyst_dir / "config" / "prompts" / "synthesis_v2.txt"
         )
     
-    def run_v2_lite_recon(self, university_name: str, ein: str) -> Dict[str, Any]:
+    def run_v2_lite_recon(self, university_name: str, ein: str,
+                          deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """
         Phase 5: Execute real-time intelligence reconnaissance.
         
         Args:
             university_name: Full university name
             ein: Employer Identification Number
+            deadline: Optional per-target deadline (see shared.deadline)
             
         Returns:
             Raw reconnaissance results from 3 Perplexity queries
@@ -71,14 +178,16 @@ class AnalystV2Orchestrator:
         recon_results = execute_recon(
             university_name=university_name,
             ein=ein,
-            api_key=os.environ.get('PERPLEXITY_API_KEY')
+            api_key=os.environ.get('PERPLEXITY_API_KEY'),
+            deadline=deadline
         )
         return recon_results
     
     def run_signal_extraction(
         self,
         raw_recon_results: Dict[str, Any],
-        university_name: str
+        university_name: str,
+        deadline: Optional[Deadline] = None
     ) -> Dict[str, Any]:
         """
         Phase 5b: Extract structured signals from raw reconnaissance.
@@ -86,6 +195,7 @@ class AnalystV2Orchestrator:
         Args:
             raw_recon_results: Output from run_v2_lite_recon()
             university_name: Full university name
+            deadline: Optional per-target deadline (see shared.deadline)
             
         Returns:
             Dictionary with extracted signals and metadata
@@ -100,7 +210,8 @@ class AnalystV2Orchestrator:
             raw_perplexity_results=raw_results,
             university_name=university_name,
             api_key=os.environ.get('ANTHROPIC_API_KEY'),
-            system_prompt_path=str(self.system_prompt_path) if self.system_prompt_path.exists() else None
+            system_prompt_path=str(self.system_prompt_path) if self.system_prompt_path.exists() else None,
+            deadline=deadline
         )
         
         return extraction_result
@@ -186,7 +297,8 @@ class AnalystV2Orchestrator:
         self,
         v1_profile: Dict[str, Any],
         university_name: str,
-        ein: str
+        ein: str,
+        deadline: Optional[Deadline] = None
     ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """
         Execute complete V2.0-LITE pipeline (Phases 5-6).
@@ -195,6 +307,10 @@ class AnalystV2Orchestrator:
             v1_profile: Output from V1 analyst pipeline
             university_name: Full university name
             ein: Employer Identification Number
+            deadline: Optional per-target deadline; stages it cuts short are
+                listed in deadline.skipped and metadata['status'] is 'partial'.
+                Recon queries or synthesis that did not succeed are listed in
+                the profile's metadata['v2_failed_stages'] ('degraded' status)
             
         Returns:
             Tuple of (enhanced_profile, metadata_dict)
@@ -210,13 +326,28 @@ class AnalystV2Orchestrator:
             metadata['phases_executed'] = ['V1 only']
             return v1_profile, metadata
         
-        # Phase 5: Reconnaissance
-        recon_results = self.run_v2_lite_recon(university_name, ein)
-        metadata['phases_executed'].append('Phase 5 (Recon)')
+        if self.gate is not None:
+            decision = self.gate.admit(v1_profile)
+            metadata['v2_gate'] = decision
+            if not decision['run']:
+                metadata['phases_executed'] = ['V1 only']
+                metadata['status'] = 'gated'
+                gated_profile = v1_profile.copy()
+                gated_profile['metadata'] = {**gated_profile.get('metadata', {}), 'v2_gate': decision}
+                return gated_profile, metadata
         
-        # Phase 5b: Signal Extraction
-        extracted = self.run_signal_extraction(recon_results, university_name)
-        metadata['phases_executed'].append('Phase 5b (Synthesis)')
+        try:
+            with spend.target(university_name):
+                # Phase 5: Reconnaissance
+                recon_results = self.run_v2_lite_recon(university_name, ein, deadline=deadline)
+                metadata['phases_executed'].append('Phase 5 (Recon)')
+                
+                # Phase 5b: Signal Extraction
+                extracted = self.run_signal_extraction(recon_results, university_name, deadline=deadline)
+                metadata['phases_executed'].append('Phase 5b (Synthesis)')
+        finally:
+            # Real calls are in the ledger now; drop the admission estimate
+            spend.release(metadata.get('v2_gate'))
         
         # Phase 6: Composite Scoring
         composite = self.run_composite_scoring(v1_profile, extracted.get('signals', self._get_null_signals()))
@@ -230,8 +361,17 @@ class AnalystV2Orchestrator:
             composite_score=composite
         )
         
+        failed = [f"recon:{key}" for key, result in (recon_results.get('raw_results') or {}).items()
+                  if result.get('status') != 'success']
+        if extracted.get('status') != 'success':
+            failed.append('synthesis')
+        enhanced_profile['metadata']['v2_failed_stages'] = failed
+        
         metadata['end_timestamp'] = datetime.now(timezone.utc).isoformat()
-        metadata['status'] = 'complete'
+        if deadline is not None and deadline.partial:
+            metadata['status'] = 'partial'
+        else:
+            metadata['status'] = 'degraded' if failed else 'complete'
         
         return enhanced_profile, metadata
     
@@ -261,7 +401,9 @@ def enhance_profile_with_v2_lite(
     v1_profile: Dict[str, Any],
     university_name: str,
     ein: str,
-    enable_v2: bool = True
+    enable_v2: bool = True,
+    gate: Optional[V2Gate] = None,
+    deadline: Optional[Deadline] = None
 ) -> Dict[str, Any]:
     """
     Convenience function to enhance V1 profile with V2.0-LITE signals.
@@ -271,10 +413,13 @@ def enhance_profile_with_v2_lite(
         university_name: Full university name
         ein: Employer Identification Number
         enable_v2: Toggle V2-LITE features (default: enabled)
+        gate: V2Gate to consult (default: the process-wide get_v2_gate())
+        deadline: Optional per-target deadline passed to recon and synthesis
         
     Returns:
-        Enhanced profile with v2_signals block (backward-compatible)
+        Enhanced profile with v2_signals block (backward-compatible); gated
+        targets come back as the V1 profile with metadata['v2_gate'] set
     """
-    orchestrator = AnalystV2Orchestrator(enable_v2_lite=enable_v2)
-    enhanced, _ = orchestrator.run_full_pipeline(v1_profile, university_name, ein)
+    orchestrator = AnalystV2Orchestrator(enable_v2_lite=enable_v2, gate=gate or get_v2_gate())
+    enhanced, _ = orchestrator.run_full_pipeline(v1_profile, university_name, ein, deadline=deadline)
     return enhanced
@@ -6,7 +6,32 @@ API Documentation: https://projects.propublica.org/nonprofits/api
 """
 
 import requests
-from typing import Optional, Dict, Tuple, Any
+from typing import Optional, Dict, List, Tuple, Any
+
+from shared import metrics
+
+from .trends import filing_history
+
+
+def build_financial_data(filings: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Analyst `financial_data` dict from a list of filings in ProPublica's
+    `filings_with_data` field names (most recent filing + full history).
+    """
+    # Most recent filing (the API usually lists it first, but not always)
+    latest = max(filings, key=lambda f: f.get('tax_prd_yr') or 0)
+    
+    return {
+        'filing_year': latest.get('tax_prd_yr'),
+        'total_revenue': latest.get('totrevenue', 0) or 0,
+        'total_expenses': latest.get('totfuncexpns', 0) or 0,
+        'total_assets': latest.get('totassetsend', 0) or 0,
+        'net_assets': latest.get('totnetassetend', 0) or 0,
+        'tuition_revenue': latest.get('totprgmrevnue'),
+        'contributions': latest.get('totcntrbgfts'),
+        'investment_income': latest.get('invstmntinc'),
+        'history': filing_history(filings)
+    }
 
 
 class ProPublicaAPI:
@@ -22,13 +47,18 @@ class ProPublicaAPI:
         self.session.headers.update({
             'User-Agent': 'Charter-Stone-Analyst/1.1'
         })
+        metrics.instrument_session(self.session, "propublica")
     
-    def get_organization_financials(self, ein: str) -> Tuple[Optional[Dict], Dict]:
+    def get_organization_financials(self, ein: str, timeout: float = 10) -> Tuple[Optional[Dict], Dict]:
         """
         Fetch most recent financial filing for an organization.
         
+        The full filing history from the same response is kept in
+        financial_data['history'] (see sources.trends) for trend metrics.
+        
         Args:
             ein: Employer Identification Number (format: XX-XXXXXXX or XXXXXXXXX)
+            timeout: Request timeout in seconds (the caller's remaining deadline)
             
         Returns:
             Tuple of (financial_data dict, org_info dict)
@@ -44,7 +74,7 @@ class ProPublicaAPI:
         url = f"{self.BASE_URL}/organizations/{ein_normalized}.json"
         
         try:
-            response = self.session.get(url, timeout=10)
+            response = self.session.get(url, timeout=timeout)
             response.raise_for_status()
             data = response.json()
             
@@ -56,9 +86,6 @@ class ProPublicaAPI:
                 print(f"[WARNING] No filings found for EIN {ein}")
                 return None, {}
             
-            # Get most recent filing
-            latest = filings[0]
-            
             # Build org_info dict
             org_info = {
                 'name': org_data.get('name'),
@@ -71,17 +98,7 @@ class ProPublicaAPI:
                 'enrollment': None
             }
             
-            # Build financial_data dict
-            financial_data = {
-                'filing_year': latest.get('tax_prd_yr'),
-                'total_revenue': latest.get('totrevenue', 0) or 0,
-                'total_expenses': latest.get('totfuncexpns', 0) or 0,
-                'total_assets': latest.get('totassetsend', 0) or 0,
-                'net_assets': latest.get('totnetassetend', 0) or 0,
-                'tuition_revenue': latest.get('totprgmrevnue'),
-                'contributions': latest.get('totcntrbgfts'),
-                'investment_income': latest.get('invstmntinc')
-            }
+            financial_data = build_financial_data(filings)
             
             return financial_data, org_info
             
@@ -89,6 +106,21 @@ class ProPublicaAPI:
             print(f"[ERROR] ProPublica API Error: {e}")
             return None, {}
     
+    def search_organizations(self, ntee_id: int = 2, state: Optional[str] = None,
+                             page: int = 0) -> Dict[str, Any]:
+        """
+        One page of the organization search (ntee_id 2 = Education).
+        
+        Returns:
+            Raw response: {'organizations': [...], 'num_pages': int, 'cur_page': int, ...}
+        """
+        params = {'ntee[id]': ntee_id, 'page': page}
+        if state:
+            params['state[id]'] = state
+        response = self.session.get(f"{self.BASE_URL}/search.json", params=params, timeout=10)
+        response.raise_for_status()
+        return response.json()
+    
     def _get_mock_albright_data(self) -> Tuple[Dict, Dict]:
         """Return mock data for Albright College in expected format"""
         org_info = {
@@ -0,0 +1,108 @@
+"""
+Multi-Year Financial Trends
+Derives trend metrics from the filing history ProPublica already returns
+with every organization lookup (no extra requests).
+
+History format (oldest first, one entry per tax year in every array):
+    {"years": [...], "revenue": [...], "expenses": [...],
+     "net_assets": [...], "total_assets": [...]}
+"""
+
+from typing import Any, Dict, List, Optional
+
+HISTORY_FIELDS = {
+    "revenue": "totrevenue",
+    "expenses": "totfuncexpns",
+    "net_assets": "totnetassetend",
+    "total_assets": "totassetsend",
+}
+
+
+def filing_history(filings: List[Dict[str, Any]]) -> Dict[str, List]:
+    """
+    Compact per-year arrays from ProPublica `filings_with_data`.
+
+    Amended/duplicate filings for a year collapse to the first one listed
+    (ProPublica lists the most recent first).
+    """
+    by_year: Dict[int, Dict[str, Any]] = {}
+    for filing in filings:
+        year = filing.get("tax_prd_yr")
+        if isinstance(year, int) and year not in by_year:
+            by_year[year] = filing
+
+    years = sorted(by_year)
+    history: Dict[str, List] = {"years": years}
+    for field, source in HISTORY_FIELDS.items():
+        history[field] = [by_year[year].get(source) for year in years]
+    return history
+
+
+def _cagr(first: Optional[float], last: Optional[float], span: int) -> Optional[float]:
+    if not first or not last or first <= 0 or last <= 0 or span <= 0:
+        return None
+    return round((last / first) ** (1 / span) - 1, 4)
+
+
+def _runway(revenue, expenses, net_assets) -> Optional[float]:
+    """Same rule as the point-in-time runway: only defined while running a deficit."""
+    if revenue is None or expenses is None or not net_assets or net_assets <= 0:
+        return None
+    deficit = expenses - revenue
+    return round(net_assets / deficit, 1) if deficit > 0 else None
+
+
+def compute_trend(history: Optional[Dict[str, List]]) -> Dict[str, Any]:
+    """
+    Trend block for `financials.trend`.
+
+    - revenue_cagr / expense_cagr: compound annual growth, first to last year
+    - deficit_years / consecutive_deficit_years: years with expenses > revenue
+      (consecutive = unbroken run ending at the latest year)
+    - net_asset_burn_per_year: average annual decline in net assets (0 if growing)
+    - runway_trajectory: runway per year; runway_direction compares the last two
+    """
+    years = (history or {}).get("years") or []
+    trend: Dict[str, Any] = {
+        "years_covered": len(years),
+        "first_year": years[0] if years else None,
+        "last_year": years[-1] if years else None,
+        "revenue_cagr": None,
+        "expense_cagr": None,
+        "deficit_years": 0,
+        "consecutive_deficit_years": 0,
+        "net_asset_burn_per_year": None,
+        "runway_trajectory": [],
+        "runway_direction": None,
+    }
+    if not years:
+        return trend
+
+    revenue, expenses, net_assets = history["revenue"], history["expenses"], history["net_assets"]
+    span = years[-1] - years[0]
+    trend["revenue_cagr"] = _cagr(revenue[0], revenue[-1], span)
+    trend["expense_cagr"] = _cagr(expenses[0], expenses[-1], span)
+
+    deficits = [r is not None and e is not None and e > r for r, e in zip(revenue, expenses)]
+    trend["deficit_years"] = sum(deficits)
+    for in_deficit in reversed(deficits):
+        if not in_deficit:
+            break
+        trend["consecutive_deficit_years"] += 1
+
+    if span > 0 and net_assets[0] is not None and net_assets[-1] is not None:
+        trend["net_asset_burn_per_year"] = round(max(net_assets[0] - net_assets[-1], 0) / span)
+
+    trend["runway_trajectory"] = [
+        {"year": year, "runway_years": _runway(r, e, n)}
+        for year, r, e, n in zip(years, revenue, expenses, net_assets)
+    ]
+    recent = [point["runway_years"] for point in trend["runway_trajectory"][-2:]]
+    if len(recent) == 2 and None not in recent:
+        if recent[1] < recent[0]:
+            trend["runway_direction"] = "shortening"
+        elif recent[1] > recent[0]:
+            trend["runway_direction"] = "lengthening"
+        else:
+            trend["runway_direction"] = "flat"
+    return trend
@@ -16,9 +16,64 @@ Urgency Flags:
 Authorization: OPERATION_SNIPER_FINAL_AUTHORIZATION_V2_LITE.md
 """
 
-from typing import Dict, Any, Optional
+from itertools import combinations
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
 
+# Amplification per TRUSTED V2 signal
+AMPLIFICATION = {
+    "enrollment_trends": 10,
+    "leadership_changes": 15,
+    "accreditation_status": 20,
+}
+
+# String pain levels (V1 distress_level values included)
+PAIN_LEVEL_MAP = {
+    'CRITICAL': 85,
+    'SEVERE': 75,
+    'ELEVATED': 65,
+    'MODERATE': 50,
+    'WATCH': 50,
+    'LOW': 25,
+    'STABLE': 25,
+    'MINIMAL': 10
+}
+
+
+def v1_base_score(v1_signals: Dict[str, Any]) -> float:
+    """
+    V1 base score (0-100) from 'pain_level_score', 'pain_level' or, failing
+    both, the Analyst's 'distress_level'.
+    """
+    base_score = v1_signals.get('pain_level_score', v1_signals.get('pain_level'))
+    if base_score is None:
+        base_score = v1_signals.get('distress_level', 0)
+    
+    # Handle string representations of pain_level (e.g., "CRITICAL")
+    if isinstance(base_score, str):
+        base_score = PAIN_LEVEL_MAP.get(base_score.upper(), 50)
+    
+    return max(0, min(100, float(base_score)))  # Clamp to 0-100
+
+
+def urgency_flag(composite_score: float) -> str:
+    if composite_score >= 90:
+        return "IMMEDIATE"
+    if composite_score >= 75:
+        return "HIGH"
+    return "MONITOR"
+
+
+def reachable_urgency_flags(base_score: float) -> List[str]:
+    """Urgency flags V2 amplification could produce from `base_score` (capped at 100)."""
+    amplifications = {
+        sum(combo)
+        for size in range(len(AMPLIFICATION) + 1)
+        for combo in combinations(AMPLIFICATION.values(), size)
+    }
+    flags = {urgency_flag(min(base_score + amount, 100)) for amount in amplifications}
+    return [flag for flag in ("MONITOR", "HIGH", "IMMEDIATE") if flag in flags]
+
 
 def calculate_composite_score(
     v1_signals: Dict[str, Any],
@@ -28,7 +83,7 @@ def calculate_composite_score(
     Calculate composite distress score from V1 and V2 signals.
     
     Args:
-        v1_signals: Dictionary with V1 signals including 'pain_level' or 'pain_level_score'
+        v1_signals: Dictionary with V1 signals ('pain_level_score', 'pain_level' or 'distress_level')
         v2_signals: Dictionary with V2 signals (enrollment_trends, leadership_changes, accreditation_status)
         
     Returns:
@@ -36,22 +91,7 @@ def calculate_composite_score(
     """
     
     # Extract base score from V1
-    base_score = v1_signals.get('pain_level_score', v1_signals.get('pain_level', 0))
-    
-    # Handle string representations of pain_level (e.g., "CRITICAL")
-    pain_level_map = {
-        'CRITICAL': 85,
-        'SEVERE': 75,
-        'ELEVATED': 65,
-        'MODERATE': 50,
-        'LOW': 25,
-        'MINIMAL': 10
-    }
-    
-    if isinstance(base_score, str):
-        base_score = pain_level_map.get(base_score.upper(), 50)
-    
-    base_score = max(0, min(100, float(base_score)))  # Clamp to 0-100
+    base_score = v1_base_score(v1_signals)
     
     # Initialize amplification tracker
     amplification = 0
@@ -64,10 +104,10 @@ def calculate_composite_score(
     if enrollment_signal.get('credibility') == 'TRUSTED':
         finding = enrollment_signal.get('finding', '').lower()
         if any(word in finding for word in ['decline', 'drop', 'fell', 'decreased', 'loss', 'reduced']):
-            amplification += 10
+            amplification += AMPLIFICATION["enrollment_trends"]
             amplified_signals.append({
                 "signal": "enrollment_trends",
-                "amplification": 10,
+                "amplification": AMPLIFICATION["enrollment_trends"],
                 "finding_snippet": enrollment_signal.get('finding', 'N/A')[:80]
             })
     
@@ -76,10 +116,10 @@ def calculate_composite_score(
     if leadership_signal.get('credibility') == 'TRUSTED':
         finding = leadership_signal.get('finding', '').lower()
         if any(word in finding for word in ['interim', 'resignation', 'resigned', 'resigned', 'departure', 'departed', 'turnover']):
-            amplification += 15
+            amplification += AMPLIFICATION["leadership_changes"]
             amplified_signals.append({
                 "signal": "leadership_changes",
-                "amplification": 15,
+                "amplification": AMPLIFICATION["leadership_changes"],
                 "finding_snippet": leadership_signal.get('finding', 'N/A')[:80]
             })
     
@@ -88,10 +128,10 @@ def calculate_composite_score(
     if accreditation_signal.get('credibility') == 'TRUSTED':
         finding = accreditation_signal.get('finding', '').lower()
         if any(word in finding for word in ['probation', 'warning', 'closure', 'alert', 'violation', 'sanction']):
-            amplification += 20
+            amplification += AMPLIFICATION["accreditation_status"]
             amplified_signals.append({
                 "signal": "accreditation_status",
-                "amplification": 20,
+                "amplification": AMPLIFICATION["accreditation_status"],
                 "finding_snippet": accreditation_signal.get('finding', 'N/A')[:80]
             })
     
@@ -99,17 +139,9 @@ def calculate_composite_score(
     composite_score = min(base_score + amplification, 100)
     composite_score = int(composite_score)  # Convert to integer
     
-    # Determine urgency flag
-    if composite_score >= 90:
-        urgency_flag = "IMMEDIATE"
-    elif composite_score >= 75:
-        urgency_flag = "HIGH"
-    else:
-        urgency_flag = "MONITOR"
-    
     return {
         "composite_score": composite_score,
-        "urgency_flag": urgency_flag,
+        "urgency_flag": urgency_flag(composite_score),
         "v1_base_score": int(base_score),
         "v2_amplification": amplification,
         "amplified_signals": amplified_signals,
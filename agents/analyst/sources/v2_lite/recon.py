@@ -13,6 +13,9 @@ from typing import Dict, Optional, Any
 from datetime import datetime, timezone
 import os
 
+from shared import metrics, spend
+from shared.deadline import Deadline, DeadlineExceeded, is_timeout
+
 
 class PerplexityReconClient:
     """
@@ -38,16 +41,18 @@ class PerplexityReconClient:
             'Content-Type': 'application/json',
             'User-Agent': 'Charter-Stone-Analyst-V2/2.0'
         })
+        metrics.instrument_session(self.session, "perplexity")
         self.query_count = 0
         self.query_budget = 3
     
-    def _call_perplexity(self, query: str, max_results: int = 5) -> Dict[str, Any]:
+    def _call_perplexity(self, query: str, max_results: int = 5, timeout: float = 30) -> Dict[str, Any]:
         """
         Execute single Perplexity Sonar search.
         
         Args:
             query: Search query string
             max_results: Maximum results to return
+            timeout: Request timeout in seconds
             
         Returns:
             Dictionary with results or error information
@@ -65,17 +70,26 @@ class PerplexityReconClient:
             ]
         }
         
+        start = time.perf_counter()
         try:
             response = self.session.post(
                 f"{self.base_url}/chat/completions",
                 json=payload,
-                timeout=30
+                timeout=timeout
             )
             response.raise_for_status()
             
             self.query_count += 1
             result = response.json()
             
+            usage = result.get('usage') or {}
+            spend.record_call(
+                "perplexity", model=self.model,
+                input_tokens=usage.get('prompt_tokens', 0),
+                output_tokens=usage.get('completion_tokens', 0),
+                latency_ms=(time.perf_counter() - start) * 1000
+            )
+            
             return {
                 "status": "success",
                 "query": query,
@@ -84,14 +98,18 @@ class PerplexityReconClient:
             }
             
         except requests.exceptions.RequestException as e:
+            spend.record_call("perplexity", model=self.model, status=type(e).__name__,
+                              latency_ms=(time.perf_counter() - start) * 1000)
             return {
                 "status": "error",
                 "query": query,
                 "error": str(e),
+                "timed_out": is_timeout(e),
                 "timestamp": datetime.now(timezone.utc).isoformat()
             }
     
-    def execute_recon(self, university_name: str, ein: str) -> Dict[str, Any]:
+    def execute_recon(self, university_name: str, ein: str,
+                      deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """
         Execute 3-query reconnaissance for university.
         
@@ -102,40 +120,51 @@ class PerplexityReconClient:
         Args:
             university_name: Full university name
             ein: Employer Identification Number
+            deadline: Optional per-target deadline; each query gets the remaining
+                budget (at most 30 s). Queries that no longer fit, or time out
+                on it, are recorded as skipped stages
             
         Returns:
             Dictionary with raw search results and metadata
         """
         
         self.query_count = 0
-        results = {
-            "enrollment_financial": None,
-            "leadership": None,
-            "accreditation": None
+        queries = {
+            # Query 1: Enrollment & Financial Stress
+            "enrollment_financial": (
+                f'"{university_name}" enrollment decline financial crisis '
+                f'operating deficit 2024 2025'
+            ),
+            # Query 2: Leadership Changes
+            "leadership": (
+                f'"{university_name}" president CFO resignation interim appointment '
+                f'leadership change 2024 2025'
+            ),
+            # Query 3: Accreditation & Regulatory
+            "accreditation": (
+                f'"{university_name}" accreditation probation MSCHE HLC '
+                f'closure warning regulatory 2024 2025'
+            ),
         }
+        results = {}
         
-        # Query 1: Enrollment & Financial Stress
-        query_1 = (
-            f'"{university_name}" enrollment decline financial crisis '
-            f'operating deficit 2024 2025'
-        )
-        results['enrollment_financial'] = self._call_perplexity(query_1)
-        time.sleep(0.5)  # Rate limiting
-        
-        # Query 2: Leadership Changes
-        query_2 = (
-            f'"{university_name}" president CFO resignation interim appointment '
-            f'leadership change 2024 2025'
-        )
-        results['leadership'] = self._call_perplexity(query_2)
-        time.sleep(0.5)
-        
-        # Query 3: Accreditation & Regulatory
-        query_3 = (
-            f'"{university_name}" accreditation probation MSCHE HLC '
-            f'closure warning regulatory 2024 2025'
-        )
-        results['accreditation'] = self._call_perplexity(query_3)
+        for i, (key, query) in enumerate(queries.items()):
+            if i:
+                time.sleep(0.5)  # Rate limiting
+            try:
+                timeout = deadline.timeout(30) if deadline is not None else 30
+            except DeadlineExceeded as e:
+                deadline.skip(f"recon:{key}")
+                results[key] = {
+                    "status": "skipped",
+                    "query": query,
+                    "error": str(e),
+                    "timestamp": datetime.now(timezone.utc).isoformat()
+                }
+                continue
+            results[key] = self._call_perplexity(query, timeout=timeout)
+            if deadline is not None and results[key].get("timed_out"):
+                deadline.skip(f"recon:{key}")
         
         return {
             "raw_results": results,
@@ -147,7 +176,8 @@ class PerplexityReconClient:
         }
 
 
-def execute_recon(university_name: str, ein: str, api_key: Optional[str] = None) -> Dict[str, Any]:
+def execute_recon(university_name: str, ein: str, api_key: Optional[str] = None,
+                  deadline: Optional[Deadline] = None) -> Dict[str, Any]:
     """
     Convenience function for executing reconnaissance.
     
@@ -155,9 +185,10 @@ def execute_recon(university_name: str, ein: str, api_key: Optional[str] = None)
         university_name: Full university name
         ein: Employer Identification Number
         api_key: Optional API key (uses env variable if not provided)
+        deadline: Optional per-target deadline (see shared.deadline)
         
     Returns:
         Raw reconnaissance results from 3 Perplexity queries
     """
     client = PerplexityReconClient(api_key=api_key)
-    return client.execute_recon(university_name, ein)
+    return client.execute_recon(university_name, ein, deadline=deadline)
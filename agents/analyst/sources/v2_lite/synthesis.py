@@ -13,9 +13,13 @@ Authorization: OPERATION_SNIPER_FINAL_AUTHORIZATION_V2_LITE.md
 
 import json
 import os
+import time
 from typing import Dict, Any, Optional
 from datetime import datetime, timezone
 
+from shared import metrics, spend
+from shared.deadline import Deadline, DeadlineExceeded, is_timeout
+
 
 class SynthesisEngine:
     """
@@ -107,18 +111,38 @@ If search results contain no credible signals for a category, return:
 - Returning malformed JSON
 """
     
-    def extract_signals(self, raw_perplexity_results: Dict[str, Any], university_name: str) -> Dict[str, Any]:
+    def extract_signals(self, raw_perplexity_results: Dict[str, Any], university_name: str,
+                        deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """
         Extract structured signals from raw Perplexity results using Claude.
         
         Args:
             raw_perplexity_results: Dictionary with enrollment_financial, leadership, accreditation results
             university_name: Name of university being analyzed
+            deadline: Optional per-target deadline; the Claude call gets the remaining
+                budget (at most 90 s). It is skipped if too little is left, and
+                recorded as skipped if it times out on that budget
             
         Returns:
             Dictionary with extracted signals (enrollment_trends, leadership_changes, accreditation_status)
         """
         
+        try:
+            request_timeout = deadline.timeout(90.0) if deadline is not None else 90.0
+        except DeadlineExceeded as e:
+            deadline.skip("synthesis")
+            return {
+                "signals": {
+                    name: {"finding": "Skipped (deadline exceeded)", "source": "N/A", "credibility": "N/A"}
+                    for name in ("enrollment_trends", "leadership_changes", "accreditation_status")
+                },
+                "extraction_timestamp": datetime.now(timezone.utc).isoformat(),
+                "university_name": university_name,
+                "model": self.model,
+                "status": "skipped",
+                "error": str(e)
+            }
+        
         # Construct Claude prompt
         user_prompt = f"""MISSION: Extract actionable intelligence signals for {university_name}.
 
@@ -151,18 +175,29 @@ GUARDRAILS:
 - NO weighted scores. NO confidence percentages.
 """
         
+        start = time.perf_counter()
         try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=1024,
-                system=self.system_prompt,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": user_prompt
-                    }
-                ],
-                temperature=0.3  # Low temperature for factual extraction
+            with metrics.track_request("anthropic"):
+                response = self.client.messages.create(
+                    model=self.model,
+                    max_tokens=1024,
+                    system=self.system_prompt,
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": user_prompt
+                        }
+                    ],
+                    temperature=0.3,  # Low temperature for factual extraction
+                    timeout=request_timeout
+                )
+            
+            usage = getattr(response, 'usage', None)
+            spend.record_call(
+                "anthropic", model=self.model,
+                input_tokens=getattr(usage, 'input_tokens', 0) or 0,
+                output_tokens=getattr(usage, 'output_tokens', 0) or 0,
+                latency_ms=(time.perf_counter() - start) * 1000
             )
             
             # Extract response text
@@ -192,6 +227,8 @@ GUARDRAILS:
             }
             
         except Exception as e:
+            if deadline is not None and is_timeout(e):
+                deadline.skip("synthesis")
             return {
                 "signals": {
                     "enrollment_trends": {
@@ -222,7 +259,8 @@ def extract_signals(
     raw_perplexity_results: Dict[str, Any],
     university_name: str,
     api_key: Optional[str] = None,
-    system_prompt_path: Optional[str] = None
+    system_prompt_path: Optional[str] = None,
+    deadline: Optional[Deadline] = None
 ) -> Dict[str, Any]:
     """
     Convenience function for signal extraction.
@@ -232,9 +270,10 @@ def extract_signals(
         university_name: Name of university
         api_key: Optional Claude API key
         system_prompt_path: Optional path to custom system prompt
+        deadline: Optional per-target deadline (see shared.deadline)
         
     Returns:
         Dictionary with extracted signals
     """
     engine = SynthesisEngine(api_key=api_key, system_prompt_path=system_prompt_path)
-    return engine.extract_signals(raw_perplexity_results, university_name)
+    return engine.extract_signals(raw_perplexity_results, university_name, deadline=deadline)
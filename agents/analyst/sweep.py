@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Charter & Stone — National V1 Sweep
+Ranks every higher-ed nonprofit (NTEE major group B) on 990 data alone,
+so the paid V2 stage (Perplexity recon + Claude synthesis) is only spent
+on the institutions most likely to be in distress.
+
+Sources (both streamed, one institution at a time):
+- Bulk extract: local CSV or JSONL of 990 filings, one row per filing.
+  Columns may use ProPublica names (ein, name, state, ntee_code, tax_prd_yr,
+  totrevenue, totfuncexpns, totnetassetend, ...) or IRS SOI/BMF names
+  (EIN, NAME, STATE, NTEE_CD, tax_pd, ...). Rows for the same EIN that are
+  adjacent (extract sorted by EIN) are combined into a filing history.
+- ProPublica crawl: paginated organization search (ntee[id]=2) plus one
+  organization lookup per result, throttled to --rate requests per second.
+
+Every institution gets the same V1 metrics and determine_distress_level()
+as a dossier (analyst.calculate_metrics + sources.trends). Only the top-K
+are held in memory (a bounded heap), so a national sweep runs in constant
+memory; the ranked list is written to CSV and, with --promote N, the first
+N candidates go through generate_dossier(enable_v2_lite=True).
+
+Usage:
+    python3 sweep.py --extract data/irs_990_extract.csv --top 200
+    python3 sweep.py --crawl --state PA --rate 2 --top 50 --promote 10 --budget 2.50
+"""
+
+import argparse
+import csv
+import heapq
+import itertools
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# PATH SETUP: project root for shared/ imports (sources/ and analyst resolve from this folder)
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from analyst import calculate_metrics, determine_distress_level, format_ein, get_region
+from shared import spend
+from sources.propublica import ProPublicaAPI, build_financial_data
+from sources.trends import compute_trend
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+DEFAULT_OUTPUT_PATH = PROJECT_ROOT / "data" / "sweep_candidates.csv"
+
+# NTEE major group B = Educational Institutions (ProPublica search category 2)
+NTEE_PREFIX = "B"
+PROPUBLICA_NTEE_ID = 2
+
+DISTRESS_RANK = {"stable": 0, "watch": 1, "elevated": 2, "critical": 3}
+
+# Extract column name -> ProPublica filing field (lookup is case-insensitive)
+COLUMN_ALIASES = {
+    "ein": "ein",
+    "name": "name",
+    "organization_name": "name",
+    "state": "state",
+    "ntee_code": "ntee_code",
+    "ntee_cd": "ntee_code",
+    "tax_prd_yr": "tax_prd_yr",
+    "filing_year": "tax_prd_yr",
+    "tax_pd": "tax_pd",
+    "totrevenue": "totrevenue",
+    "total_revenue": "totrevenue",
+    "totfuncexpns": "totfuncexpns",
+    "total_expenses": "totfuncexpns",
+    "totnetassetend": "totnetassetend",
+    "net_assets": "totnetassetend",
+    "totassetsend": "totassetsend",
+    "total_assets": "totassetsend",
+    "totprgmrevnue": "totprgmrevnue",
+    "tuition_revenue": "totprgmrevnue",
+}
+
+NUMERIC_FIELDS = ("totrevenue", "totfuncexpns", "totnetassetend", "totassetsend", "totprgmrevnue")
+
+CANDIDATE_COLUMNS = [
+    "rank", "ein", "name", "state", "region", "ntee_code", "fiscal_year", "total_revenue",
+    "expense_ratio", "runway_years", "consecutive_deficit_years", "distress_level",
+]
+
+
+# =============================================================================
+# SOURCES
+# =============================================================================
+
+def _number(value: Any) -> Optional[float]:
+    if value in (None, ""):
+        return None
+    try:
+        return float(str(value).replace(",", ""))
+    except ValueError:
+        return None
+
+
+def normalize_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Map one extract row onto ProPublica filing field names."""
+    filing: Dict[str, Any] = {}
+    for column, value in row.items():
+        field = COLUMN_ALIASES.get(str(column).strip().lower())
+        if field:
+            filing[field] = value.strip() if isinstance(value, str) else value
+
+    # SOI extracts carry the tax period as YYYYMM
+    if not filing.get("tax_prd_yr") and filing.get("tax_pd"):
+        filing["tax_prd_yr"] = str(filing["tax_pd"])[:4]
+    year = _number(filing.get("tax_prd_yr"))
+    filing["tax_prd_yr"] = int(year) if year else None
+
+    for field in NUMERIC_FIELDS:
+        filing[field] = _number(filing.get(field))
+    filing["ein"] = "".join(ch for ch in str(filing.get("ein") or "") if ch.isdigit()).zfill(9)
+    return filing
+
+
+def _read_rows(path: Path) -> Iterator[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.suffix.lower() in (".jsonl", ".ndjson"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+
+def iter_extract(path, ntee_prefix: str = NTEE_PREFIX) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    (financial_data, org_info) per institution from a bulk extract.
+
+    Rows whose NTEE code does not start with `ntee_prefix` are skipped
+    (pass "" for an extract that is already filtered or has no NTEE column).
+    """
+    rows = (normalize_row(row) for row in _read_rows(Path(path)))
+    if ntee_prefix:
+        rows = (r for r in rows if str(r.get("ntee_code") or "").upper().startswith(ntee_prefix))
+
+    for ein, group in itertools.groupby(rows, key=lambda r: r["ein"]):
+        filings = [r for r in group if r["tax_prd_yr"]]
+        if not filings or ein == "000000000":
+            continue
+        latest = max(filings, key=lambda r: r["tax_prd_yr"])
+        org_info = {"name": latest.get("name"), "ein": ein, "state": latest.get("state"),
+                    "ntee_code": latest.get("ntee_code")}
+        # most recent first, as ProPublica lists them (filing_history keeps the first per year)
+        filings.sort(key=lambda r: r["tax_prd_yr"], reverse=True)
+        yield build_financial_data(filings), org_info
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+
+    def wait(self):
+        now = time.monotonic()
+        if now < self._next:
+            time.sleep(self._next - now)
+            now = self._next
+        self._next = now + self.interval
+
+
+def crawl_propublica(
+    api: Optional[ProPublicaAPI] = None,
+    state: Optional[str] = None,
+    rate: float = 1.0,
+    max_pages: Optional[int] = None,
+) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """(financial_data, org_info) per institution from a throttled ProPublica crawl."""
+    api = api or ProPublicaAPI()
+    limiter = RateLimiter(rate)
+    page = 0
+    while max_pages is None or page < max_pages:
+        limiter.wait()
+        try:
+            result = api.search_organizations(PROPUBLICA_NTEE_ID, state=state, page=page)
+        except Exception as e:
+            print(f"⚠️ [SWEEP] Search page {page} failed: {e}; stopping crawl")
+            return
+
+        for org in result.get("organizations") or []:
+            if not str(org.get("ntee_code") or "").upper().startswith(NTEE_PREFIX):
+                continue
+            limiter.wait()
+            financial_data, org_info = api.get_organization_financials(str(org.get("ein")).zfill(9))
+            if financial_data:
+                yield financial_data, {**org_info, "name": org_info.get("name") or org.get("name")}
+
+        page += 1
+        if page >= (result.get("num_pages") or 0):
+            return
+
+
+# =============================================================================
+# RANKING
+# =============================================================================
+
+def score_institution(financial_data: Dict[str, Any], org_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """V1 metrics and distress level of one institution; None without revenue data."""
+    if not financial_data or not financial_data.get("total_revenue"):
+        return None
+    calculated = calculate_metrics(financial_data)
+    trend = compute_trend(financial_data.get("history"))
+    distress_level = determine_distress_level(
+        calculated["expense_ratio"] or 0, calculated["runway_years"], [], trend
+    )
+    state = org_info.get("state") or ""
+    return {
+        "ein": format_ein(str(org_info.get("ein") or "")),
+        "name": org_info.get("name"),
+        "state": state,
+        "region": get_region(state),
+        "ntee_code": org_info.get("ntee_code"),
+        "fiscal_year": financial_data.get("filing_year"),
+        "total_revenue": financial_data.get("total_revenue"),
+        "expense_ratio": calculated["expense_ratio"],
+        "runway_years": calculated["runway_years"],
+        "consecutive_deficit_years": trend["consecutive_deficit_years"],
+        "distress_level": distress_level,
+    }
+
+
+def rank_key(candidate: Dict[str, Any]) -> Tuple:
+    """Larger is more distressed: distress level, then shorter runway, deficit streak, expense ratio."""
+    runway = candidate["runway_years"]
+    return (
+        DISTRESS_RANK[candidate["distress_level"]],
+        -runway if runway is not None else float("-inf"),
+        candidate["consecutive_deficit_years"],
+        candidate["expense_ratio"] or 0,
+    )
+
+
+def sweep(institutions: Iterable[Tuple[Dict[str, Any], Dict[str, Any]]],
+          top_k: int = 100) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Score every institution, keeping only the `top_k` most distressed.
+
+    Returns:
+        (ranked candidates, most distressed first; stats with counts per distress level)
+    """
+    heap: List[Tuple] = []
+    stats: Dict[str, Any] = {"scanned": 0, "scored": 0,
+                             "distress_levels": {level: 0 for level in DISTRESS_RANK}}
+
+    for sequence, (financial_data, org_info) in enumerate(institutions):
+        stats["scanned"] += 1
+        candidate = score_institution(financial_data, org_info)
+        if candidate is None:
+            continue
+        stats["scored"] += 1
+        stats["distress_levels"][candidate["distress_level"]] += 1
+
+        # Earlier institutions win ties (-sequence), so the ranking is deterministic
+        entry = (rank_key(candidate), -sequence, candidate)
+        if len(heap) < top_k:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+
+        if stats["scanned"] % 1000 == 0:
+            print(f"[SWEEP] {stats['scanned']} scanned, {stats['scored']} scored")
+
+    ranked = [entry[2] for entry in sorted(heap, key=lambda e: e[:2], reverse=True)]
+    for rank, candidate in enumerate(ranked, start=1):
+        candidate["rank"] = rank
+    return ranked, stats
+
+
+def write_candidates(candidates: List[Dict[str, Any]], path=DEFAULT_OUTPUT_PATH) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CANDIDATE_COLUMNS)
+        writer.writeheader()
+        writer.writerows(candidates)
+    return path
+
+
+def promote(candidates: List[Dict[str, Any]], output_dir: Optional[str] = None,
+            budget_usd: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Run the full V1+V2 dossier for each candidate; failures are reported and
+    skipped. V2 itself is still gated per target (agents.analyst.core.V2Gate)
+    and every paid call is charged to one shared.spend run capped at budget_usd.
+    """
+    from analyst import generate_dossier
+    from agents.analyst.core import get_v2_gate
+
+    results = []
+    with spend.run("sweep", budget_usd=budget_usd) as run_id:
+        for candidate in candidates:
+            print(f"[SWEEP] Promoting #{candidate['rank']} {candidate['name']} ({candidate['distress_level']})")
+            try:
+                results.append(generate_dossier(candidate["name"], candidate["ein"],
+                                                output_dir=output_dir, enable_v2_lite=True))
+            except (Exception, SystemExit) as e:
+                print(f"⚠️ [SWEEP] Dossier failed for {candidate['name']}: {e}")
+
+    report = get_v2_gate().report()
+    print(f"[SWEEP] V2 runs: {report['runs']} (${report['spent_usd']:.2f} estimated), "
+          f"skipped: {report['skipped'] or 'none'} (${report['skipped_spend_usd']:.2f} saved)")
+    print(f"[SWEEP] Run {run_id} spend: ${spend.get_ledger().spent(run_id=run_id):.4f} "
+          f"(python -m shared.spend runs)")
+    return results
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Rank every higher-ed nonprofit on 990 data before spending on V2"
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--extract", help="Bulk 990 extract (.csv or .jsonl)")
+    source.add_argument("--crawl", action="store_true", help="Crawl the ProPublica search API")
+    parser.add_argument("--ntee-prefix", default=NTEE_PREFIX,
+                        help="NTEE filter for extracts ('' if already filtered)")
+    parser.add_argument("--state", help="Crawl a single state")
+    parser.add_argument("--rate", type=float, default=1.0, help="Crawl requests per second")
+    parser.add_argument("--max-pages", type=int, help="Stop the crawl after N search pages")
+    parser.add_argument("--top", type=int, default=100, help="Candidates to keep")
+    parser.add_argument("--out", default=str(DEFAULT_OUTPUT_PATH), help="Ranked candidate CSV")
+    parser.add_argument("--promote", type=int, default=0,
+                        help="Run V2 dossiers for the first N candidates (paid APIs)")
+    parser.add_argument("--output", help="Dossier output directory for promoted candidates")
+    parser.add_argument("--budget", type=float, help="Spend cap in USD for the promoted V2 runs")
+
+    args = parser.parse_args(argv)
+
+    if args.extract:
+        institutions = iter_extract(args.extract, args.ntee_prefix)
+    else:
+        institutions = crawl_propublica(state=args.state, rate=args.rate, max_pages=args.max_pages)
+
+    ranked, stats = sweep(institutions, top_k=args.top)
+    path = write_candidates(ranked, args.out)
+
+    levels = ", ".join(f"{level}: {count}" for level, count in stats["distress_levels"].items())
+    print(f"[SWEEP] {stats['scored']}/{stats['scanned']} institutions scored ({levels})")
+    print(f"[SWEEP] Top {len(ranked)} written to {path}")
+    for candidate in ranked[:10]:
+        print(f"  {candidate['rank']:>3}. {candidate['name']} ({candidate['state']}) "
+              f"{candidate['distress_level']} expense_ratio={candidate['expense_ratio']} "
+              f"runway={candidate['runway_years']}")
+
+    if args.promote:
+        promote(ranked[:args.promote], args.output, args.budget)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,5 @@
 import sys
 import os
-import time
-import schedule
 import logging
 import logging.handlers
 from datetime import datetime
@@ -22,6 +20,10 @@ if sys.stderr.encoding != 'utf-8':
 from agents.watchdog import scanner as watchdog
 from agents.orchestrator import bridge as orchestrator
 from agents.sentinel import converter as sentinel
+from agents.daemon.scheduler import JobScheduler
+from agents.daemon import pipeline
+from shared.events import EventQueue
+from shared import metrics
 
 # =============================================================================
 # CONFIGURATION
@@ -30,7 +32,26 @@ from agents.sentinel import converter as sentinel
 # How often to run (in minutes)
 WATCHDOG_INTERVAL = 60   # Scan for news every hour
 ORCHESTRATOR_INTERVAL = 15 # Check the inbox every 15 mins
-SENTINEL_INTERVAL = 5    # Process inbox every 5 minutes
+SENTINEL_INTERVAL = 5    # Process inbox every 5 minutes (polling mode)
+SENTINEL_SWEEP_INTERVAL = 60 # Safety-net sweep when the inbox watcher is running
+
+# Sentinel converts files the moment they land (inotify, polling fallback)
+SENTINEL_WATCH_ENABLED = os.getenv("SENTINEL_WATCH", "1") != "0"
+
+# Per-job limits (in minutes) - a run past its timeout is logged and later ticks skip
+WATCHDOG_TIMEOUT = 45
+ORCHESTRATOR_TIMEOUT = 12
+SENTINEL_TIMEOUT = 4
+
+# Random start delay (in seconds) so jobs do not all hit Graph at once
+START_JITTER = 20
+
+# Event pipeline: Watchdog hits flow straight into research/dossier/outreach workers
+EVENT_PIPELINE_ENABLED = os.getenv("EVENT_PIPELINE", "1") != "0"
+EVENTS = None  # shared.events.EventQueue, opened in start_engine()
+
+# Prometheus /metrics endpoint (localhost only); unset = disabled
+METRICS_PORT = os.getenv("DAEMON_METRICS_PORT")
 
 # Logging Setup with Rotating File Handler
 logging.basicConfig(
@@ -46,30 +67,47 @@ logging.basicConfig(
 # JOB WRAPPERS
 # =============================================================================
 
+# Exceptions propagate to the scheduler, which logs "❌ <job> crashed" and
+# records the failed run.
+
 def run_watchdog():
     logging.info("🐺 Releasing the Watchdog...")
-    try:
-        # reload history to ensure fresh state if running long-term
-        watchdog.scan_feeds()
-        logging.info("✅ Watchdog scan complete.")
-    except Exception as e:
-        logging.error(f"❌ Watchdog crashed: {e}")
+    watchdog.scan_feeds(event_queue=EVENTS)
+    logging.info("✅ Watchdog scan complete.")
 
 def run_orchestrator():
     logging.info("🌉 Bridge opening...")
-    try:
-        orchestrator.process_tasks()
-        logging.info("✅ Orchestration complete.")
-    except Exception as e:
-        logging.error(f"❌ Orchestrator crashed: {e}")
+    orchestrator.process_tasks(event_queue=EVENTS)
+    logging.info("✅ Orchestration complete.")
 
 def run_sentinel():
     logging.info("📨 Sentinel processing inbox...")
-    try:
-        sentinel.process_inbox()
-        logging.info("✅ Sentinel processing complete.")
-    except Exception as e:
-        logging.error(f"❌ Sentinel crashed: {e}")
+    sentinel.process_inbox()
+    logging.info("✅ Sentinel processing complete.")
+
+# =============================================================================
+# METRICS
+# =============================================================================
+
+QUEUE_BACKLOG = metrics.REGISTRY.gauge(f"{metrics.PREFIX}_event_queue_events", "Event queue rows by topic and status")
+
+def collect_queue_backlog():
+    if EVENTS is None:
+        return
+    for topic, statuses in EVENTS.counts().items():
+        for status, count in statuses.items():
+            QUEUE_BACKLOG.set(count, topic=topic, status=status)
+
+def record_job_run(run):
+    metrics.observe_job(run.job, run.duration, run.status, run.lag)
+
+def start_metrics_endpoint():
+    if not METRICS_PORT:
+        return None
+    metrics.register_collector(collect_queue_backlog)
+    server = metrics.start_http_server(int(METRICS_PORT))
+    logging.info(f"📈 Metrics endpoint: http://127.0.0.1:{METRICS_PORT}/metrics")
+    return server
 
 # =============================================================================
 # MAIN LOOP
@@ -83,23 +121,47 @@ def start_engine():
     ===================================================
     """)
     
-    # 1. Schedule the Jobs
-    schedule.every(WATCHDOG_INTERVAL).minutes.do(run_watchdog)
-    schedule.every(ORCHESTRATOR_INTERVAL).minutes.do(run_orchestrator)
-    schedule.every(SENTINEL_INTERVAL).minutes.do(run_sentinel)
-    
-    # 2. Run immediately on startup (so you know it works)
+    global EVENTS
+
+    # 0. Start the event pipeline workers (durable queue survives restarts)
+    if EVENT_PIPELINE_ENABLED:
+        EVENTS = EventQueue()
+        pipeline.start_pipeline(EVENTS)
+        logging.info(f"🔗 Event pipeline online: {EVENTS.db_path}")
+
+    # 0b. Direct SharePoint uploads instead of the rclone mount (SENTINEL_PUBLISH=upload)
+    if sentinel.PUBLISH_MODE == "upload":
+        sentinel.start_uploads(EVENTS or EventQueue())
+
+    # 0c. Event-driven Sentinel: the scheduled job becomes a rare safety-net sweep
+    sentinel_interval = SENTINEL_INTERVAL
+    if SENTINEL_WATCH_ENABLED:
+        watcher = sentinel.start_watcher()
+        sentinel_interval = SENTINEL_SWEEP_INTERVAL
+        logging.info(f"👀 Sentinel inbox watcher online ({watcher.backend})")
+
+    # 1. Schedule the Jobs (each runs on its own worker, skipped while still running)
+    scheduler = JobScheduler(logger=logging.getLogger("daemon.scheduler"))
+    scheduler.add_listener(record_job_run)
+    start_metrics_endpoint()
+    scheduler.add_job("Bridge", run_orchestrator, ORCHESTRATOR_INTERVAL * 60,
+                      timeout_seconds=ORCHESTRATOR_TIMEOUT * 60, jitter_seconds=START_JITTER,
+                      run_immediately=True)
+    scheduler.add_job("Sentinel", run_sentinel, sentinel_interval * 60,
+                      timeout_seconds=SENTINEL_TIMEOUT * 60, jitter_seconds=START_JITTER,
+                      run_immediately=True)
+    scheduler.add_job("Watchdog", run_watchdog, WATCHDOG_INTERVAL * 60,
+                      timeout_seconds=WATCHDOG_TIMEOUT * 60, jitter_seconds=START_JITTER,
+                      catch_up="skip", run_immediately=True)
+
+    # 2. Enter the Loop (first tick runs every job immediately, so you know it works)
     logging.info("🚀 Startup: Running initial pass...")
-    run_orchestrator() # Run bridge first to clear inbox
-    run_sentinel()     # Process any pending inbox items
-    run_watchdog()     # Then scan for new leads
-    
-    # 3. Enter the Loop
-    logging.info(f"⏳ Standing by. Watchdog: {WATCHDOG_INTERVAL}m | Bridge: {ORCHESTRATOR_INTERVAL}m | Sentinel: {SENTINEL_INTERVAL}m")
-    
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
+    logging.info(f"⏳ Standing by. Watchdog: {WATCHDOG_INTERVAL}m | Bridge: {ORCHESTRATOR_INTERVAL}m | Sentinel: {sentinel_interval}m")
+
+    try:
+        scheduler.run_forever()
+    finally:
+        scheduler.stop()
 
 if __name__ == "__main__":
     try:
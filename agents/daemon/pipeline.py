@@ -0,0 +1,175 @@
+"""
+Charter & Stone - Event-Driven Agent Pipeline
+
+Wires the agents together through shared.events instead of Planner polling:
+
+    signal.detected      (Watchdog scan_feeds)
+        -> research      Bridge 990 lookup, notes + move written to Planner (sink)
+    prospect.identified
+        -> dossier       Analyst generate_dossier (V1)
+    dossier.generated
+        -> outreach      OutreachArchitect.process_prospect
+    profile.changed
+        -> alert         Teams card for material profile changes
+
+Each stage runs on its own EventWorker thread, so a signal becomes a dossier
+within seconds of the scan instead of waiting for the next 15-minute Bridge poll.
+"""
+
+import os
+import sys
+import logging
+from datetime import datetime
+
+# PATH SETUP: analyst.py imports its sources package relative to its own folder
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, "../../"))
+analyst_root = os.path.join(project_root, "agents", "analyst")
+for path in (project_root, analyst_root):
+    if path not in sys.path:
+        sys.path.append(path)
+
+from shared import notify
+from shared.deadline import DOSSIER_DEADLINE_SECONDS, Deadline
+from shared.auth import get_graph_headers
+from shared.events import EventWorker
+from shared.profile_diff import PROFILE_CHANGED_TOPIC, describe, is_material
+from agents.orchestrator import bridge
+from agents.watchdog.scanner import SIGNAL_TOPIC
+
+PROSPECT_TOPIC = "prospect.identified"
+DOSSIER_TOPIC = "dossier.generated"
+
+TEAMS_WEBHOOK_URL = os.getenv("TEAMS_WEBHOOK_URL")
+
+# Outreach gets its own time budget, started when it dequeues the event:
+# queue wait and retry backoff are not spent on the target
+OUTREACH_DEADLINE_SECONDS = float(os.getenv("OUTREACH_DEADLINE_SECONDS", str(DOSSIER_DEADLINE_SECONDS)))
+
+logger = logging.getLogger("daemon.pipeline")
+
+# =============================================================================
+# STAGE HANDLERS
+# =============================================================================
+
+def handle_signal(payload, queue):
+    """Research the institution behind a Watchdog signal."""
+    org_name = bridge.clean_org_name(payload["title"])
+    logger.info(f"🔎 [PIPELINE] Researching '{org_name}'")
+    data, notes = bridge.research_organization(org_name)
+
+    task_id = payload.get("task_id")
+    if task_id:
+        headers = get_graph_headers()
+        if headers:
+            bridge.file_research(task_id, notes, headers, bridge.get_my_id(headers))
+
+    if data is None:
+        return
+
+    # One dossier per institution per day, however many headlines mention it
+    queue.publish(
+        PROSPECT_TOPIC,
+        {
+            "name": data.organization_name,
+            "ein": data.ein,
+            "signal_link": payload.get("link"),
+            "signal_type": payload.get("signal_type"),
+        },
+        dedupe_key=f"dossier:{data.ein}:{datetime.now().strftime('%Y-%m-%d')}",
+    )
+
+
+def handle_prospect(payload, queue):
+    """Generate the V1 dossier + JSON profile for a researched institution."""
+    from analyst import generate_dossier
+
+    logger.info(f"📊 [PIPELINE] Generating dossier for {payload['name']}")
+    try:
+        paths = generate_dossier(target_name=payload["name"], ein=payload["ein"])
+    except SystemExit as e:
+        # generate_dossier exits the process on missing data; keep the worker alive
+        raise RuntimeError(f"generate_dossier exited with status {e.code}") from e
+
+    if paths.get("status") == "unchanged":
+        logger.info(f"⏭️  [PIPELINE] {payload['name']} unchanged since last dossier; outreach not re-drafted")
+        return
+
+    change = paths.get("change")
+    if change:
+        queue.publish(PROFILE_CHANGED_TOPIC, change, dedupe_key=f"change:{change['ein']}:{change['fingerprint']}")
+    if not is_material(change):
+        logger.info(f"⏭️  [PIPELINE] No material change for {payload['name']}; outreach not re-drafted")
+        return
+
+    queue.publish(
+        DOSSIER_TOPIC,
+        {"name": payload["name"], "ein": payload["ein"], "json": paths["json"], "markdown": paths["markdown"]},
+        dedupe_key=f"outreach:{paths['json']}:{datetime.now().strftime('%Y-%m-%d')}",
+    )
+
+
+def handle_dossier(payload, queue):
+    """Draft the outreach sequence for a freshly generated profile."""
+    if not os.getenv("ANTHROPIC_API_KEY"):
+        logger.info(f"⏭️  [PIPELINE] Outreach skipped for {payload['name']} (ANTHROPIC_API_KEY not set)")
+        return
+
+    from agents.outreach import OutreachArchitect
+
+    result = OutreachArchitect().process_prospect(payload["json"], deadline=Deadline(OUTREACH_DEADLINE_SECONDS))
+    if result["status"] == "skipped":
+        # Deadline or spend budget: nack so the draft is retried (or dead-lettered), never silently dropped
+        raise RuntimeError(f"Outreach skipped for {payload['name']}: {result['reason']}")
+    logger.info(f"✉️  [PIPELINE] Outreach {result['status']} for {payload['name']}")
+
+
+def handle_profile_change(payload, queue):
+    """Alert on material profile changes; everything else is just logged."""
+    summary = "; ".join(describe(change) for change in payload["changes"]) or "first profile"
+    logger.info(f"Δ [PIPELINE] {payload['name']} ({payload['materiality']}): {summary}")
+    if payload["materiality"] != "material" or not TEAMS_WEBHOOK_URL:
+        return
+
+    body = [
+        {"type": "TextBlock", "text": f"Profile change: {payload['name']}", "weight": "Bolder", "size": "Large"},
+        {"type": "TextBlock", "text": f"Distress: {payload['distress_level']} | Urgency: {payload['urgency_flag'] or 'N/A'}",
+         "isSubtle": True},
+    ]
+    body += [{"type": "TextBlock", "text": f"• {describe(change)}", "wrap": True}
+             for change in payload["changes"] if change["materiality"] == "material"]
+    card = {
+        "type": "message",
+        "attachments": [{
+            "contentType": "application/vnd.microsoft.card.adaptive",
+            "content": {"type": "AdaptiveCard", "body": body,
+                        "$schema": "http://adaptivecards.io/schemas/adaptive-card.json", "version": "1.2"},
+        }],
+    }
+    notify.enqueue(TEAMS_WEBHOOK_URL, card, group="analyst:profile-changed",
+                   summary=f"{payload['name']}: {summary}", digest_title="Prospect profile changes")
+
+
+STAGES = [
+    (SIGNAL_TOPIC, handle_signal, "research"),
+    (PROSPECT_TOPIC, handle_prospect, "dossier"),
+    (DOSSIER_TOPIC, handle_dossier, "outreach"),
+    (PROFILE_CHANGED_TOPIC, handle_profile_change, "alert"),
+]
+
+# =============================================================================
+# STARTUP
+# =============================================================================
+
+def start_pipeline(queue):
+    """Recover work orphaned by a previous crash and start one worker per stage."""
+    recovered = queue.recover(all_leases=True)
+    if recovered:
+        logger.info(f"♻️  [PIPELINE] Recovered {recovered} in-flight event(s) from last run")
+
+    workers = []
+    for topic, handler, name in STAGES:
+        worker = EventWorker(queue, topic, handler, name=f"pipeline-{name}", logger=logger)
+        worker.start()
+        workers.append(worker)
+    return workers
@@ -0,0 +1,239 @@
+"""
+Charter & Stone - Daemon Job Scheduler
+
+Runs every daemon job on its own worker thread so a slow Watchdog scan or a
+stalled Graph call can no longer delay the Sentinel or Bridge cycles.
+
+Per job:
+- Overlap protection: a tick that arrives while the previous run is still
+  going is skipped (and recorded), never queued behind it.
+- Start jitter: each run fires up to `jitter_seconds` after its slot so jobs
+  sharing an interval do not hit Graph at the same instant.
+- Timeout: a run exceeding `timeout_seconds` is logged and recorded as
+  'timeout'. Python threads cannot be killed, so the slot stays held until
+  the run returns; later ticks keep being skipped rather than piling up.
+- Catch-up policy for missed ticks (daemon suspended, previous run overran):
+    'coalesce' - run once now, next slot is one interval from now
+    'skip'     - run once now, keep the original grid alignment
+"""
+
+import math
+import random
+import threading
+import time
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Deque, Dict, List, Any
+
+CATCH_UP_POLICIES = ("coalesce", "skip")
+
+
+@dataclass
+class JobRun:
+    """Outcome of a single job run (or skipped tick)."""
+    job: str
+    scheduled_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    status: str = "running"  # running | ok | error | timeout | skipped
+    error: Optional[str] = None
+    missed_ticks: int = 0
+
+    @property
+    def lag(self) -> Optional[float]:
+        """Seconds between the planned start and the actual start."""
+        if self.started_at is None:
+            return None
+        return self.started_at - self.scheduled_at
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+
+@dataclass
+class Job:
+    """A recurring daemon job and its scheduling state."""
+    name: str
+    func: Callable[[], Any]
+    interval: float
+    timeout: Optional[float] = None
+    jitter: float = 0.0
+    catch_up: str = "coalesce"
+    grid: float = 0.0           # next slot on the interval grid
+    next_run: float = 0.0       # grid + jitter offset
+    current: Optional[JobRun] = None
+    history: Deque[JobRun] = field(default_factory=lambda: deque(maxlen=50))
+
+    @property
+    def running(self) -> bool:
+        return self.current is not None
+
+
+class JobScheduler:
+    """Interval scheduler with one worker thread per job run."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, logger: Optional[logging.Logger] = None):
+        self.clock = clock
+        self.logger = logger or logging.getLogger(__name__)
+        self.jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[JobRun], None]] = []
+        self._stop = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------------
+
+    def add_job(
+        self,
+        name: str,
+        func: Callable[[], Any],
+        interval_seconds: float,
+        timeout_seconds: Optional[float] = None,
+        jitter_seconds: float = 0.0,
+        catch_up: str = "coalesce",
+        run_immediately: bool = False,
+    ) -> Job:
+        if catch_up not in CATCH_UP_POLICIES:
+            raise ValueError(f"Unknown catch-up policy '{catch_up}' (use one of {CATCH_UP_POLICIES})")
+
+        now = self.clock()
+        job = Job(
+            name=name,
+            func=func,
+            interval=interval_seconds,
+            timeout=timeout_seconds,
+            jitter=jitter_seconds,
+            catch_up=catch_up,
+        )
+        job.grid = now if run_immediately else now + interval_seconds
+        job.next_run = job.grid + self._jitter(job)
+        self.jobs[name] = job
+        return job
+
+    def add_listener(self, callback: Callable[[JobRun], None]):
+        """Register a callback invoked with every finished or skipped JobRun."""
+        self._listeners.append(callback)
+
+    # ------------------------------------------------------------------
+    # Scheduling loop
+    # ------------------------------------------------------------------
+
+    def tick(self):
+        """Dispatch due jobs and check running ones for timeouts."""
+        now = self.clock()
+        for job in list(self.jobs.values()):
+            self._check_timeout(job, now)
+            if now >= job.next_run:
+                self._dispatch(job, now)
+
+    def run_forever(self, poll_seconds: float = 1.0):
+        while not self._stop.is_set():
+            self.tick()
+            self._stop.wait(poll_seconds)
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-job summary of recent runs (latency and lag in seconds)."""
+        summary = {}
+        for job in self.jobs.values():
+            runs = [r for r in job.history if r.status != "skipped"]
+            durations = [r.duration for r in runs if r.duration is not None]
+            lags = [r.lag for r in runs if r.lag is not None]
+            summary[job.name] = {
+                "running": job.running,
+                "runs": len(runs),
+                "skipped": sum(1 for r in job.history if r.status == "skipped"),
+                "errors": sum(1 for r in runs if r.status in ("error", "timeout")),
+                "last_duration": durations[-1] if durations else None,
+                "max_duration": max(durations) if durations else None,
+                "last_lag": lags[-1] if lags else None,
+                "max_lag": max(lags) if lags else None,
+            }
+        return summary
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _jitter(job: Job) -> float:
+        return random.uniform(0, job.jitter) if job.jitter > 0 else 0.0
+
+    def _advance(self, job: Job, now: float) -> int:
+        """Move the job to its next slot; returns how many ticks were missed."""
+        missed = max(0, math.floor((now - job.grid) / job.interval)) if job.interval > 0 else 0
+        if job.catch_up == "skip":
+            job.grid += job.interval * (missed + 1)
+        else:
+            job.grid = now + job.interval
+        job.next_run = job.grid + self._jitter(job)
+        return missed
+
+    def _dispatch(self, job: Job, now: float):
+        scheduled_at = job.next_run
+        missed = self._advance(job, now)
+
+        with self._lock:
+            skipped = job.running
+            if skipped:
+                run = JobRun(job=job.name, scheduled_at=scheduled_at, status="skipped", missed_ticks=missed)
+                job.history.append(run)
+            else:
+                run = JobRun(job=job.name, scheduled_at=scheduled_at, started_at=now, missed_ticks=missed)
+                job.current = run
+
+        if skipped:
+            self.logger.warning(f"⏭️  {job.name} still running - skipping this tick")
+            self._notify(run)
+            return
+
+        if missed:
+            self.logger.info(f"⏩ {job.name}: {missed} missed tick(s) folded into this run ({job.catch_up})")
+
+        worker = threading.Thread(target=self._run, args=(job, run), name=f"job-{job.name}", daemon=True)
+        worker.start()
+
+    def _run(self, job: Job, run: JobRun):
+        try:
+            job.func()
+            status, error = "ok", None
+        except Exception as e:
+            status, error = "error", str(e)
+            self.logger.error(f"❌ {job.name} crashed: {e}")
+
+        finished = self.clock()
+        with self._lock:
+            run.finished_at = finished
+            if run.status != "timeout":
+                run.status = status
+            run.error = run.error or error
+            job.current = None
+            job.history.append(run)
+
+        self.logger.info(
+            f"⏱️  {job.name} {run.status} in {run.duration:.1f}s (lag {run.lag:.1f}s)"
+        )
+        self._notify(run)
+
+    def _check_timeout(self, job: Job, now: float):
+        run = job.current
+        if not run or not job.timeout or run.status == "timeout":
+            return
+        if now - run.started_at > job.timeout:
+            run.status = "timeout"
+            run.error = f"exceeded {job.timeout:.0f}s timeout"
+            self.logger.error(f"⌛ {job.name} exceeded its {job.timeout:.0f}s timeout - further ticks will be skipped until it returns")
+
+    def _notify(self, run: JobRun):
+        for callback in self._listeners:
+            try:
+                callback(run)
+            except Exception as e:
+                self.logger.error(f"⚠️ Scheduler listener failed: {e}")
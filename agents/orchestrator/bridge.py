@@ -3,7 +3,6 @@ import os
 import json
 import re
 import time
-import requests
 from dotenv import load_dotenv
 import io
 
@@ -14,6 +13,8 @@ sys.path.append(project_root)
 
 # Import Shared Auth & Local Tools
 from shared.auth import get_graph_headers
+from shared.graph import session as graph_session
+from shared import metrics
 from agents.orchestrator.tools import scrape_990  # Changed from 'from .tools'
 
 # Fix encoding for Windows console
@@ -69,23 +70,92 @@ def clean_org_name(task_title):
     
     return name
 
-def process_tasks():
+def get_my_id(headers):
+    """Return the signed-in user's ID (for assignment), or None."""
+    try:
+        me_res = graph_session.get("https://graph.microsoft.com/v1.0/me", headers=headers)
+        return me_res.json().get('id')
+    except:
+        print("⚠️ Could not fetch user ID. Tasks will be unassigned.")
+        return None
+
+def research_organization(org_name):
+    """
+    Run the Deep Dive tool for an organization name.
+
+    Returns:
+        (Filing990Summary or None, notes text for the Planner task)
+    """
+    # CALL THE DEEP DIVE TOOL
+    data = scrape_990(org_name)
+
+    if not data or not data.ein:
+        print("   ⚠️ No 990 found. Moving without data.")
+        return None, "Automated Research: No IRS 990 data found matching this name."
+
+    print(f"   ✅ Data Found: Rev ${data.total_revenue:,}")
+    notes = (
+        f"🤖 Automated Deep Dive:\n"
+        f"Organization: {data.organization_name}\n"
+        f"Tax Year: {data.tax_year}\n"
+        f"Revenue: ${data.total_revenue:,}\n"
+        f"Net Assets: ${data.net_assets:,}\n"
+        f"Link: {data.pdf_url}"
+    )
+    return data, notes
+
+def file_research(task_id, notes, headers, my_id=None):
+    """Append research notes to a Planner task and move it to the Strategy bucket."""
+    # 3. Update Task (Notes)
+    details_res = graph_session.get(f"https://graph.microsoft.com/v1.0/planner/tasks/{task_id}/details", headers=headers)
+    etag = details_res.json()['@odata.etag']
+    existing_desc = details_res.json().get('description', "")
+
+    graph_session.patch(
+        f"https://graph.microsoft.com/v1.0/planner/tasks/{task_id}/details",
+        headers={"Authorization": headers["Authorization"], "Content-Type": "application/json", "If-Match": etag},
+        json={"description": f"{existing_desc}\n\n{notes}", "previewType": "description"}
+    )
+
+    # 4. Move & Assign
+    task_res = graph_session.get(f"https://graph.microsoft.com/v1.0/planner/tasks/{task_id}", headers=headers)
+    task_etag = task_res.json()['@odata.etag']
+
+    payload = {"bucketId": DEST_BUCKET_ID}
+
+    # Add assignment if ID was found
+    if my_id:
+        payload["assignments"] = {
+            my_id: {"@odata.type": "#microsoft.graph.plannerAssignment", "orderHint": " !"}
+        }
+
+    graph_session.patch(
+        f"https://graph.microsoft.com/v1.0/planner/tasks/{task_id}",
+        headers={"Authorization": headers["Authorization"], "Content-Type": "application/json", "If-Match": task_etag},
+        json=payload
+    )
+
+    print(f"   🚀 Moved to Strategy Bucket (Assigned to You)")
+
+def process_tasks(event_queue=None):
+    """
+    Poll the Watchdog Inbox bucket and research every task found there.
+
+    Args:
+        event_queue: Optional shared.events.EventQueue. Tasks whose signal event
+                     is still queued are left to the event pipeline.
+    """
     headers = get_graph_headers()
     if not headers: return
 
     print("🌉 Orchestrator: Checking the Bridge...")
     
     # 0. Get My ID (For Assignment)
-    try:
-        me_res = requests.get("https://graph.microsoft.com/v1.0/me", headers=headers)
-        my_id = me_res.json().get('id')
-    except:
-        print("⚠️ Could not fetch user ID. Tasks will be unassigned.")
-        my_id = None
+    my_id = get_my_id(headers)
 
     # 1. Get Tasks from Source Bucket
     url = f"https://graph.microsoft.com/v1.0/planner/buckets/{SOURCE_BUCKET_ID}/tasks"
-    response = requests.get(url, headers=headers)
+    response = graph_session.get(url, headers=headers)
     
     if response.status_code != 200:
         print(f"❌ Failed to list tasks: {response.text}")
@@ -93,70 +163,31 @@ def process_tasks():
 
     tasks = response.json().get('value', [])
     print(f"📋 Found {len(tasks)} tasks in Inbox.")
+    processed = 0
 
     for task in tasks:
         task_id = task['id']
         title = task['title']
+
+        if event_queue and event_queue.is_open(f"task:{task_id}"):
+            print(f"⏭️  Already queued for the event pipeline: {title}")
+            continue
+
         print(f"⚙️ Processing: {title}")
 
         # 2. Extract Name & Run Research
         org_name = clean_org_name(title)
         print(f"   🔎 Researching: '{org_name}'")
         
-        # Default notes if scraper fails
-        notes = "Automated Research: Analysis pending."
-        
         try:
-            # CALL THE DEEP DIVE TOOL
-            data = scrape_990(org_name)
-            
-            if not data or not data.ein:
-                print("   ⚠️ No 990 found. Moving without data.")
-                notes = "Automated Research: No IRS 990 data found matching this name."
-            else:
-                print(f"   ✅ Data Found: Rev ${data.total_revenue:,}")
-                notes = (
-                    f"🤖 Automated Deep Dive:\n"
-                    f"Organization: {data.organization_name}\n"
-                    f"Tax Year: {data.tax_year}\n"
-                    f"Revenue: ${data.total_revenue:,}\n"
-                    f"Net Assets: ${data.net_assets:,}\n"
-                    f"Link: {data.pdf_url}"
-                )
-
-            # 3. Update Task (Notes)
-            details_res = requests.get(f"https://graph.microsoft.com/v1.0/planner/tasks/{task_id}/details", headers=headers)
-            etag = details_res.json()['@odata.etag']
-            existing_desc = details_res.json().get('description', "")
-            
-            requests.patch(
-                f"https://graph.microsoft.com/v1.0/planner/tasks/{task_id}/details",
-                headers={"Authorization": headers["Authorization"], "Content-Type": "application/json", "If-Match": etag},
-                json={"description": f"{existing_desc}\n\n{notes}", "previewType": "description"}
-            )
-
-            # 4. Move & Assign
-            task_res = requests.get(f"https://graph.microsoft.com/v1.0/planner/tasks/{task_id}", headers=headers)
-            task_etag = task_res.json()['@odata.etag']
-            
-            payload = {"bucketId": DEST_BUCKET_ID}
-            
-            # Add assignment if ID was found
-            if my_id:
-                payload["assignments"] = {
-                    my_id: {"@odata.type": "#microsoft.graph.plannerAssignment", "orderHint": " !"}
-                }
-
-            requests.patch(
-                f"https://graph.microsoft.com/v1.0/planner/tasks/{task_id}",
-                headers={"Authorization": headers["Authorization"], "Content-Type": "application/json", "If-Match": task_etag},
-                json=payload
-            )
-            
-            print(f"   🚀 Moved to Strategy Bucket (Assigned to You)")
+            _, notes = research_organization(org_name)
+            file_research(task_id, notes, headers, my_id)
+            processed += 1
 
         except Exception as e:
             print(f"   ❌ Error processing task: {e}")
 
+    metrics.items_processed("bridge", processed)
+
 if __name__ == "__main__":
     process_tasks()
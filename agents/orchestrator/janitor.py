@@ -1,13 +1,23 @@
 """
 Charter & Stone - Planner Task Janitor
 
-Scans a Planner bucket for duplicate task titles and deletes the extras.
-Keeps the first occurrence, removes subsequent duplicates.
+Scans a Planner bucket for duplicate tasks and deletes the extras.
+Duplicates share a normalized title AND the same source URL in the task
+description, so two different articles with similar headlines survive.
+Keeps the oldest occurrence, removes the rest. A task whose details could
+not be fetched is never deleted: without its source URL it may be a
+different signal.
+
+Usage:
+    python agents/orchestrator/janitor.py             # delete duplicates
+    python agents/orchestrator/janitor.py --dry-run   # report only
 """
 
 import sys
 import os
-import json
+import re
+import argparse
+import unicodedata
 import requests
 from dotenv import load_dotenv
 
@@ -16,8 +26,9 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.abspath(os.path.join(current_dir, "../../"))
 sys.path.append(project_root)
 
-# Import Shared Auth
+# Import Shared Auth & Graph helpers
 from shared.auth import get_graph_headers
+from shared.graph import GRAPH_BASE_URL, iter_paged, batch_requests
 
 # Load env from root
 load_dotenv(os.path.join(project_root, ".env"))
@@ -28,109 +39,216 @@ load_dotenv(os.path.join(project_root, ".env"))
 
 BUCKET_ID = "QDeSpyXMUUaBLf2cJIi84WUALZr_"  # Strategy & Intel bucket
 
+# Watchdog writes "Source: <url>" into every task description
+SOURCE_PATTERN = re.compile(r"Source:\s*(\S+)")
+URL_PATTERN = re.compile(r"https?://\S+")
+
+# =============================================================================
+# DEDUPE HELPERS
+# =============================================================================
+
+def normalize_title(title):
+    """
+    Reduce a task title to a comparison key.
+    Case, punctuation, emoji, the trailing '...' the Watchdog adds and
+    repeated whitespace are all ignored.
+    """
+    text = unicodedata.normalize("NFKC", title or "").lower()
+    text = "".join(c if c.isalnum() else " " for c in text)
+    return " ".join(text.split())
+
+
+def extract_source_url(description):
+    """Pull the article URL out of a task description (None if absent)."""
+    if not description:
+        return None
+    match = SOURCE_PATTERN.search(description)
+    if match:
+        return match.group(1).rstrip(").,")
+    match = URL_PATTERN.search(description)
+    return match.group(0).rstrip(").,") if match else None
+
+
+def find_duplicates(tasks, descriptions, fetched=None):
+    """
+    Group tasks by (normalized title, source URL) and pick the extras.
+
+    Args:
+        tasks: Task dicts from the bucket listing
+        descriptions: {task_id: description} for tasks that needed one
+        fetched: IDs whose details were actually fetched (default: the keys
+                 of descriptions). Other tasks are kept, never deleted.
+
+    Returns:
+        (duplicates, kept) where duplicates is a list of dicts with
+        'id', 'title', 'etag', 'original_id' and kept is the number of
+        unique tasks that remain.
+    """
+    if fetched is None:
+        fetched = set(descriptions)
+
+    groups = {}
+    for task in tasks:
+        if task.get("id") not in fetched:
+            # Unknown source URL: keep it in a group of its own
+            groups[("unfetched", task.get("id"))] = [task]
+            continue
+        key = (
+            normalize_title(task.get("title")),
+            extract_source_url(descriptions.get(task.get("id"))),
+        )
+        groups.setdefault(key, []).append(task)
+
+    duplicates = []
+    for group in groups.values():
+        # Oldest task is the original; ISO timestamps sort lexically
+        group.sort(key=lambda t: t.get("createdDateTime") or "")
+        original = group[0]
+        for task in group[1:]:
+            duplicates.append({
+                "id": task.get("id"),
+                "title": task.get("title", "Untitled"),
+                "etag": task.get("@odata.etag"),
+                "original_id": original.get("id"),
+            })
+
+    return duplicates, len(groups)
+
+
+def fetch_descriptions(tasks, headers):
+    """
+    Fetch task details only for tasks whose normalized title collides with
+    another task; unique titles can never be duplicates.
+    """
+    title_counts = {}
+    for task in tasks:
+        key = normalize_title(task.get("title"))
+        title_counts[key] = title_counts.get(key, 0) + 1
+
+    candidates = [t["id"] for t in tasks if title_counts[normalize_title(t.get("title"))] > 1]
+    if not candidates:
+        return {}
+
+    responses = batch_requests(
+        [{"method": "GET", "url": f"/planner/tasks/{task_id}/details"} for task_id in candidates],
+        headers,
+    )
+
+    descriptions = {}
+    for task_id, response in zip(candidates, responses):
+        if response and response["status"] == 200:
+            descriptions[task_id] = (response["body"] or {}).get("description", "")
+    return descriptions
+
 # =============================================================================
 # JANITOR LOGIC
 # =============================================================================
 
-def cleanup_duplicates():
+def cleanup_duplicates(bucket_id=BUCKET_ID, dry_run=False):
     """
-    Scan bucket for duplicate task titles and delete extras.
-    Keeps first occurrence, deletes subsequent ones.
+    Scan bucket for duplicate tasks and delete extras.
+    Keeps the oldest occurrence, deletes subsequent ones via $batch.
+
+    Args:
+        bucket_id: Planner bucket to clean
+        dry_run: Report what would be deleted without deleting anything
+
+    Returns:
+        Report dict (tasks_scanned, duplicates, deleted, failed, dry_run),
+        or None if authentication or listing failed.
     """
-    
+
     headers = get_graph_headers()
     if not headers:
         print("❌ Failed to authenticate. Cannot proceed.")
-        return
-    
-    print(f"🧹 Janitor starting: Scanning bucket {BUCKET_ID}...")
-    
-    # 1. Get all tasks in the bucket
-    url = f"https://graph.microsoft.com/v1.0/planner/buckets/{BUCKET_ID}/tasks"
+        return None
+
+    print(f"🧹 Janitor starting: Scanning bucket {bucket_id}...")
+
+    # 1. Get all tasks in the bucket (every page)
+    url = f"{GRAPH_BASE_URL}/planner/buckets/{bucket_id}/tasks"
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        tasks = response.json().get('value', [])
+        tasks = list(iter_paged(url, headers))
         print(f"📋 Found {len(tasks)} tasks in bucket.")
     except requests.exceptions.RequestException as e:
         print(f"❌ Failed to list tasks: {e}")
-        return
-    
-    # 2. Track seen titles and identify duplicates
-    seen_titles = {}
-    duplicates = []
-    
-    for task in tasks:
-        task_id = task.get('id')
-        title = task.get('title', 'Untitled')
-        
-        if title in seen_titles:
-            # This is a duplicate!
-            duplicates.append({
-                'id': task_id,
-                'title': title,
-                'original_id': seen_titles[title]['id']
-            })
-        else:
-            # First occurrence - keep it
-            seen_titles[title] = {
-                'id': task_id,
-                'title': title
-            }
-    
+        return None
+
+    # 2. Identify duplicates on normalized title + source URL
+    try:
+        descriptions = fetch_descriptions(tasks, headers)
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Failed to fetch task details: {e}")
+        return None
+
+    duplicates, unique_count = find_duplicates(tasks, descriptions)
+    report = {
+        "tasks_scanned": len(tasks),
+        "unique_tasks": unique_count,
+        "duplicates": duplicates,
+        "deleted": 0,
+        "failed": [],
+        "dry_run": dry_run,
+    }
+
     if not duplicates:
         print("✅ No duplicates found. Bucket is clean!")
-        return
-    
+        return report
+
     print(f"\n⚠️  Found {len(duplicates)} duplicate task(s):")
     for dup in duplicates:
-        print(f"   - '{dup['title']}' (ID: {dup['id'][:8]}...)")
-    
-    # 3. Delete duplicates
+        print(f"   - '{dup['title']}' (ID: {dup['id'][:8]}... → keeps {dup['original_id'][:8]}...)")
+
+    if dry_run:
+        print(f"\n🔍 Dry run: {len(duplicates)} task(s) would be deleted, nothing was changed.")
+        return report
+
+    # 3. Delete duplicates in $batch groups, reusing list-response ETags
     print(f"\n🗑️  Deleting duplicates...")
-    deleted_count = 0
-    
+    deletable = [d for d in duplicates if d["etag"]]
     for dup in duplicates:
-        task_id = dup['id']
-        title = dup['title']
-        
-        try:
-            # First, fetch the task to get the ETag
-            get_url = f"https://graph.microsoft.com/v1.0/planner/tasks/{task_id}"
-            get_response = requests.get(get_url, headers=headers)
-            get_response.raise_for_status()
-            
-            etag = get_response.headers.get('@odata.etag')
-            if not etag:
-                # Try getting it from the response body
-                etag = get_response.json().get('@odata.etag')
-            
-            if not etag:
-                print(f"   ⚠️  Could not get ETag for '{title}' - skipping")
-                continue
-            
-            # Now delete with the ETag
-            delete_headers = headers.copy()
-            delete_headers['If-Match'] = etag
-            
-            delete_response = requests.delete(get_url, headers=delete_headers)
-            delete_response.raise_for_status()
-            print(f"   ✅ Deleted duplicate: '{title}'")
-            deleted_count += 1
-        except requests.exceptions.RequestException as e:
-            print(f"   ❌ Failed to delete '{title}': {e}")
-    
+        if not dup["etag"]:
+            print(f"   ⚠️  No ETag for '{dup['title']}' - skipping")
+            report["failed"].append(dup["id"])
+
+    try:
+        responses = batch_requests(
+            [
+                {"method": "DELETE", "url": f"/planner/tasks/{d['id']}", "headers": {"If-Match": d["etag"]}}
+                for d in deletable
+            ],
+            headers,
+        )
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Batch delete failed: {e}")
+        report["failed"].extend(d["id"] for d in deletable)
+        return report
+
+    for dup, response in zip(deletable, responses):
+        status = response["status"] if response else None
+        if status in (200, 204, 404):  # 404: already gone
+            report["deleted"] += 1
+        else:
+            print(f"   ❌ Failed to delete '{dup['title']}': HTTP {status}")
+            report["failed"].append(dup["id"])
+
     # 4. Summary
     print(f"\n{'='*60}")
     print(f"✅ Cleanup complete!")
-    print(f"   - Duplicates deleted: {deleted_count}/{len(duplicates)}")
-    print(f"   - Unique tasks remaining: {len(seen_titles)}")
+    print(f"   - Duplicates deleted: {report['deleted']}/{len(duplicates)}")
+    print(f"   - Unique tasks remaining: {unique_count}")
     print(f"{'='*60}")
+    return report
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Remove duplicate Planner tasks from a bucket")
+    parser.add_argument("--bucket", default=BUCKET_ID, help="Planner bucket ID")
+    parser.add_argument("--dry-run", action="store_true", help="Report duplicates without deleting")
+    args = parser.parse_args()
+
     try:
-        cleanup_duplicates()
+        cleanup_duplicates(bucket_id=args.bucket, dry_run=args.dry_run)
     except KeyboardInterrupt:
         print("\n⏸️  Janitor interrupted by user.")
     except Exception as e:
@@ -13,12 +13,21 @@ API Documentation: https://projects.propublica.org/nonprofits/api
 """
 
 import sys
+import os
 import json
 import requests
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
 from urllib.parse import quote
 
+# PATH SETUP: Add root to sys.path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, "../../"))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from shared import metrics
+
 
 # =============================================================================
 # CONFIGURATION
@@ -36,6 +45,9 @@ HEADERS = {
     "User-Agent": "Charter-Stone-990-Scraper/1.0 (Higher Education Research)"
 }
 
+# Pooled, instrumented session for all ProPublica calls
+SESSION = metrics.instrument_session(requests.Session(), "propublica")
+
 
 # =============================================================================
 # DATA STRUCTURES
@@ -129,7 +141,7 @@ def search_organization(name: str, state: Optional[str] = None) -> List[Dict[str
         params["state[id]"] = state.upper()
     
     try:
-        response = requests.get(
+        response = SESSION.get(
             SEARCH_ENDPOINT,
             params=params,
             headers=HEADERS,
@@ -161,7 +173,7 @@ def get_organization_details(ein: str) -> Optional[Dict[str, Any]]:
     url = f"{ORG_ENDPOINT}/{ein_clean}.json"
     
     try:
-        response = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
+        response = SESSION.get(url, headers=HEADERS, timeout=TIMEOUT)
         response.raise_for_status()
         return response.json()
     
@@ -192,15 +204,11 @@ def get_most_recent_filing(org_data: Dict[str, Any]) -> Optional[Dict[str, Any]]
     if not filings:
         # Fall back to filings without extracted data (PDF only)
         filings = org_data.get("filings_without_data", [])
-        if filings:
-            # Sort by tax period year descending
-            filings_sorted = sorted(filings, key=lambda x: x.get("tax_prd_yr", 0), reverse=True)
-            return filings_sorted[0] if filings_sorted else None
-        return None
+        if not filings:
+            return None
     
-    # Sort by tax period year descending to get most recent
-    filings_sorted = sorted(filings, key=lambda x: x.get("tax_prd_yr", 0), reverse=True)
-    return filings_sorted[0] if filings_sorted else None
+    # Latest tax period year (ties keep the API's order)
+    return max(filings, key=lambda x: x.get("tax_prd_yr") or 0)
 
 
 def build_summary(org_data: Dict[str, Any], filing: Dict[str, Any]) -> Filing990Summary:
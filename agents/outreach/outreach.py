@@ -11,12 +11,21 @@ import json
 import os
 import sys
 import logging
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any
 import jsonschema
 from anthropic import Anthropic
 
+# PATH SETUP: Add root to sys.path (for shared/)
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+from shared import metrics, spend
+from shared.deadline import Deadline, DeadlineExceeded
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -49,6 +58,20 @@ FORBIDDEN_PHRASES = [
     "I have solutions for you",
 ]
 
+# Email generation output cap, and the prompt size used for budget estimates
+MAX_TOKENS = 2000
+ESTIMATED_INPUT_TOKENS = 4000
+
+# Spend-ledger priority when the profile carries no V2 urgency flag
+DISTRESS_PRIORITY = {"critical": "IMMEDIATE", "elevated": "HIGH", "watch": "MONITOR"}
+
+
+def outreach_priority(profile: Dict[str, Any]) -> str:
+    """shared.spend priority: the V2 urgency flag, else one derived from distress level."""
+    v2 = profile.get("v2_signals")
+    urgency = v2.get("urgency_flag") if isinstance(v2, dict) else None
+    return urgency or DISTRESS_PRIORITY.get(profile["signals"].get("distress_level"), "MONITOR")
+
 # Prospect profile schema (v1.0.0)
 PROSPECT_SCHEMA = {
     "type": "object",
@@ -194,6 +217,10 @@ class OutreachArchitect:
                 found.append(phrase)
         return found
 
+    def estimate_cost_usd(self) -> float:
+        """Upper-bound cost of one generate_emails() call, for budget admission."""
+        return spend.estimate_cost("anthropic", self.model, ESTIMATED_INPUT_TOKENS, MAX_TOKENS)
+
     def get_distress_triage(self, distress_level: str) -> Dict[str, Any]:
         """
         Determine tone and timing cadence based on distress level.
@@ -295,17 +322,19 @@ Generate the emails now."""
         
         return prompt
 
-    def generate_emails(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+    def generate_emails(self, profile: Dict[str, Any], deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """
         Call Anthropic API to generate email sequence.
         
         Args:
             profile: Validated prospect profile
+            deadline: Optional per-target deadline bounding the API call
             
         Returns:
             Dict with email_1, email_2, email_3, and analysis
             
         Raises:
+            DeadlineExceeded if the deadline has (almost) run out
             Various errors from Anthropic API or JSON parsing
         """
         logger.info(f"Generating outreach for {profile['institution']['name']}")
@@ -317,15 +346,27 @@ Generate the emails now."""
         # Build generation prompt
         user_prompt = self.build_generation_prompt(profile, triage)
         
-        # Call Claude
+        # Call Claude (SDK default timeout unless a deadline bounds it)
+        request_options = {"timeout": deadline.timeout(600.0)} if deadline is not None else {}
         logger.info(f"Calling Anthropic API (model: {self.model})")
-        message = self.client.messages.create(
-            model=self.model,
-            max_tokens=2000,
-            system=self.system_prompt,
-            messages=[
-                {"role": "user", "content": user_prompt}
-            ]
+        start = time.perf_counter()
+        with metrics.track_request("anthropic"):
+            message = self.client.messages.create(
+                model=self.model,
+                max_tokens=MAX_TOKENS,
+                system=self.system_prompt,
+                messages=[
+                    {"role": "user", "content": user_prompt}
+                ],
+                **request_options
+            )
+        
+        usage = getattr(message, 'usage', None)
+        spend.record_call(
+            "anthropic", model=self.model, agent="outreach",
+            input_tokens=getattr(usage, 'input_tokens', 0) or 0,
+            output_tokens=getattr(usage, 'output_tokens', 0) or 0,
+            latency_ms=(time.perf_counter() - start) * 1000
         )
         
         # Parse response
@@ -466,14 +507,35 @@ Generate the emails now."""
         md += f"- Runway (Years): {financials.get('runway_years', 'N/A')}\n"
         md += f"- Tuition Dependency: {financials.get('tuition_dependency', 'N/A')}%\n"
         
+        comparables = self.find_comparable_prospects(profile)
+        if comparables:
+            md += f"\n**Comparable Prospects:**\n"
+            for hit in comparables:
+                md += f"- {hit.get('title', hit['id'])} (similarity {hit['score']:.2f})\n"
+        
         return md
 
-    def process_prospect(self, profile_path: str) -> Dict[str, Any]:
+    def find_comparable_prospects(self, profile: Dict[str, Any], k: int = 3) -> list:
+        """
+        Prospects from the local similarity index that look most like this one.
+        
+        Returns an empty list if the index (or numpy) is unavailable.
+        """
+        try:
+            from shared.similarity import similar_prospects
+            return similar_prospects(profile, k=k)
+        except Exception as e:
+            logger.warning(f"Comparable prospect lookup skipped: {e}")
+            return []
+
+    def process_prospect(self, profile_path: str, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """
         Main orchestrator: Load, validate, generate, and save outreach.
         
         Args:
             profile_path: Path to prospect_profile.json
+            deadline: Optional deadline bounding the API call; outreach is
+                skipped (not failed) when it has run out
             
         Returns:
             Result dict with file path and metadata
@@ -497,8 +559,26 @@ Generate the emails now."""
                     "institution": profile["institution"]["name"]
                 }
             
-            # Step 4: Generate emails
-            emails = self.generate_emails(profile)
+            # Step 4: Budget admission, then generate emails
+            budget = spend.admit(self.estimate_cost_usd(), outreach_priority(profile))
+            if not budget["admitted"]:
+                logger.warning(f"Outreach skipped: spend budget exhausted ({budget['reason']})")
+                return {
+                    "status": "skipped",
+                    "reason": f"Spend budget ({budget['reason']})",
+                    "institution": profile["institution"]["name"]
+                }
+            try:
+                emails = self.generate_emails(profile, deadline=deadline)
+            except DeadlineExceeded as e:
+                logger.warning(f"Outreach skipped: {e}")
+                return {
+                    "status": "skipped",
+                    "reason": "Deadline exceeded",
+                    "institution": profile["institution"]["name"]
+                }
+            finally:
+                spend.release(budget)
             
             # Step 5: Validate content
             violations = self.validate_email_content(emails)
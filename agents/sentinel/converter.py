@@ -6,8 +6,11 @@ and publishes notifications to Microsoft Teams via Webhook.
 
 import sys
 import os
-import time
+import io
+import threading
+import multiprocessing
 import urllib.parse
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 # PATH SETUP: Add root to sys.path
@@ -16,9 +19,6 @@ project_root = os.path.abspath(os.path.join(current_dir, "../../"))
 sys.path.append(project_root)
 
 # Third-party imports
-import requests
-import markdown
-from bs4 import BeautifulSoup, Tag
 from docx import Document
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from dotenv import load_dotenv
@@ -26,6 +26,12 @@ from dotenv import load_dotenv
 # Import Shared Auth and Memory
 from shared.auth import get_graph_headers
 from shared.memory import save_document_text
+from shared import metrics
+from shared import notify
+from agents.sentinel.inbox_watcher import InboxWatcher
+from agents.sentinel.md_renderer import render_markdown
+from agents.sentinel.ledger import PublishLedger, fingerprint_file
+from agents.sentinel import uploader
 
 # Load environment variables from project root
 load_dotenv(os.path.join(project_root, ".env"))
@@ -34,6 +40,14 @@ load_dotenv(os.path.join(project_root, ".env"))
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 WATCH_FOLDER = os.path.join(BASE_DIR, "_INBOX")
+PROCESSING_FOLDER = os.path.join(WATCH_FOLDER, "processing")  # claimed, in flight
+FAILED_FOLDER = os.path.join(WATCH_FOLDER, "failed")          # quarantined drops
+
+# Content fingerprints of published drops (skip unchanged re-drops)
+LEDGER_PATH = os.getenv("SENTINEL_LEDGER_PATH") or os.path.join(project_root, "data", "sentinel_ledger.json")
+
+# Parallel conversions per batch (default: one per core)
+SENTINEL_WORKERS = int(os.getenv("SENTINEL_WORKERS") or os.cpu_count() or 1)
 
 # --- SMART TEMPLATE FINDER ---
 template_path_env = os.getenv("TEMPLATE_PATH")
@@ -59,6 +73,13 @@ if not TEMPLATE_PATH:
 # --- DESTINATION (LOCAL SYNC FOLDER) ---
 TARGET_ROOT = os.getenv("TARGET_ROOT")
 
+# --- PUBLISH MODE ---
+# "mount":  write reports into TARGET_ROOT (rclone FUSE mount)
+# "upload": write into _OUTPUT and upload via Graph upload sessions in the background
+PUBLISH_MODE = os.getenv("SENTINEL_PUBLISH", "mount").lower()
+OUTPUT_FOLDER = os.path.join(BASE_DIR, "_OUTPUT")
+UPLOAD_QUEUE = None  # shared.events.EventQueue, set by start_uploads()
+
 # --- SHAREPOINT WEB URL ---
 SHAREPOINT_FOLDER_URL = os.getenv("SHAREPOINT_FOLDER_URL")
 
@@ -140,21 +161,15 @@ def notify_teams(filename, _filepath):
         ]
     }
 
-    try:
-        response = requests.post(
-            TEAMS_WEBHOOK_URL, 
-            json=wrapped_card_payload,
-            headers={'Content-Type': 'application/json'},
-            timeout=10
-        )
-        if response.status_code == 202: 
-            print("📣 Teams Alert Sent (202 Accepted)!")
-        elif response.status_code == 200:
-            print("📣 Teams Alert Sent (200 OK)!")
-        else:
-            print(f"⚠️ Teams Alert Failed: {response.status_code} - {response.text}")
-    except Exception as e:
-        print(f"⚠️ Error sending alert: {e}")
+    # Background dispatcher: a multi-file drop becomes one "published" digest card
+    notify.enqueue(
+        TEAMS_WEBHOOK_URL, wrapped_card_payload,
+        group="sentinel:published",
+        summary=filename,
+        url=file_url,
+        digest_title="🚀 New Strategy Assets Published",
+    )
+    print("📣 Teams Alert queued")
 
 
 def ensure_template(template_path):
@@ -166,12 +181,75 @@ def ensure_template(template_path):
         os.makedirs(os.path.dirname(template_path), exist_ok=True)
         doc = Document()
         doc.add_paragraph("")
-        doc.save(template_path)
+        # Write-then-rename so a concurrent reader never sees a partial docx
+        tmp_path = f"{template_path}.{os.getpid()}.tmp"
+        doc.save(tmp_path)
+        os.replace(tmp_path, template_path)
         print(f"🧩 Default template created: {template_path}")
     except Exception as e:
         print(f"⚠️ Failed to create default template: {e}")
 
 
+class TemplateCache:
+    """
+    Branded template parsed and cleaned once, kept as package bytes.
+
+    new_document() opens a fresh Document from the in-memory bytes, so a
+    conversion never re-reads Reference.docx or re-strips its scaffolding.
+    The cache reloads when the template's path or mtime changes.
+    """
+
+    def __init__(self):
+        self._key = None     # (path, mtime_ns) the bytes were built from
+        self._bytes = None   # cleaned template package, or None if no template
+        self._lock = threading.Lock()
+
+    def _load(self, template_path):
+        ensure_template(template_path)
+        try:
+            key = (template_path, os.stat(template_path).st_mtime_ns)
+        except FileNotFoundError:
+            key = (template_path, None)
+        if key == self._key:
+            metrics.cache_lookup("sentinel_template", hit=True)
+            return
+
+        metrics.cache_lookup("sentinel_template", hit=False)
+        if key[1] is None:
+            print("⚠️ Template not found. Using default styles.")
+            self._key, self._bytes = key, None
+            return
+
+        doc = Document(template_path)
+        # CLEAR SCAFFOLDING
+        for paragraph in doc.paragraphs:
+            p = paragraph._element
+            p.getparent().remove(p)
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        self._key, self._bytes = key, buffer.getvalue()
+        print(f"🎨 Branding loaded from: {template_path}")
+
+    def snapshot(self, template_path):
+        """(key, bytes) for seeding pool workers without a re-parse."""
+        with self._lock:
+            self._load(template_path)
+            return self._key, self._bytes
+
+    def seed(self, key, data):
+        with self._lock:
+            self._key, self._bytes = key, data
+
+    def new_document(self, template_path):
+        with self._lock:
+            self._load(template_path)
+            data = self._bytes
+        return Document(io.BytesIO(data)) if data is not None else Document()
+
+
+TEMPLATES = TemplateCache()
+
+
 def apply_branding_to_doc(doc, title_text):
     """Applies the Charter & Stone header and date styles."""
     doc.add_paragraph("") 
@@ -182,104 +260,284 @@ def apply_branding_to_doc(doc, title_text):
     doc.add_paragraph("") 
 
 
-def convert_md_to_branded_docx(md_file_path):
-    print(f"⚙️ Processing: {md_file_path}")
+def convert_md_to_branded_docx(md_file_path, source_name=None):
+    """
+    Convert one markdown file to a branded docx and archive it to the Oracle.
+
+    Args:
+        md_file_path: File to read (usually the claimed copy in processing/)
+        source_name: Original inbox filename, used for titles (defaults to
+                     the basename of md_file_path)
+
+    Returns:
+        Path of the published docx. Raises on failure; the caller decides
+        whether the source is marked processed or quarantined.
+    """
+    source_name = source_name or os.path.basename(md_file_path)
+    print(f"⚙️ Processing: {source_name}")
+
+    doc = TEMPLATES.new_document(TEMPLATE_PATH)
+
+    with open(md_file_path, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    base_name = source_name.replace('.md', '')
+    display_title = base_name.replace('_', ' ').title()
+    apply_branding_to_doc(doc, display_title)
+
+    render_markdown(doc, text)
+
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M')
+    filename = f"Report_{base_name}_{timestamp}.docx"
 
+    output_root = OUTPUT_FOLDER if PUBLISH_MODE == "upload" else TARGET_ROOT
+    if not os.path.exists(output_root):
+        os.makedirs(output_root)
+
+    final_path = os.path.join(output_root, filename)
+    doc.save(final_path)
+
+    print(f"✅ PUBLISHED: {final_path}")
+
+    # 🆕 SAVE TO THE ORACLE
     try:
-        ensure_template(TEMPLATE_PATH)
-        if os.path.exists(TEMPLATE_PATH):
-            doc = Document(TEMPLATE_PATH)
-            # CLEAR SCAFFOLDING
-            for paragraph in doc.paragraphs:
-                p = paragraph._element
-                p.getparent().remove(p)
-            print(f"🎨 Branding loaded from: {TEMPLATE_PATH}")
-        else:
-            doc = Document()
-            print("⚠️ Template not found. Using default styles.")
+        oracle_path = save_document_text(
+            filename=base_name,
+            text_content=text,  # Raw markdown content
+            doc_type="internal"
+        )
+        print(f"📚 [ORACLE] Knowledge archived: {oracle_path}")
+    except Exception as oracle_error:
+        print(f"⚠️ [ORACLE] Failed to save to Knowledge Base: {oracle_error}")
+
+    return final_path
+
+
+# ================= CLAIM PROTOCOL =================
+#
+# A file is owned by whoever renames it into processing/ first (rename is
+# atomic within one filesystem), so the daemon and a standalone Sentinel can
+# never publish the same drop twice. The claimed name carries the owner's PID;
+# claims left by a dead process are moved back to the inbox on the next run.
 
-        with open(md_file_path, 'r', encoding='utf-8') as f:
-            text = f.read()
-
-        html = markdown.markdown(text)
-        soup = BeautifulSoup(html, 'html.parser')
-
-        base_name = os.path.basename(md_file_path).replace('.md', '')
-        display_title = base_name.replace('_', ' ').title()
-        apply_branding_to_doc(doc, display_title)
-
-        for element in soup.contents:
-            if not isinstance(element, Tag):
-                continue
-            
-            if element.name == 'h1':
-                doc.add_heading(element.text, level=1) 
-            elif element.name == 'h2':
-                doc.add_heading(element.text, level=2)
-            elif element.name == 'p':
-                doc.add_paragraph(element.text)
-            elif element.name == 'ul':
-                for li in element.find_all('li'):
-                    doc.add_paragraph(li.text, style='List Bullet')
-            elif element.name == 'ol':
-                for li in element.find_all('li'):
-                    doc.add_paragraph(li.text, style='List Number')
-
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M')
-        filename = f"Report_{base_name}_{timestamp}.docx"
-
-        if not os.path.exists(TARGET_ROOT):
-            os.makedirs(TARGET_ROOT)
-
-        final_path = os.path.join(TARGET_ROOT, filename)
-        doc.save(final_path)
-
-        print(f"✅ PUBLISHED: {final_path}")
-        
-        # 🆕 SAVE TO THE ORACLE
+def _claim_name(name):
+    return f"{os.getpid()}__{name}"
+
+
+def claim_file(path):
+    """Move an inbox file into processing/. Returns the claimed path, or None if lost."""
+    os.makedirs(PROCESSING_FOLDER, exist_ok=True)
+    claimed = os.path.join(PROCESSING_FOLDER, _claim_name(os.path.basename(path)))
+    try:
+        os.rename(path, claimed)
+    except FileNotFoundError:
+        return None  # someone else claimed (or already processed) it
+    return claimed
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def recover_orphaned_claims():
+    """Return files claimed by crashed Sentinel processes to the inbox."""
+    if not os.path.isdir(PROCESSING_FOLDER):
+        return 0
+    recovered = 0
+    for entry in os.scandir(PROCESSING_FOLDER):
+        pid, sep, name = entry.name.partition("__")
+        if not sep or not pid.isdigit() or _pid_alive(int(pid)):
+            continue
         try:
-            oracle_path = save_document_text(
-                filename=base_name,
-                text_content=text,  # Raw markdown content
-                doc_type="internal"
-            )
-            print(f"📚 [ORACLE] Knowledge archived: {oracle_path}")
-        except Exception as oracle_error:
-            print(f"⚠️ [ORACLE] Failed to save to Knowledge Base: {oracle_error}")
-        
-        notify_teams(filename, final_path)
-        os.rename(md_file_path, md_file_path + ".processed")
+            os.rename(entry.path, os.path.join(WATCH_FOLDER, name))
+            recovered += 1
+        except FileNotFoundError:
+            continue
+    if recovered:
+        print(f"♻️ Recovered {recovered} orphaned claim(s)")
+    return recovered
+
+
+def _init_worker(template_key, template_bytes):
+    """Pool initializer: reuse the parent's cleaned template instead of parsing it."""
+    TEMPLATES.seed(template_key, template_bytes)
+
 
+def _convert_claimed(claimed_path, name):
+    """Pool entry point: never raises, so one bad file cannot break the batch."""
+    try:
+        return convert_md_to_branded_docx(claimed_path, source_name=name), None
+    except Exception as error:
+        return None, f"{type(error).__name__}: {error}"
+
+
+def _convert_in_pool(jobs, workers, template_key, template_bytes):
+    """
+    Convert jobs on a spawn pool; never raises. If the pool breaks (e.g. a
+    worker is OOM-killed -> BrokenProcessPool), every job without a result
+    gets an error, so its claim is quarantined instead of sitting in
+    processing/ under this live PID until the next restart.
+    """
+    results = [(None, "worker pool failed before converting this file")] * len(jobs)
+    try:
+        # spawn: the daemon is multi-threaded, and forking it can deadlock on held locks
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_worker, initargs=(template_key, template_bytes)) as pool:
+            futures = [pool.submit(_convert_claimed, claimed, name) for claimed, name in jobs]
+            for index, future in enumerate(futures):
+                try:
+                    results[index] = future.result()
+                except Exception as error:
+                    results[index] = (None, f"worker pool failed: {type(error).__name__}: {error}")
     except Exception as error:
-        print(f"❌ Error: {error}")
+        print(f"❌ Worker pool failed: {type(error).__name__}: {error}")
+    return results
 
 
-def process_inbox():
-    """Process all markdown files in the inbox folder (called by daemon)"""
+LEDGER = PublishLedger(LEDGER_PATH)
+
+
+def _fingerprint_claim(claimed_path):
+    try:
+        return fingerprint_file(claimed_path)
+    except (OSError, UnicodeDecodeError):
+        return None  # let the conversion fail and quarantine it
+
+
+def _finish_unchanged(claimed_path, name, digest, published):
+    print(f"⏭️ Unchanged: {name} already published as {os.path.basename(published)}")
+    LEDGER.record_duplicate(digest, name)
+    os.replace(claimed_path, os.path.join(WATCH_FOLDER, name + ".processed"))
+
+
+def _finish_claim(claimed_path, name, error):
+    if error is None:
+        os.replace(claimed_path, os.path.join(WATCH_FOLDER, name + ".processed"))
+        return True
+    print(f"❌ Error: {name}: {error}")
+    os.makedirs(FAILED_FOLDER, exist_ok=True)
+    os.replace(claimed_path, os.path.join(FAILED_FOLDER, name))
+    with open(os.path.join(FAILED_FOLDER, name + ".error.txt"), "w", encoding="utf-8") as f:
+        f.write(f"{datetime.now().isoformat()} {error}\n")
+    return False
+
+
+def process_inbox(paths=None):
+    """
+    Claim and convert markdown files from the inbox folder.
+
+    Args:
+        paths: Specific files to convert (from the InboxWatcher); None sweeps
+               the whole folder (daemon safety net)
+
+    Files are converted on a process pool (SENTINEL_WORKERS, default one per
+    core); a single file is converted inline. Successes are renamed to
+    <name>.processed, failures quarantined in _INBOX/failed/. Drops whose
+    content is already in the publish ledger are marked processed without
+    converting, archiving or notifying again.
+    """
     if not os.path.exists(WATCH_FOLDER):
         os.makedirs(WATCH_FOLDER)
-    
-    files_found = [f for f in os.listdir(WATCH_FOLDER) if f.endswith(".md")]
-    if files_found:
-        print(f"📂 Found {len(files_found)} file(s) to process")
-        for file in files_found:
-            full_path = os.path.join(WATCH_FOLDER, file)
-            convert_md_to_branded_docx(full_path)
-    else:
+    recover_orphaned_claims()
+
+    if paths is None:
+        paths = [os.path.join(WATCH_FOLDER, f) for f in os.listdir(WATCH_FOLDER) if f.endswith(".md")]
+
+    claims = []
+    for path in paths:
+        claimed = claim_file(path)
+        if claimed:
+            claims.append((claimed, os.path.basename(path)))
+
+    if not claims:
         print("📭 Inbox empty")
+        metrics.items_processed("sentinel", 0)
+        return 0
+
+    print(f"📂 Found {len(claims)} file(s) to process")
+
+    # Skip content that is already published; identical drops in one batch convert once
+    to_convert, repeats = [], []
+    batch_digests = set()
+    for claimed, name in claims:
+        digest = _fingerprint_claim(claimed)
+        entry = LEDGER.lookup(digest) if digest else None
+        metrics.cache_lookup("sentinel_ledger", hit=entry is not None)
+        if entry:
+            _finish_unchanged(claimed, name, digest, entry["published"])
+        elif digest and digest in batch_digests:
+            repeats.append((claimed, name, digest))
+        else:
+            batch_digests.add(digest)
+            to_convert.append((claimed, name, digest))
+
+    published = 0
+    if to_convert:
+        # Parse the template once here (creating it if needed) before workers start
+        template_key, template_bytes = TEMPLATES.snapshot(TEMPLATE_PATH)
+        workers = min(SENTINEL_WORKERS, len(to_convert))
+        jobs = [(claimed, name) for claimed, name, _ in to_convert]
+        if workers <= 1:
+            results = [_convert_claimed(claimed, name) for claimed, name in jobs]
+        else:
+            results = _convert_in_pool(jobs, workers, template_key, template_bytes)
+
+        for (claimed, name, digest), (final_path, error) in zip(to_convert, results):
+            if _finish_claim(claimed, name, error):
+                published += 1
+                if digest:
+                    LEDGER.record_published(digest, name, final_path)
+                # Notified from this process: pool workers exit before a queued card is sent
+                notify_teams(os.path.basename(final_path), final_path)
+                if PUBLISH_MODE == "upload":
+                    _queue_upload(final_path)
+
+    for claimed, name, digest in repeats:
+        entry = LEDGER.lookup(digest)
+        if entry:
+            _finish_unchanged(claimed, name, digest, entry["published"])
+        else:
+            _finish_claim(claimed, name, "identical drop in the same batch failed to convert")
+
+    metrics.items_processed("sentinel", published)
+    return published
+
+
+def _queue_upload(final_path):
+    if UPLOAD_QUEUE is None:
+        print(f"⚠️ Upload mode but no upload queue running; {final_path} stays local")
+        return
+    uploader.enqueue_upload(UPLOAD_QUEUE, final_path)
+
+
+def start_uploads(queue):
+    """Route finished reports through the background SharePoint upload workers."""
+    global UPLOAD_QUEUE
+    UPLOAD_QUEUE = queue
+    workers = uploader.start_upload_workers(queue)
+    print(f"☁️ SharePoint upload workers online ({len(workers)})")
+    return workers
+
+
+def start_watcher():
+    """Start the event-driven inbox watcher; returns the running InboxWatcher."""
+    watcher = InboxWatcher(WATCH_FOLDER, process_inbox).start()
+    print(f"👀 Watching: {WATCH_FOLDER} ({watcher.backend})")
+    return watcher
 
 
 if __name__ == "__main__":
-    if not os.path.exists(WATCH_FOLDER):
-        os.makedirs(WATCH_FOLDER)
     print("--- CHARTER & STONE AUTOMATION SERVER ONLINE ---")
-    print(f"👀 Watching: {WATCH_FOLDER}")
-    print(f"🎯 Target: {TARGET_ROOT}")
-
-    while True:
-        if os.path.exists(WATCH_FOLDER):
-            files_found = [f for f in os.listdir(WATCH_FOLDER) if f.endswith(".md")]
-            for file in files_found:
-                full_path = os.path.join(WATCH_FOLDER, file)
-                convert_md_to_branded_docx(full_path)
-        time.sleep(3)
\ No newline at end of file
+    if PUBLISH_MODE == "upload":
+        from shared.events import EventQueue
+        start_uploads(EventQueue())
+        print(f"🎯 Target: SharePoint drive {uploader.SHAREPOINT_DRIVE_ID}/{uploader.SHAREPOINT_UPLOAD_FOLDER}")
+    else:
+        print(f"🎯 Target: {TARGET_ROOT}")
+    start_watcher().run_forever()
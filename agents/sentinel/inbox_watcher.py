@@ -0,0 +1,255 @@
+"""
+Sentinel Inbox Watcher
+----------------------
+Event-driven replacement for the listdir() polling loops around _INBOX.
+
+On Linux the watcher subscribes to inotify IN_CLOSE_WRITE / IN_MOVED_TO, so a
+markdown file is handed to the converter as soon as the writer closes it (or
+an editor/rclone renames it into place). Elsewhere, or if inotify cannot be
+initialised, it falls back to polling and only dispatches a file once its size
+and mtime have been stable for one full poll interval.
+
+Either way, events are debounced: a burst of writes to the same file (or a
+multi-file drop) is collected until DEBOUNCE_SECONDS pass without a new event
+(at most MAX_BATCH_SECONDS) and delivered as one batch to the handler, which
+runs on a separate dispatcher thread so slow conversions never stall event
+collection. Files already in the inbox at startup go through the same debounce.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import queue
+import select
+import struct
+import sys
+import threading
+import time
+
+# Quiet period after the last event before the pending batch is dispatched
+DEBOUNCE_SECONDS = 0.25
+
+# A steady trickle of events cannot hold a batch back longer than this
+MAX_BATCH_SECONDS = 5
+
+# Scan interval when inotify is unavailable
+POLL_SECONDS = 3
+
+# inotify constants (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+def _is_candidate(name, suffix):
+    return name.endswith(suffix) and not name.startswith(".")
+
+
+class _Inotify:
+    """Minimal ctypes binding: one watch on one directory, non-blocking reads."""
+
+    def __init__(self, path, mask):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {path}")
+
+    def read(self, timeout):
+        """Return [(mask, name)] for events within timeout seconds ([] on timeout)."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "replace")
+            offset += length
+            events.append((mask, name))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class InboxWatcher:
+    """
+    Watch a folder and call handler(paths) with batches of finished files.
+
+    Args:
+        folder: Directory to watch (created if missing)
+        handler: Callable receiving a list of absolute paths
+        suffix: Only names ending with this are reported
+        debounce_seconds: Quiet period before a file is dispatched
+        poll_seconds: Scan interval for the polling fallback
+        use_inotify: Force (True/False) or auto-detect (None) the backend
+    """
+
+    def __init__(self, folder, handler, suffix=".md", debounce_seconds=DEBOUNCE_SECONDS,
+                 poll_seconds=POLL_SECONDS, use_inotify=None):
+        self.folder = os.path.abspath(folder)
+        self.handler = handler
+        self.suffix = suffix
+        self.debounce_seconds = debounce_seconds
+        self.poll_seconds = poll_seconds
+        self.use_inotify = sys.platform.startswith("linux") if use_inotify is None else use_inotify
+        self.backend = None
+
+        self._batches = queue.Queue()
+        self._stop = threading.Event()
+        self._threads = []
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        os.makedirs(self.folder, exist_ok=True)
+
+        inotify = None
+        if self.use_inotify:
+            try:
+                inotify = _Inotify(self.folder, IN_CLOSE_WRITE | IN_MOVED_TO)
+            except (OSError, AttributeError) as e:
+                print(f"⚠️ [SENTINEL] inotify unavailable ({e}); falling back to polling")
+        self.backend = "inotify" if inotify else "polling"
+
+        # Files dropped while nobody was watching (dispatched after the debounce)
+        initial = self._scan()
+
+        if inotify:
+            target, args = self._inotify_loop, (inotify, initial)
+        else:
+            target, args = self._poll_loop, (initial,)
+        self._threads = [
+            threading.Thread(target=target, args=args, name="sentinel-watch", daemon=True),
+            threading.Thread(target=self._dispatch_loop, name="sentinel-dispatch", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self._batches.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def run_forever(self):
+        """Block until interrupted (standalone Sentinel)."""
+        try:
+            while not self._stop.wait(1):
+                pass
+        finally:
+            self.stop()
+
+    # ------------------------------------------------------------------
+    # Backends
+    # ------------------------------------------------------------------
+
+    def _scan(self):
+        try:
+            return [
+                entry.path for entry in os.scandir(self.folder)
+                if entry.is_file() and _is_candidate(entry.name, self.suffix)
+            ]
+        except FileNotFoundError:
+            return []
+
+    def _inotify_loop(self, inotify, initial=()):
+        pending = set(initial)
+        # One deadline for the whole batch; every event pushes it back
+        now = time.monotonic()
+        started = now if pending else None
+        deadline = now + self.debounce_seconds if pending else None
+        try:
+            while not self._stop.is_set():
+                timeout = deadline - time.monotonic() if deadline is not None else 1.0
+                for mask, name in inotify.read(max(timeout, 0)):
+                    if mask & IN_Q_OVERFLOW:
+                        # Kernel dropped events; rescan so nothing is missed
+                        paths = self._scan()
+                    elif mask & IN_IGNORED:
+                        print("⚠️ [SENTINEL] Inbox watch removed; falling back to polling")
+                        self._poll_loop(pending | set(self._scan()))
+                        return
+                    elif name and _is_candidate(name, self.suffix):
+                        paths = [os.path.join(self.folder, name)]
+                    else:
+                        continue
+                    if not paths:
+                        continue
+                    now = time.monotonic()
+                    if started is None:
+                        started = now
+                    pending.update(paths)
+                    deadline = min(now + self.debounce_seconds, started + MAX_BATCH_SECONDS)
+
+                if deadline is not None and time.monotonic() >= deadline:
+                    self._dispatch(pending)
+                    pending, started, deadline = set(), None, None
+        finally:
+            inotify.close()
+
+    def _poll_loop(self, initial=()):
+        seen = {}  # path -> (size, mtime) from the previous scan
+        dispatched = set()  # (path, signature) already handed over
+        if initial and not self._stop.wait(self.debounce_seconds):
+            self._dispatch(initial)
+        for path in initial:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            seen[path] = (stat.st_size, stat.st_mtime_ns)
+            dispatched.add((path, seen[path]))
+        while not self._stop.wait(self.poll_seconds):
+            current = {}
+            for path in self._scan():
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                current[path] = (stat.st_size, stat.st_mtime_ns)
+
+            # Unchanged since the last scan -> the writer is done with it
+            ready = [p for p, sig in current.items() if seen.get(p) == sig and (p, sig) not in dispatched]
+            dispatched = {(p, sig) for p, sig in dispatched if current.get(p) == sig}
+            dispatched.update((p, current[p]) for p in ready)
+            seen = current
+            self._dispatch(ready)
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+
+    def _dispatch(self, paths):
+        paths = [p for p in paths if os.path.exists(p)]
+        if paths:
+            self._batches.put(sorted(paths))
+
+    def _dispatch_loop(self):
+        while True:
+            batch = self._batches.get()
+            if batch is None:
+                return
+            try:
+                self.handler(batch)
+            except Exception as e:
+                print(f"❌ [SENTINEL] Inbox handler failed: {e}")
@@ -0,0 +1,125 @@
+"""
+Sentinel Publish Ledger
+-----------------------
+Content fingerprints of every markdown drop the Sentinel has published.
+
+A drop whose normalized body matches an existing entry (and whose docx is
+still in TARGET_ROOT) is not converted, archived or announced again; the
+ledger just records the new source name against the existing report.
+
+The ledger is a small JSON file rewritten atomically (temp file + rename).
+The daemon and a standalone Sentinel may both use it, so every write
+re-reads the file under an exclusive fcntl lock (<ledger>.lock) and merges
+into the current content, and lookups reload it when another process has
+replaced it.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, single writer assumed
+    fcntl = None
+
+_BLANK_RUNS = re.compile(r"\n{3,}")
+
+
+def normalize_markdown(text):
+    """Line endings, trailing whitespace and blank-line runs do not change content."""
+    text = text.replace("\r\n", "\n").replace("\r", "\n").lstrip("﻿")
+    text = "\n".join(line.rstrip() for line in text.split("\n"))
+    return _BLANK_RUNS.sub("\n\n", text).strip()
+
+
+def fingerprint(text):
+    return hashlib.sha256(normalize_markdown(text).encode("utf-8")).hexdigest()
+
+
+def fingerprint_file(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return fingerprint(f.read())
+
+
+class PublishLedger:
+    """fingerprint -> {published, source, first_published, sources, last_seen}"""
+
+    def __init__(self, path):
+        self.path = path
+        self._entries = None
+        self._version = None  # (mtime_ns, size) of the file behind _entries
+        self._lock = threading.Lock()
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self):
+        """Cached entries, re-read when the file was replaced by another process."""
+        version = self._stat()
+        if self._entries is None or version != self._version:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except FileNotFoundError:
+                self._entries = {}
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Ledger unreadable ({e}); starting fresh")
+                self._entries = {}
+            self._version = version
+        return self._entries
+
+    @contextmanager
+    def _locked_update(self):
+        """Exclusive cross-process section: yields the on-disk entries, saves them on exit."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(f"{self.path}.lock", "a") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            self._entries = None  # never merge into a stale cache
+            entries = self._load()
+            yield entries
+            self._save()
+
+    def _save(self):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self._version = self._stat()
+
+    def lookup(self, digest):
+        """Existing entry for this content, or None if new or its docx is gone."""
+        with self._lock:
+            entry = self._load().get(digest)
+        if entry and os.path.exists(entry.get("published", "")):
+            return entry
+        return None
+
+    def record_published(self, digest, source, published):
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock, self._locked_update() as entries:
+            entries[digest] = {
+                "published": published,
+                "source": source,
+                "first_published": now,
+                "last_seen": now,
+                "sources": [source],
+            }
+
+    def record_duplicate(self, digest, source):
+        with self._lock, self._locked_update() as entries:
+            entry = entries.get(digest)
+            if entry is None:
+                return
+            entry["last_seen"] = datetime.now().isoformat(timespec="seconds")
+            if source not in entry["sources"]:
+                entry["sources"].append(source)
@@ -0,0 +1,292 @@
+"""
+Sentinel Markdown Renderer
+--------------------------
+Single-pass markdown -> python-docx renderer.
+
+Lines are read once and turned straight into docx paragraphs, tables and
+runs; there is no intermediate HTML or DOM. Covers the subset the agents
+actually produce (dossiers are mostly pipe tables):
+
+    # .. ######           headings (inline formatting kept)
+    | a | b | + |---|     tables, header row bold, :--: alignment
+    - / * / + / 1.        lists, nested by indentation
+    > quote               blockquotes
+    ``` fenced ```        code blocks (monospace, line breaks kept)
+    **bold** *italic* `code` [text](url) and trailing-two-space line breaks
+
+Anything else (horizontal rules, HTML, images) is skipped or kept as text.
+"""
+
+import re
+
+from docx.enum.table import WD_TABLE_ALIGNMENT
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.shared import Pt
+
+CODE_FONT = "Consolas"
+MAX_LIST_LEVEL = 3  # Word ships 'List Bullet' .. 'List Bullet 3'
+
+# A closing "##" only counts when whitespace precedes it ("## Why C#" keeps its "#")
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)(?:\s+#+)?\s*$")
+_LIST_ITEM = re.compile(r"^(\s*)([-*+]|\d+[.)])\s+(.*)$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+_RULE = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+_TABLE_SEPARATOR = re.compile(r"^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$")
+
+# Inline tokens, tried left to right; the first match wins
+_INLINE = re.compile(
+    r"\\(?P<escape>[\\`*_{}\[\]()#+\-.!|])"
+    r"|`(?P<code>[^`]+)`"
+    r"|\[(?P<link_text>[^\]]+)\]\((?P<link_url>[^)\s]+)[^)]*\)"
+    r"|(?P<strong_em_mark>\*\*\*|___)(?P<strong_em>.+?)(?P=strong_em_mark)"
+    r"|(?P<strong_mark>\*\*|__)(?P<strong>.+?)(?P=strong_mark)"
+    r"|\*(?P<em_star>[^\s*](?:.*?[^\s*])?)\*"
+    r"|(?<![A-Za-z0-9])_(?P<em_under>[^\s_](?:.*?[^\s_])?)_(?![A-Za-z0-9])"
+)
+
+_ALIGNMENTS = {
+    "left": WD_ALIGN_PARAGRAPH.LEFT,
+    "center": WD_ALIGN_PARAGRAPH.CENTER,
+    "right": WD_ALIGN_PARAGRAPH.RIGHT,
+}
+
+
+# =============================================================================
+# INLINE
+# =============================================================================
+
+def add_inline(paragraph, text, bold=False, italic=False):
+    """Append text to a paragraph as runs, honouring inline markdown."""
+    position = 0
+    for match in _INLINE.finditer(text):
+        if match.start() > position:
+            _add_run(paragraph, text[position:match.start()], bold, italic)
+        position = match.end()
+
+        groups = match.groupdict()
+        if groups["escape"] is not None:
+            _add_run(paragraph, groups["escape"], bold, italic)
+        elif groups["code"] is not None:
+            _add_run(paragraph, groups["code"], bold, italic, code=True)
+        elif groups["link_text"] is not None:
+            add_inline(paragraph, groups["link_text"], bold, italic)
+        elif groups["strong_em"] is not None:
+            add_inline(paragraph, groups["strong_em"], True, True)
+        elif groups["strong"] is not None:
+            add_inline(paragraph, groups["strong"], True, italic)
+        else:
+            add_inline(paragraph, groups["em_star"] or groups["em_under"], bold, True)
+
+    if position < len(text):
+        _add_run(paragraph, text[position:], bold, italic)
+    return paragraph
+
+
+def _add_run(paragraph, text, bold, italic, code=False):
+    run = paragraph.add_run(text)
+    if bold:
+        run.bold = True
+    if italic:
+        run.italic = True
+    if code:
+        run.font.name = CODE_FONT
+    return run
+
+
+def _add_lines(paragraph, lines, bold=False, italic=False):
+    """Join soft-wrapped lines; a trailing double space or backslash is a hard break."""
+    for index, line in enumerate(lines):
+        hard_break = line.endswith("  ") or line.endswith("\\")
+        add_inline(paragraph, line.rstrip("\\").strip(), bold, italic)
+        if index < len(lines) - 1:
+            if hard_break:
+                paragraph.add_run().add_break()
+            else:
+                paragraph.add_run(" ")
+
+
+# =============================================================================
+# BLOCKS
+# =============================================================================
+
+def _styled_paragraph(doc, style):
+    """Paragraph in `style`, or the default style if the template lacks it."""
+    try:
+        return doc.add_paragraph(style=style), True
+    except KeyError:
+        return doc.add_paragraph(), False
+
+
+def _split_row(line):
+    line = line.strip()
+    if line.startswith("|"):
+        line = line[1:]
+    if line.endswith("|") and not line.endswith("\\|"):
+        line = line[:-1]
+    cells = re.split(r"(?<!\\)\|", line)
+    return [cell.strip().replace("\\|", "|") for cell in cells]
+
+
+def _column_alignment(spec):
+    spec = spec.strip()
+    if spec.startswith(":") and spec.endswith(":"):
+        return "center"
+    if spec.endswith(":"):
+        return "right"
+    return "left"
+
+
+def _render_table(doc, header, separator, rows):
+    columns = len(header)
+    alignments = [_column_alignment(spec) for spec in _split_row(separator)]
+    alignments += ["left"] * (columns - len(alignments))
+
+    table = doc.add_table(rows=0, cols=columns)
+    try:
+        table.style = "Table Grid"
+    except (KeyError, ValueError):
+        pass
+    table.alignment = WD_TABLE_ALIGNMENT.CENTER
+
+    for row_index, cells in enumerate([header] + rows):
+        row = table.add_row()
+        cells = (cells + [""] * columns)[:columns]
+        for column, text in enumerate(cells):
+            paragraph = row.cells[column].paragraphs[0]
+            paragraph.alignment = _ALIGNMENTS[alignments[column]]
+            add_inline(paragraph, text, bold=row_index == 0)
+    return table
+
+
+def _render_list_item(doc, marker, level, text):
+    kind = "List Number" if marker[0].isdigit() else "List Bullet"
+    level = min(level, MAX_LIST_LEVEL - 1)
+    style = kind if level == 0 else f"{kind} {level + 1}"
+    paragraph, styled = _styled_paragraph(doc, style)
+    if not styled:
+        paragraph, styled = _styled_paragraph(doc, kind)
+    if not styled or level:
+        paragraph.paragraph_format.left_indent = Pt(18 * (level + 1))
+    add_inline(paragraph, text)
+    return paragraph
+
+
+def _render_code(doc, lines):
+    paragraph, _ = _styled_paragraph(doc, "No Spacing")
+    for index, line in enumerate(lines):
+        run = paragraph.add_run(line)
+        run.font.name = CODE_FONT
+        run.font.size = Pt(9)
+        if index < len(lines) - 1:
+            run.add_break()
+    return paragraph
+
+
+def _render_quote(doc, lines):
+    paragraph, styled = _styled_paragraph(doc, "Quote")
+    if not styled:
+        paragraph.paragraph_format.left_indent = Pt(24)
+    _add_lines(paragraph, lines, italic=not styled)
+    return paragraph
+
+
+def _starts_block(line, next_line):
+    """True if `line` opens a block that interrupts a running paragraph."""
+    return bool(
+        _HEADING.match(line) or _FENCE.match(line) or _RULE.match(line)
+        or line.lstrip().startswith(">") or _LIST_ITEM.match(line)
+        or (line.lstrip().startswith("|") and next_line is not None and _TABLE_SEPARATOR.match(next_line))
+    )
+
+
+def render_markdown(doc, text):
+    """Render markdown text into an open python-docx Document (single pass)."""
+    lines = text.splitlines()
+    count = len(lines)
+    list_indents = []  # indentation of each open list level
+    i = 0
+
+    while i < count:
+        line = lines[i]
+        next_line = lines[i + 1] if i + 1 < count else None
+        stripped = line.strip()
+
+        if not stripped:
+            i += 1
+            continue
+
+        if _FENCE.match(line):
+            fence = _FENCE.match(line).group(1)
+            i += 1
+            code = []
+            while i < count and not lines[i].strip().startswith(fence):
+                code.append(lines[i])
+                i += 1
+            _render_code(doc, code)
+            i += 1  # closing fence
+            list_indents = []
+            continue
+
+        heading = _HEADING.match(line)
+        if heading:
+            level = len(heading.group(1))
+            try:
+                paragraph = doc.add_heading("", level=level)
+                add_inline(paragraph, heading.group(2))
+            except KeyError:
+                # Branded template without 'Heading N': bold paragraph instead
+                add_inline(doc.add_paragraph(), heading.group(2), bold=True)
+            list_indents = []
+            i += 1
+            continue
+
+        if _RULE.match(line):
+            i += 1
+            continue
+
+        if stripped.startswith("|") and next_line is not None and _TABLE_SEPARATOR.match(next_line):
+            header = _split_row(line)
+            rows = []
+            i += 2
+            while i < count and lines[i].strip().startswith("|"):
+                rows.append(_split_row(lines[i]))
+                i += 1
+            _render_table(doc, header, next_line, rows)
+            list_indents = []
+            continue
+
+        if stripped.startswith(">"):
+            quote = []
+            while i < count and lines[i].strip().startswith(">"):
+                quote.append(re.sub(r"^\s*>\s?", "", lines[i]))
+                i += 1
+            _render_quote(doc, [q for q in quote if q.strip()] or [""])
+            list_indents = []
+            continue
+
+        item = _LIST_ITEM.match(line)
+        if item:
+            indent = len(item.group(1).expandtabs(4))
+            while list_indents and indent < list_indents[-1]:
+                list_indents.pop()
+            if not list_indents or indent > list_indents[-1]:
+                list_indents.append(indent)
+            text = item.group(3)
+            i += 1
+            # Lazy continuation lines belong to the item
+            while i < count and lines[i].strip() and not _starts_block(lines[i], lines[i + 1] if i + 1 < count else None):
+                text += " " + lines[i].strip()
+                i += 1
+            _render_list_item(doc, item.group(2), len(list_indents) - 1, text)
+            continue
+
+        # Paragraph: gather lines until a blank line or another block starts
+        paragraph_lines = [line]
+        i += 1
+        while i < count and lines[i].strip() and not _starts_block(lines[i], lines[i + 1] if i + 1 < count else None):
+            paragraph_lines.append(lines[i])
+            i += 1
+        _add_lines(doc.add_paragraph(), paragraph_lines)
+        list_indents = []
+
+    return doc
@@ -0,0 +1,199 @@
+"""
+Sentinel SharePoint Uploader
+----------------------------
+Optional publisher that uploads finished reports straight to SharePoint
+through Microsoft Graph upload sessions, instead of writing them through the
+rclone FUSE mount in TARGET_ROOT.
+
+Flow per file:
+    1. createUploadSession on the target folder (conflictBehavior=replace)
+    2. PUT the file in CHUNK_SIZE fragments (multiples of 320 KiB)
+    3. on a failed fragment, ask the session for nextExpectedRanges and resume
+    4. compare Graph's quickXorHash with the local one
+
+Graph rejects out-of-order fragments within one session, so fragments of a
+file go up sequentially; parallelism comes from several upload workers each
+taking a different file from the durable upload topic (shared.events).
+Conversions only enqueue and never wait on the network.
+"""
+
+import base64
+import os
+import time
+
+import requests
+
+from shared.auth import get_graph_headers
+from shared.events import EventWorker
+from shared.graph import GRAPH_BASE_URL, TIMEOUT, retry_after_seconds, session as graph_session
+
+UPLOAD_TOPIC = "sharepoint.upload"
+
+# Target drive + folder (e.g. the CharterStone site's Documents library)
+SHAREPOINT_DRIVE_ID = os.getenv("SHAREPOINT_DRIVE_ID")
+SHAREPOINT_UPLOAD_FOLDER = os.getenv("SHAREPOINT_UPLOAD_FOLDER", "Reports")
+
+# Graph requires fragments to be multiples of 320 KiB (max 60 MiB)
+CHUNK_ALIGNMENT = 320 * 1024
+CHUNK_SIZE = 16 * CHUNK_ALIGNMENT  # 5 MiB
+
+MAX_CHUNK_RETRIES = 4
+UPLOAD_WORKERS = int(os.getenv("SHAREPOINT_UPLOAD_WORKERS", "2"))
+
+
+class UploadError(Exception):
+    """Upload failed or the uploaded content does not match the local file."""
+
+
+# =============================================================================
+# QUICKXORHASH
+# =============================================================================
+
+_QXH_WIDTH = 160
+_QXH_SHIFT = 11
+_QXH_MASK = (1 << _QXH_WIDTH) - 1
+
+
+def quick_xor_hash(data):
+    """
+    OneDrive/SharePoint quickXorHash of `data`, base64-encoded.
+
+    Byte i is XORed into a 160-bit circular register at bit (i * 11) % 160.
+    That offset repeats every 160 bytes, so the data is first folded into a
+    single 160-byte block (one big-int XOR per block) and each of its bytes
+    is then rotated into place once.
+    """
+    folded = 0
+    for start in range(0, len(data), _QXH_WIDTH):
+        folded ^= int.from_bytes(data[start:start + _QXH_WIDTH], "little")
+    lanes = folded.to_bytes(_QXH_WIDTH, "little")
+
+    register = 0
+    for index, value in enumerate(lanes):
+        if value:
+            shifted = value << ((index * _QXH_SHIFT) % _QXH_WIDTH)
+            register ^= (shifted & _QXH_MASK) | (shifted >> _QXH_WIDTH)
+
+    digest = bytearray(register.to_bytes(_QXH_WIDTH // 8, "little"))
+    for i, byte in enumerate(len(data).to_bytes(8, "little")):
+        digest[_QXH_WIDTH // 8 - 8 + i] ^= byte
+    return base64.b64encode(bytes(digest)).decode("ascii")
+
+
+# =============================================================================
+# UPLOAD SESSION
+# =============================================================================
+
+class SharePointUploader:
+    """Resumable, verified upload of local files into one drive folder."""
+
+    def __init__(self, drive_id=SHAREPOINT_DRIVE_ID, folder=SHAREPOINT_UPLOAD_FOLDER,
+                 base_url=GRAPH_BASE_URL, headers_fn=get_graph_headers,
+                 chunk_size=CHUNK_SIZE, http=graph_session):
+        if chunk_size % CHUNK_ALIGNMENT:
+            raise ValueError(f"chunk_size must be a multiple of {CHUNK_ALIGNMENT} bytes")
+        self.drive_id = drive_id
+        self.folder = folder.strip("/")
+        self.base_url = base_url.rstrip("/")
+        self.headers_fn = headers_fn
+        self.chunk_size = chunk_size
+        self.http = http
+
+    def _create_session(self, name):
+        headers = self.headers_fn()
+        if not headers:
+            raise UploadError("no Graph token available")
+        path = requests.utils.quote(f"{self.folder}/{name}")
+        url = f"{self.base_url}/drives/{self.drive_id}/root:/{path}:/createUploadSession"
+        body = {"item": {"@microsoft.graph.conflictBehavior": "replace"}}
+        response = self.http.post(url, headers=headers, json=body, timeout=TIMEOUT)
+        response.raise_for_status()
+        return response.json()["uploadUrl"]
+
+    def _next_offset(self, upload_url):
+        """Ask the session where to resume (None if the session is gone)."""
+        response = self.http.get(upload_url, timeout=TIMEOUT)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        ranges = response.json().get("nextExpectedRanges") or ["0-"]
+        return int(ranges[0].split("-")[0])
+
+    def upload(self, path):
+        """Upload one file; returns the Graph driveItem. Raises UploadError."""
+        name = os.path.basename(path)
+        with open(path, "rb") as f:
+            data = f.read()
+        total = len(data)
+        upload_url = self._create_session(name)
+
+        offset = 0
+        failures = 0
+        item = None
+        while item is None:
+            end = min(offset + self.chunk_size, total) - 1
+            # The upload URL is pre-authenticated: no Authorization header
+            headers = {
+                "Content-Length": str(end - offset + 1),
+                "Content-Range": f"bytes {offset}-{end}/{total}",
+            }
+            try:
+                response = self.http.put(upload_url, headers=headers, data=data[offset:end + 1], timeout=TIMEOUT)
+            except requests.RequestException as e:
+                response, error = None, repr(e)
+            else:
+                error = f"HTTP {response.status_code}"
+
+            if response is not None and response.status_code in (200, 201):
+                item = response.json()
+            elif response is not None and response.status_code == 202:
+                ranges = response.json().get("nextExpectedRanges") or [f"{end + 1}-"]
+                offset = int(ranges[0].split("-")[0])
+                failures = 0
+            else:
+                failures += 1
+                if failures > MAX_CHUNK_RETRIES:
+                    raise UploadError(f"{name}: fragment {offset}-{end} failed: {error}")
+                retry_after = response.headers.get("Retry-After") if response is not None else None
+                time.sleep(retry_after_seconds(retry_after, default=min(2 ** failures, 30)))
+                resume_at = self._next_offset(upload_url)
+                if resume_at is None:
+                    raise UploadError(f"{name}: upload session expired")
+                offset = resume_at
+
+        expected = quick_xor_hash(data)
+        actual = ((item.get("file") or {}).get("hashes") or {}).get("quickXorHash")
+        if actual and actual != expected:
+            raise UploadError(f"{name}: checksum mismatch (local {expected}, remote {actual})")
+        return item
+
+
+# =============================================================================
+# BACKGROUND QUEUE
+# =============================================================================
+
+def enqueue_upload(queue, path):
+    """Queue a finished report for upload (deduplicated per file version)."""
+    mtime = int(os.stat(path).st_mtime)
+    return queue.publish(UPLOAD_TOPIC, {"path": path}, dedupe_key=f"upload:{path}:{mtime}")
+
+
+def handle_upload(payload, queue, uploader=None):
+    path = payload["path"]
+    if not os.path.exists(path):
+        print(f"⚠️ [UPLOAD] {path} no longer exists; dropping")
+        return
+    item = (uploader or SharePointUploader()).upload(path)
+    print(f"☁️ [UPLOAD] {os.path.basename(path)} -> {item.get('webUrl', item.get('id'))}")
+
+
+def start_upload_workers(queue, workers=UPLOAD_WORKERS, logger=None):
+    """Start background workers draining the upload topic."""
+    uploader = SharePointUploader()
+    threads = []
+    for n in range(workers):
+        worker = EventWorker(queue, UPLOAD_TOPIC, lambda payload, q: handle_upload(payload, q, uploader),
+                             name=f"sentinel-upload-{n + 1}", logger=logger)
+        worker.start()
+        threads.append(worker)
+    return threads
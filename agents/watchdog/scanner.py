@@ -1,7 +1,6 @@
 import sys
 import os
 import json
-import requests
 import feedparser
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
@@ -15,6 +14,9 @@ sys.path.append(project_root)
 # Import Shared Auth and Memory
 from shared.auth import get_graph_headers
 from shared.memory import save_signal
+from shared.graph import session as graph_session
+from shared import metrics
+from shared import notify
 
 # Load env from root
 load_dotenv(os.path.join(project_root, ".env"))
@@ -105,13 +107,24 @@ def send_teams_alert(signal_type, title, article_url, matched_keyword):
             }
         }]
     }
-    requests.post(TEAMS_WEBHOOK_URL, json=card)
+    # Queued for the background dispatcher: bursts of one type become one digest card
+    notify.enqueue(
+        TEAMS_WEBHOOK_URL, card,
+        group=f"watchdog:{signal_type}",
+        summary=f"{matched_keyword.upper()}: {title}",
+        url=article_url,
+        digest_title=f"{signal_type} SIGNALS",
+    )
+
+# Event published for every new signal when the daemon runs the event pipeline
+SIGNAL_TOPIC = "signal.detected"
 
 def create_planner_task(signal_type, title, article_url, keyword, priority):
+    """Create the Inbox task for a signal. Returns the new task ID, or None."""
     headers = get_graph_headers()
     if not headers: 
         print("❌ Failed to get headers for task creation")
-        return
+        return None
 
     task_payload = {
         "planId": PLAN_ID,
@@ -121,24 +134,26 @@ def create_planner_task(signal_type, title, article_url, keyword, priority):
         "dueDateTime": datetime.now().isoformat() + "Z"
     }
     
-    response = requests.post("https://graph.microsoft.com/v1.0/planner/tasks", headers=headers, json=task_payload)
+    response = graph_session.post("https://graph.microsoft.com/v1.0/planner/tasks", headers=headers, json=task_payload)
     if response.status_code == 201:
         print(f"✅ Task Created: {title[:30]}...")
         task_data = response.json()
         task_id = task_data['id']
         
         # Add description
-        details_get = requests.get(f"https://graph.microsoft.com/v1.0/planner/tasks/{task_id}/details", headers=headers)
+        details_get = graph_session.get(f"https://graph.microsoft.com/v1.0/planner/tasks/{task_id}/details", headers=headers)
         if details_get.status_code == 200:
             etag = details_get.json()['@odata.etag']
             headers['If-Match'] = etag
-            requests.patch(
+            graph_session.patch(
                 f"https://graph.microsoft.com/v1.0/planner/tasks/{task_id}/details",
                 headers=headers,
                 json={"description": f"Triggered by Watchdog V2.2.\nType: {signal_type}\nKeyword: {keyword}\nSource: {article_url}", "previewType": "description"}
             )
+        return task_id
     else:
         print(f"❌ Task Creation Failed: {response.text}")
+        return None
 
 def load_history():
     if os.path.exists(HISTORY_FILE):
@@ -148,9 +163,17 @@ def load_history():
 def save_history(history):
     with open(HISTORY_FILE, 'w') as f: json.dump(history, f)
 
-def scan_feeds():
+def scan_feeds(event_queue=None):
+    """
+    Scan all feeds for new distress/forecast signals.
+
+    Args:
+        event_queue: Optional shared.events.EventQueue. When given, every new
+                     signal is also published for immediate downstream research.
+    """
     history = load_history()
     print(f"🔎 Watchdog V2.2 scanning for Strategic Forecasts...")
+    signals_found = 0
     
     for feed_url in FEEDS:
         feed = feedparser.parse(feed_url)
@@ -173,6 +196,7 @@ def scan_feeds():
             
             if signal_type:
                 print(f"🎯 {signal_type} FOUND: {title}")
+                signals_found += 1
                 
                 # 🆕 SAVE TO THE ORACLE
                 try:
@@ -201,10 +225,25 @@ def scan_feeds():
                     print(f"⚠️ [ORACLE] Failed to save signal: {oracle_error}")
                 
                 send_teams_alert(signal_type, title, link, keyword)
-                create_planner_task(signal_type, title, link, keyword, priority)
+                task_id = create_planner_task(signal_type, title, link, keyword, priority)
+
+                if event_queue is not None:
+                    event_queue.publish(
+                        SIGNAL_TOPIC,
+                        {
+                            "title": title,
+                            "link": link,
+                            "signal_type": signal_type,
+                            "keyword": keyword,
+                            "task_id": task_id,
+                        },
+                        dedupe_key=f"task:{task_id}" if task_id else f"signal:{link}",
+                    )
                 
                 history.append(link)
                 save_history(history)
 
+    metrics.items_processed("watchdog", signals_found)
+
 if __name__ == "__main__":
     scan_feeds()
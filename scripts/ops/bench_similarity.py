@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+SIMILARITY INDEX LATENCY BENCHMARK
+
+Builds a throwaway index of synthetic signal-like documents and times
+appends and top-k queries (brute-force scan over the memory-mapped matrix).
+
+Usage:
+    python3 scripts/ops/bench_similarity.py
+    python3 scripts/ops/bench_similarity.py --docs 50000 --queries 200 -k 10
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared.similarity import SimilarityIndex
+
+VOCABULARY = """
+enrollment decline layoffs faculty program cuts accreditation warning probation deficit
+endowment draw bond covenant downgrade moody's merger closure consolidation president
+resigns cfo interim tuition discount freshman deposits retention housing athletics
+budget shortfall restructuring consultant board trustees campus sale real estate lawsuit
+""".split()
+
+
+def synthetic_text(rng, words=60):
+    return " ".join(rng.choice(VOCABULARY) for _ in range(words))
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Similarity index latency benchmark")
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        index = SimilarityIndex(directory)
+
+        start = time.perf_counter()
+        index.add_many(
+            {"id": f"doc-{n}", "text": synthetic_text(rng), "kind": "signal" if n % 4 else "prospect"}
+            for n in range(args.docs)
+        )
+        build_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for n in range(100):
+            index.add(f"extra-{n}", synthetic_text(rng), kind="signal")
+        append_ms = (time.perf_counter() - start) * 1000 / 100
+
+        timings = {"query": [], "query --kind prospect": []}
+        for _ in range(args.queries):
+            text = synthetic_text(rng, words=12)
+            for label, kind in (("query", None), ("query --kind prospect", "prospect")):
+                start = time.perf_counter()
+                index.query(text, k=args.k, kind=kind)
+                timings[label].append((time.perf_counter() - start) * 1000)
+
+        matrix_mb = index.count * index.dimensions * 4 / 1e6
+        print(f"Documents:       {index.count:,} ({matrix_mb:.0f} MB matrix, {index.dimensions} dims)")
+        print(f"Bulk build:      {build_seconds:.2f}s ({args.docs / build_seconds:,.0f} docs/s)")
+        print(f"Single append:   {append_ms:.2f} ms (incl. flush)")
+        for label, samples in timings.items():
+            print(f"{label + ':':<22} p50 {percentile(samples, 50):6.2f} ms   "
+                  f"p95 {percentile(samples, 95):6.2f} ms   (k={args.k}, n={len(samples)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ Centralized utilities and services for all agents.
 """
 
 from .auth import GraphAuthenticator, get_graph_headers
+from .graph import iter_paged, batch_requests
 from .memory import save_signal, save_document_text
 
-__all__ = ['GraphAuthenticator', 'get_graph_headers', 'save_signal', 'save_document_text']
+__all__ = ['GraphAuthenticator', 'get_graph_headers', 'iter_paged', 'batch_requests', 'save_signal', 'save_document_text']
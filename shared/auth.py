@@ -1,8 +1,12 @@
 import os
+import time
+import threading
 import msal
 from pathlib import Path
 from dotenv import load_dotenv
 
+from shared import metrics
+
 # Load env from the project root
 current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.abspath(os.path.join(current_dir, "../"))
@@ -12,6 +16,11 @@ AZURE_TENANT_ID = os.getenv("AZURE_TENANT_ID")
 AZURE_CLIENT_ID = os.getenv("AZURE_CLIENT_ID")
 TOKEN_CACHE_PATH = Path.home() / ".charterstone" / "token_cache.json"
 
+DEFAULT_SCOPES = ("Tasks.ReadWrite", "Group.Read.All", "User.Read")
+
+# Refresh this many seconds before the access token actually expires
+REFRESH_MARGIN_SECONDS = 300
+
 class GraphAuthenticator:
     """
     Centralized Authentication Handler for all Charter & Stone Agents.
@@ -25,45 +34,117 @@ class GraphAuthenticator:
             authority=f"https://login.microsoftonline.com/{AZURE_TENANT_ID}",
             token_cache=self._token_cache
         )
-    
+
     def _load_token_cache(self):
         if TOKEN_CACHE_PATH.exists():
             self._token_cache.deserialize(TOKEN_CACHE_PATH.read_text())
-            
+
     def _save_token_cache(self):
+        # Only touch disk when MSAL actually changed the cache (refresh, new login)
+        if not self._token_cache.has_state_changed:
+            return
         TOKEN_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
         TOKEN_CACHE_PATH.write_text(self._token_cache.serialize())
-    
-    def get_access_token(self):
+        self._token_cache.has_state_changed = False
+
+    def acquire_token(self, scopes=DEFAULT_SCOPES):
+        """
+        Return the raw MSAL result (access_token, expires_in, ...) or None.
+        Tries the cache silently first, then falls back to Device Code Flow.
+        """
+        scopes = list(scopes)
         accounts = self._app.get_accounts()
-        scopes = ["Tasks.ReadWrite", "Group.Read.All", "User.Read"]
-        
+
         # 1. Try Silent (Cache)
         if accounts:
             result = self._app.acquire_token_silent(scopes=scopes, account=accounts[0])
             if result and "access_token" in result:
                 self._save_token_cache()
-                return result["access_token"]
-        
+                return result
+
         # 2. Device Code Flow (Interactive)
         flow = self._app.initiate_device_flow(scopes=scopes)
         if "user_code" not in flow:
             print("❌ Auth: Failed to create device flow")
             return None
-            
+
         print(f"\n⚠️ AUTH REQUIRED: {flow['message']}")
         result = self._app.acquire_token_by_device_flow(flow)
-        
+
         if "access_token" in result:
             self._save_token_cache()
-            return result["access_token"]
+            return result
         else:
             print(f"❌ Auth Failed: {result.get('error_description')}")
             return None
 
-def get_graph_headers():
-    auth = GraphAuthenticator()
-    token = auth.get_access_token()
+    def get_access_token(self, scopes=DEFAULT_SCOPES):
+        result = self.acquire_token(scopes)
+        return result["access_token"] if result else None
+
+
+class GraphTokenManager:
+    """
+    Process-wide access token holder shared by every agent in the process.
+
+    The MSAL app and token cache are built once. Access tokens are kept in
+    memory per scope set until REFRESH_MARGIN_SECONDS before expiry, so the
+    hot path is a dictionary lookup; refreshes are serialized under a lock.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self._authenticator = None
+        self._tokens = {}  # scopes tuple -> (access_token, expires_at epoch)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def get_token(self, scopes=DEFAULT_SCOPES):
+        key = tuple(scopes)
+        entry = self._tokens.get(key)
+        if entry and entry[1] > time.time():
+            metrics.cache_lookup("graph_token", hit=True)
+            return entry[0]
+
+        metrics.cache_lookup("graph_token", hit=False)
+
+        with self._lock:
+            # Another thread may have refreshed while we waited
+            entry = self._tokens.get(key)
+            if entry and entry[1] > time.time():
+                return entry[0]
+
+            if self._authenticator is None:
+                self._authenticator = GraphAuthenticator()
+            result = self._authenticator.acquire_token(key)
+            if not result:
+                return None
+
+            expires_in = int(result.get("expires_in", 0))
+            expires_at = time.time() + max(expires_in - REFRESH_MARGIN_SECONDS, 0)
+            self._tokens[key] = (result["access_token"], expires_at)
+            return result["access_token"]
+
+    def invalidate(self):
+        """Forget in-memory tokens (e.g. after a 401); the MSAL cache is kept."""
+        with self._lock:
+            self._tokens.clear()
+
+
+def get_token_manager():
+    return GraphTokenManager.instance()
+
+def get_graph_headers(scopes=DEFAULT_SCOPES):
+    token = get_token_manager().get_token(scopes)
     if token:
+        # Fresh dict per call: callers add If-Match etc. in place
         return {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
     return None
@@ -0,0 +1,84 @@
+"""
+SHARED DEADLINE MODULE
+----------------------
+One time budget per target, passed down the dossier pipeline so the
+whole run is bounded instead of every stage applying its own fixed
+timeout (ProPublica 10 s, Perplexity 30 s per query, Anthropic 90 s).
+
+Each call asks the deadline for its timeout: the stage's own cap, or
+less if less time is left. Optional stages check allows() first and are
+recorded as skipped when the budget is spent; the Analyst then marks the
+profile partial instead of making the worker wait.
+
+    deadline = Deadline(DOSSIER_DEADLINE_SECONDS)
+    api.get_organization_financials(ein, timeout=deadline.timeout(10))
+    if not deadline.allows(V2_MIN_SECONDS):
+        deadline.skip("v2_lite")
+
+A deadline is never carried across the event queue: a stage behind it
+(outreach) starts its own when it dequeues the event, since queue wait
+and retry backoff are not time spent on the target.
+"""
+
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+# Default per-target budget (override with DOSSIER_DEADLINE_SECONDS; 0 = unbounded)
+DOSSIER_DEADLINE_SECONDS = float(os.getenv("DOSSIER_DEADLINE_SECONDS", "120"))
+
+# A call is not started with less than this much time left
+MIN_CALL_SECONDS = 1.0
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a call would start with (almost) no budget left."""
+
+
+def is_timeout(exc: BaseException) -> bool:
+    """A client timeout (requests ReadTimeout, anthropic APITimeoutError, ...)."""
+    return isinstance(exc, TimeoutError) or "Timeout" in type(exc).__name__
+
+
+class Deadline:
+    """Absolute expiry for one target, plus the stages skipped because of it."""
+
+    def __init__(self, seconds: Optional[float] = DOSSIER_DEADLINE_SECONDS):
+        self.budget_seconds = seconds if seconds else None
+        self.expires_at = time.time() + seconds if seconds else None
+        self.skipped: List[str] = []
+
+    def remaining(self) -> float:
+        if self.expires_at is None:
+            return float("inf")
+        return max(self.expires_at - time.time(), 0.0)
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def allows(self, seconds: float) -> bool:
+        """Whether at least `seconds` are left (to decide on optional stages)."""
+        return self.remaining() >= seconds
+
+    def timeout(self, cap: float) -> float:
+        """Timeout for one call: `cap`, or the remaining budget if smaller."""
+        remaining = self.remaining()
+        if remaining < MIN_CALL_SECONDS:
+            raise DeadlineExceeded(f"deadline exceeded ({remaining:.1f}s left)")
+        return min(cap, remaining)
+
+    def skip(self, stage: str):
+        if stage not in self.skipped:
+            self.skipped.append(stage)
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.skipped)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary for profile metadata."""
+        return {
+            "budget_seconds": self.budget_seconds,
+            "remaining_seconds": None if self.expires_at is None else round(self.remaining(), 1),
+            "skipped_stages": list(self.skipped),
+        }
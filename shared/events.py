@@ -0,0 +1,248 @@
+"""
+SHARED EVENTS MODULE
+--------------------
+Durable in-process event queue that hands work from one agent to the next
+(Watchdog signal -> Bridge research -> Analyst dossier -> Outreach) without
+waiting for the next Planner poll.
+
+Events live in a SQLite table, so a crash or restart never loses work:
+- publish() inserts a 'pending' row (optionally de-duplicated by key)
+- claim() leases the oldest available row to one worker
+- ack() marks it done; nack() schedules a retry or dead-letters it
+- recover() returns rows whose lease expired (worker died) to 'pending'
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+# Default location: <project>/data/events.db (override with EVENT_QUEUE_PATH)
+DEFAULT_DB_PATH = Path(os.getenv(
+    "EVENT_QUEUE_PATH",
+    Path(__file__).parent.parent / "data" / "events.db"
+))
+
+LEASE_SECONDS = 600      # A claimed event is re-offered if not acked within this window
+MAX_ATTEMPTS = 5         # After this many failures the event is dead-lettered
+RETRY_DELAY_SECONDS = 30
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    topic TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    dedupe_key TEXT UNIQUE,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_until REAL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_ready ON events (topic, status, available_at);
+"""
+
+
+@dataclass
+class Event:
+    """A claimed event handed to a worker."""
+    id: int
+    topic: str
+    payload: Dict[str, Any]
+    attempts: int
+    created_at: float
+
+
+class EventQueue:
+    """SQLite-backed queue with leases, acknowledgements and crash recovery."""
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, lease_seconds: float = LEASE_SECONDS,
+                 max_attempts: int = MAX_ATTEMPTS):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._published = threading.Condition(self._lock)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def publish(self, topic: str, payload: Dict[str, Any], dedupe_key: Optional[str] = None) -> Optional[int]:
+        """
+        Enqueue an event. Returns its id, or None if dedupe_key was already used.
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO events (topic, payload, dedupe_key, available_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (topic, json.dumps(payload), dedupe_key, now, now, now),
+            )
+            if cursor.rowcount == 0:
+                return None
+            self._published.notify_all()
+            return cursor.lastrowid
+
+    def is_open(self, dedupe_key: str) -> bool:
+        """True while an event with this key is pending or being processed."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM events WHERE dedupe_key = ? AND status IN ('pending', 'processing')",
+                (dedupe_key,),
+            ).fetchone()
+        return row is not None
+
+    # ------------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------------
+
+    def claim(self, topic: str, owner: Optional[str] = None) -> Optional[Event]:
+        """Lease the oldest available event on a topic (None if nothing is ready)."""
+        now = time.time()
+        owner = owner or uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id, payload, attempts, created_at FROM events "
+                    "WHERE topic = ? AND status = 'pending' AND available_at <= ? "
+                    "ORDER BY available_at, id LIMIT 1",
+                    (topic, now),
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    "UPDATE events SET status = 'processing', lease_owner = ?, lease_until = ?, "
+                    "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                    (owner, now + self.lease_seconds, now, row[0]),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return Event(id=row[0], topic=topic, payload=json.loads(row[1]), attempts=row[2] + 1, created_at=row[3])
+
+    def ack(self, event_id: int):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE events SET status = 'done', lease_owner = NULL, lease_until = NULL, updated_at = ? "
+                "WHERE id = ?",
+                (time.time(), event_id),
+            )
+
+    def nack(self, event_id: int, error: str, retry_delay: float = RETRY_DELAY_SECONDS):
+        """Record a failure; retry later with linear backoff or dead-letter it."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT attempts FROM events WHERE id = ?", (event_id,)).fetchone()
+            if row is None:
+                return
+            attempts = row[0]
+            status = "dead" if attempts >= self.max_attempts else "pending"
+            self._conn.execute(
+                "UPDATE events SET status = ?, available_at = ?, lease_owner = NULL, lease_until = NULL, "
+                "last_error = ?, updated_at = ? WHERE id = ?",
+                (status, now + retry_delay * attempts, error[:2000], now, event_id),
+            )
+
+    def recover(self, all_leases: bool = False) -> int:
+        """
+        Return abandoned 'processing' events to 'pending'.
+
+        Args:
+            all_leases: Reclaim every lease regardless of expiry. Use on
+                        startup, when no worker from the old process survives.
+        """
+        now = time.time()
+        with self._lock:
+            if all_leases:
+                cursor = self._conn.execute(
+                    "UPDATE events SET status = 'pending', lease_owner = NULL, lease_until = NULL, "
+                    "updated_at = ? WHERE status = 'processing'",
+                    (now,),
+                )
+            else:
+                cursor = self._conn.execute(
+                    "UPDATE events SET status = 'pending', lease_owner = NULL, lease_until = NULL, "
+                    "updated_at = ? WHERE status = 'processing' AND lease_until < ?",
+                    (now, now),
+                )
+            if cursor.rowcount:
+                self._published.notify_all()
+            return cursor.rowcount
+
+    def wait_for_publish(self, timeout: float):
+        """Block until something is published (or timeout) - lets workers idle cheaply."""
+        with self._published:
+            self._published.wait(timeout)
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """{topic: {status: count}} - used for backlog reporting."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT topic, status, COUNT(*) FROM events GROUP BY topic, status"
+            ).fetchall()
+        result: Dict[str, Dict[str, int]] = {}
+        for topic, status, count in rows:
+            result.setdefault(topic, {})[status] = count
+        return result
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class EventWorker(threading.Thread):
+    """
+    Consumes one topic: claim -> handler(payload, queue) -> ack.
+    An exception from the handler nacks the event for a later retry.
+    """
+
+    def __init__(self, queue: EventQueue, topic: str, handler: Callable[[Dict[str, Any], EventQueue], Any],
+                 name: Optional[str] = None, idle_seconds: float = 5.0, logger=None):
+        super().__init__(name=name or f"worker-{topic}", daemon=True)
+        self.queue = queue
+        self.topic = topic
+        self.handler = handler
+        self.idle_seconds = idle_seconds
+        self.logger = logger
+        self._stop_event = threading.Event()
+
+    def _log(self, level, message):
+        if self.logger:
+            getattr(self.logger, level)(message)
+        else:
+            print(message)
+
+    def run(self):
+        while not self._stop_event.is_set():
+            event = self.queue.claim(self.topic, owner=self.name)
+            if event is None:
+                self.queue.wait_for_publish(self.idle_seconds)
+                continue
+            self.process(event)
+
+    def process(self, event: Event):
+        try:
+            self.handler(event.payload, self.queue)
+            self.queue.ack(event.id)
+        except BaseException as e:  # generate_dossier() calls sys.exit on bad input
+            self._log("error", f"❌ [{self.name}] event {event.id} failed (attempt {event.attempts}): {e!r}")
+            self.queue.nack(event.id, repr(e))
+
+    def stop(self):
+        self._stop_event.set()
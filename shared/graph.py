@@ -0,0 +1,143 @@
+"""
+SHARED GRAPH MODULE
+-------------------
+Thin helpers around Microsoft Graph REST calls used by several agents.
+
+- iter_paged(): follows @odata.nextLink so callers see every item, not just page one
+- batch_requests(): sends sub-requests through the JSON $batch endpoint (20 per call)
+"""
+
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+
+from shared import metrics
+
+GRAPH_BASE_URL = "https://graph.microsoft.com/v1.0"
+BATCH_URL = f"{GRAPH_BASE_URL}/$batch"
+
+# Hard limit imposed by Graph on sub-requests per $batch call
+BATCH_LIMIT = 20
+
+# Network timeout for every Graph call (seconds)
+TIMEOUT = 30
+
+# How many times throttled (429/503) sub-requests are resubmitted
+MAX_BATCH_RETRIES = 3
+
+
+def retry_after_seconds(value, default=1.0):
+    """
+    Seconds to wait from a Retry-After header: delta-seconds (fractional
+    tolerated) or an HTTP-date. Anything unparseable falls back to default.
+    """
+    if value is None:
+        return default
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(str(value))
+    except (TypeError, ValueError, IndexError):
+        return default
+    if retry_at is None:
+        return default
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def _record_spend(response, *args, **kwargs):
+    # Imported on first call: shared/__init__ imports this module, and
+    # `python -m shared.spend` must not load shared.spend twice
+    from shared import spend
+
+    spend.record_call("graph", status=str(response.status_code),
+                      latency_ms=response.elapsed.total_seconds() * 1000)
+
+
+# Pooled, instrumented session for every Graph call (status codes + latency, spend ledger)
+session = metrics.instrument_session(requests.Session(), "graph")
+session.hooks["response"].append(_record_spend)
+
+
+def iter_paged(url, headers, params=None):
+    """
+    Yield every item of a Graph collection, following @odata.nextLink.
+
+    Args:
+        url: Collection URL (absolute)
+        headers: Auth headers from get_graph_headers()
+        params: Optional query parameters for the first page only
+                (nextLink already carries them)
+    """
+    while url:
+        response = session.get(url, headers=headers, params=params, timeout=TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
+        yield from data.get("value", [])
+        url = data.get("@odata.nextLink")
+        params = None
+
+
+def batch_requests(sub_requests, headers):
+    """
+    Execute Graph sub-requests through $batch in groups of BATCH_LIMIT.
+
+    Args:
+        sub_requests: List of dicts with 'method', 'url' (relative to /v1.0)
+                      and optional 'headers' / 'body'
+        headers: Auth headers from get_graph_headers()
+
+    Returns:
+        List of response dicts ({'status', 'headers', 'body'}) in the same
+        order as sub_requests. Throttled items are retried after Retry-After.
+    """
+    results = [None] * len(sub_requests)
+    pending = list(range(len(sub_requests)))
+    attempt = 0
+
+    while pending:
+        retry = []
+        wait_seconds = 0
+
+        for start in range(0, len(pending), BATCH_LIMIT):
+            chunk = pending[start:start + BATCH_LIMIT]
+            payload = {"requests": []}
+            for index in chunk:
+                sub = sub_requests[index]
+                entry = {"id": str(index), "method": sub["method"], "url": sub["url"]}
+                if sub.get("headers"):
+                    entry["headers"] = sub["headers"]
+                if sub.get("body") is not None:
+                    entry["body"] = sub["body"]
+                    entry.setdefault("headers", {})["Content-Type"] = "application/json"
+                payload["requests"].append(entry)
+
+            response = session.post(BATCH_URL, headers=headers, json=payload, timeout=TIMEOUT)
+            response.raise_for_status()
+
+            for item in response.json().get("responses", []):
+                index = int(item["id"])
+                status = item.get("status", 0)
+                metrics.record_request("graph_batch", status)
+                if status in (429, 503) and attempt < MAX_BATCH_RETRIES:
+                    retry.append(index)
+                    retry_after = (item.get("headers") or {}).get("Retry-After")
+                    wait_seconds = max(wait_seconds, retry_after_seconds(retry_after))
+                    continue
+                results[index] = {
+                    "status": status,
+                    "headers": item.get("headers") or {},
+                    "body": item.get("body"),
+                }
+
+        pending = sorted(retry)
+        attempt += 1
+        if pending:
+            time.sleep(wait_seconds)
+
+    return results
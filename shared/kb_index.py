@@ -0,0 +1,435 @@
+"""
+SHARED KNOWLEDGE BASE INDEX
+---------------------------
+SQLite FTS5 index over the Oracle (knowledge_base/**/*.md).
+
+Each markdown file becomes one row: frontmatter is parsed into typed
+columns (kind, type, date, source, keyword, institution) and title +
+institution + keyword + body go into an FTS5 table ranked with BM25.
+
+The index is updated incrementally by shared.memory on every save, can
+catch up from the memory manifest (writes made by other processes), and
+can be rebuilt (or re-synced by mtime) from disk at any time:
+
+    python -m shared.kb_index update
+    python -m shared.kb_index rebuild
+    python -m shared.kb_index search "enrollment decline" --type distress
+    python -m shared.kb_index institution "Albright College"
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+KB_ROOT = Path(__file__).parent.parent / "knowledge_base"
+
+# Default location: <project>/data/kb_index.db (override with KB_INDEX_PATH)
+DEFAULT_INDEX_PATH = Path(os.getenv(
+    "KB_INDEX_PATH",
+    Path(__file__).parent.parent / "data" / "kb_index.db"
+))
+
+# BM25 column weights: title, institution, keyword, body
+BM25_WEIGHTS = (10.0, 8.0, 4.0, 1.0)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    type TEXT,
+    title TEXT,
+    date TEXT,
+    source TEXT,
+    keyword TEXT,
+    institution TEXT,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_documents_type_date ON documents (type, date);
+CREATE INDEX IF NOT EXISTS idx_documents_institution ON documents (institution COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS index_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    title, institution, keyword, body,
+    tokenize = 'porter unicode61'
+);
+"""
+
+_INSTITUTION_LINE = re.compile(r"\*\*(?:Institution|Target)[:*]*\*\*:?\s*(.+)", re.IGNORECASE)
+_HEADING = re.compile(r"^#\s+(.+)$", re.MULTILINE)
+_URL = re.compile(r"^https?://", re.IGNORECASE)
+
+# =============================================================================
+# PARSING
+# =============================================================================
+
+def _scalar(value: str) -> Any:
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    if value.startswith("{") or value.startswith("["):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+
+def parse_frontmatter(text: str) -> Tuple[Dict[str, Any], str]:
+    """
+    Split '---' frontmatter from the body.
+
+    Handles the flat YAML the agents write: 'key: value', quoted strings,
+    inline JSON (save_signal's metadata) and '  - item' lists.
+    """
+    if not text.startswith("---"):
+        return {}, text
+    end = text.find("\n---", 3)
+    if end == -1:
+        return {}, text
+
+    meta: Dict[str, Any] = {}
+    current_list = None
+    for line in text[3:end].splitlines():
+        if not line.strip():
+            continue
+        stripped = line.strip()
+        if stripped.startswith("- ") and current_list is not None:
+            meta[current_list].append(_scalar(stripped[2:]))
+            continue
+        key, sep, value = line.partition(":")
+        if not sep or line[:1].isspace():
+            continue
+        key = key.strip()
+        if value.strip():
+            meta[key] = _scalar(value)
+            current_list = None
+        else:
+            meta[key] = []
+            current_list = key
+
+    body = text[end + 4:]
+    return meta, body.lstrip("\n")
+
+
+def _kind_and_type(path: Path, kb_root: Path) -> Tuple[str, Optional[str]]:
+    parts = path.relative_to(kb_root).parts
+    kind = parts[0] if parts else "unknown"
+    subtype = parts[1] if len(parts) > 2 else None
+    return kind, subtype
+
+
+def extract_record(path: Path, kb_root: Path = KB_ROOT) -> Dict[str, Any]:
+    """Typed columns + FTS text for one knowledge base file."""
+    text = path.read_text(encoding="utf-8", errors="replace")
+    meta, body = parse_frontmatter(text)
+    extra = meta.get("metadata") if isinstance(meta.get("metadata"), dict) else {}
+    kind, subtype = _kind_and_type(path, kb_root)
+    stat = path.stat()
+
+    heading = _HEADING.search(body)
+    title = meta.get("title") or (heading.group(1).strip() if heading else path.stem)
+
+    date = str(meta.get("date") or meta.get("processed_date") or "")[:10]
+    if not re.match(r"\d{4}-\d{2}-\d{2}", date):
+        date = datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d")
+
+    source = meta.get("source") or meta.get("original_file")
+    institution = (
+        meta.get("institution") or extra.get("institution") or extra.get("university")
+    )
+    if not institution:
+        match = _INSTITUTION_LINE.search(body)
+        if match:
+            institution = match.group(1).strip().rstrip("\\").strip()
+    if not institution and source and not _URL.match(str(source)) and kind == "signals":
+        institution = source  # hand-written signals name the institution as source
+
+    keyword = extra.get("keyword") or meta.get("keyword")
+    if not keyword and isinstance(meta.get("tags"), list):
+        keyword = " ".join(str(tag) for tag in meta["tags"])
+
+    return {
+        "path": str(path),
+        "kind": kind,
+        "type": str(meta.get("type") or subtype or kind),
+        "title": str(title),
+        "date": date,
+        "source": str(source) if source else None,
+        "keyword": str(keyword) if keyword else None,
+        "institution": str(institution) if institution else None,
+        "mtime": stat.st_mtime,
+        "size": stat.st_size,
+        "body": body,
+    }
+
+
+def to_match_query(text: str) -> str:
+    """Free text -> FTS5 query (every word must appear, any order)."""
+    words = re.findall(r"\w+", text, re.UNICODE)
+    return " ".join(f'"{word}"' for word in words)
+
+# =============================================================================
+# INDEX
+# =============================================================================
+
+class KnowledgeIndex:
+    """Incrementally maintained FTS5 + metadata index of the knowledge base."""
+
+    def __init__(self, db_path=DEFAULT_INDEX_PATH, kb_root=KB_ROOT):
+        self.db_path = Path(db_path)
+        self.kb_root = Path(kb_root).resolve()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _delete(self, path: str):
+        row = self._conn.execute("SELECT id FROM documents WHERE path = ?", (path,)).fetchone()
+        if row:
+            self._conn.execute("DELETE FROM documents_fts WHERE rowid = ?", (row["id"],))
+            self._conn.execute("DELETE FROM documents WHERE id = ?", (row["id"],))
+
+    def _insert(self, record: Dict[str, Any]):
+        cursor = self._conn.execute(
+            "INSERT INTO documents (path, kind, type, title, date, source, keyword, institution, mtime, size) "
+            "VALUES (:path, :kind, :type, :title, :date, :source, :keyword, :institution, :mtime, :size)",
+            record,
+        )
+        self._conn.execute(
+            "INSERT INTO documents_fts (rowid, title, institution, keyword, body) VALUES (?, ?, ?, ?, ?)",
+            (cursor.lastrowid, record["title"], record["institution"] or "", record["keyword"] or "", record["body"]),
+        )
+
+    def index_file(self, path) -> Dict[str, Any]:
+        """Add or refresh one file (called by shared.memory after each save)."""
+        path = Path(path).resolve()
+        record = extract_record(path, self.kb_root)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._delete(record["path"])
+                self._insert(record)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return record
+
+    def remove(self, path):
+        with self._lock:
+            self._delete(str(Path(path).resolve()))
+
+    def _files(self):
+        return [p.resolve() for p in self.kb_root.rglob("*.md") if p.is_file()]
+
+    def sync(self, rebuild: bool = False) -> Dict[str, int]:
+        """
+        Bring the index in line with disk. Unchanged files (same mtime and
+        size) are skipped unless rebuild=True; vanished files are dropped.
+        """
+        with self._lock:
+            known = {
+                row["path"]: (row["mtime"], row["size"])
+                for row in self._conn.execute("SELECT path, mtime, size FROM documents")
+            }
+        stats = {"indexed": 0, "unchanged": 0, "removed": 0}
+        on_disk = set()
+        for path in self._files():
+            on_disk.add(str(path))
+            stat = path.stat()
+            if not rebuild and known.get(str(path)) == (stat.st_mtime, stat.st_size):
+                stats["unchanged"] += 1
+                continue
+            self.index_file(path)
+            stats["indexed"] += 1
+        for path in set(known) - on_disk:
+            self.remove(path)
+            stats["removed"] += 1
+        return stats
+
+    def catch_up(self) -> int:
+        """Index files appended to manifest.jsonl since the last catch-up."""
+        from shared.memory import iter_manifest  # memory imports this module
+
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM index_state WHERE key = 'manifest_offset'").fetchone()
+        entries, offset = iter_manifest(int(row["value"]) if row else 0, self.kb_root)
+
+        for path in dict.fromkeys(self.kb_root / entry["path"] for entry in entries):
+            if path.exists():
+                self.index_file(path)
+            else:
+                self.remove(path)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO index_state (key, value) VALUES ('manifest_offset', ?)", (str(offset),)
+            )
+        return len(entries)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def search(self, query: Optional[str] = None, type: Optional[str] = None, kind: Optional[str] = None,
+               institution: Optional[str] = None, keyword: Optional[str] = None,
+               since: Optional[str] = None, until: Optional[str] = None,
+               limit: int = 20, raw: bool = False) -> List[Dict[str, Any]]:
+        """
+        Ranked search. `query` is free text (every word must match) unless
+        raw=True, in which case it is passed to FTS5 MATCH unchanged.
+        Without a query, results are filtered by metadata and newest first.
+        """
+        where, params = [], []
+        for column, value in (("d.type", type), ("d.kind", kind), ("d.keyword", keyword)):
+            if value:
+                where.append(f"{column} = ?")
+                params.append(value)
+        if institution:
+            where.append("d.institution = ? COLLATE NOCASE")
+            params.append(institution)
+        if since:
+            where.append("d.date >= ?")
+            params.append(since)
+        if until:
+            where.append("d.date <= ?")
+            params.append(until)
+
+        match = query if raw else to_match_query(query or "")
+        columns = "d.path, d.kind, d.type, d.title, d.date, d.source, d.keyword, d.institution"
+        if match:
+            weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+            sql = (
+                f"SELECT {columns}, bm25(documents_fts, {weights}) AS rank, "
+                "snippet(documents_fts, 3, '[', ']', '…', 12) AS snippet "
+                "FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid "
+                f"WHERE documents_fts MATCH ? {''.join(' AND ' + w for w in where)} "
+                "ORDER BY rank LIMIT ?"
+            )
+            params = [match] + params + [limit]
+        else:
+            sql = (
+                f"SELECT {columns}, NULL AS rank, NULL AS snippet FROM documents d "
+                f"{'WHERE ' + ' AND '.join(where) if where else ''} "
+                "ORDER BY d.date DESC LIMIT ?"
+            )
+            params = params + [limit]
+
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def about(self, institution: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Everything mentioning an institution; rows tagged with it rank first (column weights)."""
+        phrase = '"' + institution.replace('"', "") + '"'
+        return self.search(phrase, raw=True, limit=limit)
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                row["type"]: row["n"]
+                for row in self._conn.execute("SELECT type, COUNT(*) AS n FROM documents GROUP BY type")
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+# =============================================================================
+# PROCESS-WIDE INDEX (used by shared.memory)
+# =============================================================================
+
+_index: Optional[KnowledgeIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> KnowledgeIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = KnowledgeIndex()
+        return _index
+
+
+def index_saved_file(path) -> None:
+    """Index a file shared.memory just wrote; never raises (indexing is best effort)."""
+    try:
+        get_index().index_file(path)
+    except Exception as e:
+        print(f"⚠️ [MEMORY] Index update failed for {Path(path).name}: {e} (run: python -m shared.kb_index sync)")
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def _print_results(results):
+    if not results:
+        print("No matches.")
+    for row in results:
+        label = row["institution"] or row["source"] or ""
+        print(f"{row['date']}  [{row['type']}]  {row['title']}  {label}")
+        print(f"    {row['path']}")
+        if row.get("snippet"):
+            print(f"    {row['snippet']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query or rebuild the Oracle knowledge base index")
+    parser.add_argument("--db", default=str(DEFAULT_INDEX_PATH), help="Index database path")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("rebuild", help="Re-index every file from disk")
+    sub.add_parser("sync", help="Index new/changed files, drop deleted ones")
+    sub.add_parser("update", help="Index files written since the last update (manifest)")
+    sub.add_parser("stats", help="Document counts per type")
+
+    search = sub.add_parser("search", help="Full-text search (BM25 ranked)")
+    search.add_argument("query", nargs="?", default=None)
+    search.add_argument("--type")
+    search.add_argument("--kind")
+    search.add_argument("--institution")
+    search.add_argument("--keyword")
+    search.add_argument("--since", help="YYYY-MM-DD")
+    search.add_argument("--until", help="YYYY-MM-DD")
+    search.add_argument("--limit", type=int, default=20)
+    search.add_argument("--raw", action="store_true", help="Pass the query to FTS5 MATCH unchanged")
+
+    about = sub.add_parser("institution", help="Everything indexed about one institution")
+    about.add_argument("name")
+    about.add_argument("--limit", type=int, default=50)
+
+    args = parser.parse_args(argv)
+    index = KnowledgeIndex(args.db)
+
+    if args.command == "update":
+        print(f"{index.catch_up()} manifest entries applied")
+    elif args.command in ("rebuild", "sync"):
+        print(index.sync(rebuild=args.command == "rebuild"))
+    elif args.command == "stats":
+        for doc_type, count in sorted(index.counts().items()):
+            print(f"{doc_type:<24} {count}")
+    elif args.command == "search":
+        _print_results(index.search(
+            args.query, type=args.type, kind=args.kind, institution=args.institution,
+            keyword=args.keyword, since=args.since, until=args.until, limit=args.limit, raw=args.raw,
+        ))
+    elif args.command == "institution":
+        _print_results(index.about(args.name, limit=args.limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,17 +3,45 @@ SHARED MEMORY MODULE
 --------------------
 Standardizes how agents save data to the Knowledge Base (The Oracle).
 Ensures all knowledge is saved as standardized Markdown with metadata.
+
+Layout: <kind>/<type>/YYYY/MM/<name>_<hash8>.md, where the hash covers the
+item's identity (signals: title + source + content; documents: content),
+so different items never overwrite each other and re-saving the same item
+within the same month rewrites its file (in a later month it is saved again
+under the new YYYY/MM folder). Files are written to a temp file and os.replace()d into
+place, and every write is appended to manifest.jsonl so readers can pick
+up new items incrementally (iter_manifest) instead of listing folders.
 """
 
 import os
 import json
+import hashlib
+import threading
 from datetime import datetime
 from pathlib import Path
 
+from shared.kb_index import index_saved_file
+from shared.similarity import index_kb_file
+
 # Define Root of Knowledge Base relative to this file
 # (shared/memory.py -> ../knowledge_base)
 KB_ROOT = Path(__file__).parent.parent / "knowledge_base"
 
+MANIFEST_NAME = "manifest.jsonl"
+_manifest_lock = threading.Lock()
+
+
+def _content_hash(*parts) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update((part or "").encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _partition(now: datetime) -> Path:
+    return Path(now.strftime("%Y")) / now.strftime("%m")
+
 def save_signal(title: str, content: str, signal_type: str = "distress", source_url: str = None, metadata: dict = None):
     """
     Saves an intelligence signal (from Watchdog) to the Knowledge Base.
@@ -25,15 +53,17 @@ def save_signal(title: str, content: str, signal_type: str = "distress", source_
         source_url: Where the intel came from
         metadata: Dict of extra info (university name, state, etc.)
     """
-    # 1. Clean Title for Filename
+    # 1. Clean Title for Filename (hash suffix: same headline, different article -> different file)
+    now = datetime.now()
     safe_title = "".join([c for c in title if c.isalnum() or c in (' ', '-', '_')]).strip().replace(" ", "_")
-    date_str = datetime.now().strftime("%Y-%m-%d")
-    filename = f"{date_str}_{safe_title}.md"
-    
+    date_str = now.strftime("%Y-%m-%d")
+    item_hash = _content_hash(title, source_url, content)
+    filename = f"{date_str}_{safe_title[:80]}_{item_hash[:8]}.md"
+
     # 2. Determine Path
     # Default to 'distress' if unknown type
     subfolder = signal_type if signal_type in ['distress', 'forecast'] else 'distress'
-    save_path = KB_ROOT / "signals" / subfolder / filename
+    save_path = KB_ROOT / "signals" / subfolder / _partition(now) / filename
     
     # 3. Construct Markdown Content
     md_content = f"""---
@@ -53,8 +83,10 @@ metadata: {json.dumps(metadata or {})}
 {content}
 """
 
-    # 4. Save
-    _write_file(save_path, md_content)
+    # 4. Save (and index for search)
+    if _write_file(save_path, md_content, item_hash):
+        index_saved_file(save_path)
+        index_kb_file(save_path, KB_ROOT)
     return str(save_path)
 
 def save_document_text(filename: str, text_content: str, doc_type: str = "internal"):
@@ -62,10 +94,12 @@ def save_document_text(filename: str, text_content: str, doc_type: str = "intern
     Saves extracted text from a document (from Sentinel) to the KB.
     """
     # Strip extension from original filename
+    now = datetime.now()
     base_name = Path(filename).stem
-    save_name = f"{base_name}.md"
-    
-    save_path = KB_ROOT / "docs" / doc_type / save_name
+    item_hash = _content_hash(text_content)
+    save_name = f"{base_name}_{item_hash[:8]}.md"
+
+    save_path = KB_ROOT / "docs" / doc_type / _partition(now) / save_name
     
     md_content = f"""---
 original_file: "{filename}"
@@ -77,16 +111,73 @@ type: document_extraction
 
 {text_content}
 """
-    _write_file(save_path, md_content)
+    if _write_file(save_path, md_content, item_hash):
+        index_saved_file(save_path)
+        index_kb_file(save_path, KB_ROOT)
     return str(save_path)
 
-def _write_file(path: Path, content: str):
-    """Internal helper to write file safely."""
+def _write_file(path: Path, content: str, item_hash: str = None) -> bool:
+    """Internal helper to write file safely (temp + rename). Returns True if written."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
     try:
         # Ensure directory exists
         path.parent.mkdir(parents=True, exist_ok=True)
-        # Write (UTF-8)
-        path.write_text(content, encoding="utf-8")
+        # Write (UTF-8) to a temp file; a crash never leaves a truncated note
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        _append_manifest(path, item_hash)
         print(f"✅ [MEMORY] Saved to Oracle: {path.name}")
+        return True
     except Exception as e:
         print(f"❌ [MEMORY] Failed to save {path.name}: {e}")
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        return False
+
+def _append_manifest(path: Path, item_hash: str = None):
+    """One JSON line per write; a single O_APPEND write keeps lines whole across processes."""
+    entry = {
+        "ts": datetime.now().isoformat(timespec="seconds"),
+        "path": path.relative_to(KB_ROOT).as_posix(),
+        "sha256": item_hash,
+    }
+    line = (json.dumps(entry) + "\n").encode("utf-8")
+    with _manifest_lock:
+        fd = os.open(KB_ROOT / MANIFEST_NAME, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+def iter_manifest(offset: int = 0, kb_root: Path = None):
+    """
+    Read manifest entries written since `offset` (a byte position).
+
+    Returns (entries, new_offset); store new_offset and pass it back next
+    time. A trailing partial line (write in progress) is left for later.
+    Each entry carries 'path' relative to KB_ROOT, 'ts' and 'sha256'.
+    """
+    manifest = Path(kb_root or KB_ROOT) / MANIFEST_NAME
+    if not manifest.exists():
+        return [], 0
+    if offset > manifest.stat().st_size:
+        offset = 0  # manifest was rotated or replaced
+    with open(manifest, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    entries = []
+    consumed = 0
+    for raw in data.splitlines(keepends=True):
+        if not raw.endswith(b"\n"):
+            break
+        consumed += len(raw)
+        try:
+            entries.append(json.loads(raw))
+        except ValueError:
+            continue  # blank or damaged line (e.g. torn by a crash)
+    return entries, offset + consumed
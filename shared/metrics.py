@@ -0,0 +1,286 @@
+"""
+SHARED METRICS MODULE
+---------------------
+In-process instrumentation shared by every agent, exposed in Prometheus
+text format by the daemon's opt-in /metrics endpoint.
+
+Agents only call the hooks below; nothing is sent anywhere unless the
+daemon serves the registry (DAEMON_METRICS_PORT).
+
+    observe_job(job, seconds, status, lag)      scheduler runs
+    record_request(provider, status, seconds)   outbound API calls
+    instrument_session(session, provider)       same, for requests.Session
+    track_request(provider)                     same, for SDK calls
+    items_processed(agent, count)               work done per cycle
+    cache_lookup(cache, hit)                    cache hit ratios
+    register_collector(fn)                      gauges computed at scrape time
+"""
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+PREFIX = "charterstone"
+
+JOB_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600)
+REQUEST_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._lock = threading.Lock()
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, help_text):
+        super().__init__(name, help_text)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0.0)
+
+    def _samples(self):
+        with self._lock:
+            return [f"{self.name}{_format_labels(k)} {_format_value(v)}" for k, v in sorted(self._values.items())]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets: Iterable[float]):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+        self._data: Dict[LabelKey, List[float]] = {}  # per-bucket counts + [sum, count]
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            data = self._data.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    data[i] += 1
+            data[-2] += value
+            data[-1] += 1
+
+    def count(self, **labels) -> float:
+        data = self._data.get(_label_key(labels))
+        return data[-1] if data else 0.0
+
+    def _samples(self):
+        lines = []
+        with self._lock:
+            for key, data in sorted(self._data.items()):
+                for i, bound in enumerate(self.buckets):
+                    lines.append(f"{self.name}_bucket{_format_labels(key, ('le', _format_value(bound)))} {_format_value(data[i])}")
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {_format_value(data[-1])}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(data[-2])}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {_format_value(data[-1])}")
+        return lines
+
+
+class Registry:
+    """Holds metrics and scrape-time collectors; renders Prometheus text."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, help_text, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, help_text, **kwargs)
+                self._metrics[name] = metric
+            return metric
+
+    def counter(self, name, help_text) -> Counter:
+        return self._get_or_create(Counter, name, help_text)
+
+    def gauge(self, name, help_text) -> Gauge:
+        return self._get_or_create(Gauge, name, help_text)
+
+    def histogram(self, name, help_text, buckets=REQUEST_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, buckets=buckets)
+
+    def register_collector(self, collector: Callable[[], None]):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in list(self._collectors):
+            try:
+                collector()
+            except Exception as e:
+                print(f"⚠️ [METRICS] Collector failed: {e}")
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+JOB_DURATION = REGISTRY.histogram(f"{PREFIX}_job_duration_seconds", "Daemon job run time", buckets=JOB_BUCKETS)
+JOB_LAG = REGISTRY.histogram(f"{PREFIX}_job_lag_seconds", "Delay between planned and actual job start", buckets=REQUEST_BUCKETS)
+JOB_RUNS = REGISTRY.counter(f"{PREFIX}_job_runs_total", "Daemon job runs by outcome")
+JOB_LAST_SUCCESS = REGISTRY.gauge(f"{PREFIX}_job_last_success_timestamp_seconds", "Unix time of the last successful run")
+API_REQUESTS = REGISTRY.counter(f"{PREFIX}_api_requests_total", "Outbound API requests by provider and status code")
+API_LATENCY = REGISTRY.histogram(f"{PREFIX}_api_request_duration_seconds", "Outbound API request latency")
+ITEMS_PROCESSED = REGISTRY.counter(f"{PREFIX}_items_processed_total", "Items processed by agent")
+ITEMS_LAST_CYCLE = REGISTRY.gauge(f"{PREFIX}_items_last_cycle", "Items processed by the agent's most recent cycle")
+CACHE_LOOKUPS = REGISTRY.counter(f"{PREFIX}_cache_lookups_total", "Cache lookups by cache and result")
+
+# =============================================================================
+# HOOKS (called by agents)
+# =============================================================================
+
+def observe_job(job: str, seconds: Optional[float], status: str, lag: Optional[float] = None):
+    JOB_RUNS.inc(job=job, status=status)
+    if seconds is not None:
+        JOB_DURATION.observe(seconds, job=job)
+    if lag is not None:
+        JOB_LAG.observe(max(lag, 0.0), job=job)
+    if status == "ok":
+        JOB_LAST_SUCCESS.set(time.time(), job=job)
+
+
+def record_request(provider: str, status, seconds: Optional[float] = None):
+    """status: HTTP status code, or a short error name ('timeout', 'error')."""
+    API_REQUESTS.inc(provider=provider, status=str(status))
+    if seconds is not None:
+        API_LATENCY.observe(seconds, provider=provider)
+
+
+@contextmanager
+def track_request(provider: str):
+    """Time an SDK call; an exception is recorded as status=<ExceptionName>."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        status = getattr(e, "status_code", None) or type(e).__name__
+        record_request(provider, status, time.perf_counter() - start)
+        raise
+    record_request(provider, 200, time.perf_counter() - start)
+
+
+def instrument_session(session, provider: str):
+    """
+    Record status and latency for every call: a response hook for answered
+    requests, plus a wrapper on session.request so connection errors and
+    timeouts (which never produce a response) count as status=<ExceptionName>.
+    """
+    def _hook(response, *args, **kwargs):
+        record_request(provider, response.status_code, response.elapsed.total_seconds())
+    session.hooks.setdefault("response", []).append(_hook)
+
+    send = session.request
+
+    @functools.wraps(send)
+    def _request(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return send(*args, **kwargs)
+        except Exception as e:
+            record_request(provider, type(e).__name__, time.perf_counter() - start)
+            raise
+
+    session.request = _request
+    return session
+
+
+def items_processed(agent: str, count: int):
+    ITEMS_PROCESSED.inc(count, agent=agent)
+    ITEMS_LAST_CYCLE.set(count, agent=agent)
+
+
+def cache_lookup(cache: str, hit: bool):
+    CACHE_LOOKUPS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def register_collector(collector: Callable[[], None]):
+    REGISTRY.register_collector(collector)
+
+# =============================================================================
+# HTTP ENDPOINT
+# =============================================================================
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # keep scrapes out of daemon.log
+
+
+def start_http_server(port: int, host: str = "127.0.0.1", registry: Registry = REGISTRY) -> ThreadingHTTPServer:
+    """Serve /metrics on a background thread; returns the server (call shutdown() to stop)."""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    thread = threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,212 @@
+"""
+SHARED NOTIFY MODULE
+--------------------
+Background dispatcher for Teams webhook cards.
+
+Agents call enqueue() and return immediately; a single thread per process
+owns a pooled session and posts cards with a timeout and retries. Cards that
+arrive within COALESCE_SECONDS of each other and share a group key (signal
+type, institution, ...) are merged into one digest card, so a burst of 30
+signals becomes one message instead of 30.
+
+    enqueue(card, group, summary, url=None, digest_title=None)
+    flush(timeout)     wait until everything queued so far has been sent
+"""
+
+import atexit
+import queue
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from shared import metrics
+from shared.graph import retry_after_seconds
+
+COALESCE_SECONDS = 10     # Merge window for cards sharing a group key
+MAX_QUEUE = 500           # Pending cards kept in memory; newest are dropped beyond this
+TIMEOUT = 10              # Per-request timeout (seconds)
+MAX_RETRIES = 3
+MAX_DIGEST_ENTRIES = 15   # Lines listed in one digest card
+
+
+@dataclass
+class _Notification:
+    card: Dict[str, Any]
+    group: str
+    summary: str
+    url: Optional[str] = None
+    digest_title: Optional[str] = None
+
+
+def digest_card(title: str, entries: List[_Notification]) -> Dict[str, Any]:
+    """One adaptive card listing several notifications of the same group."""
+    body = [
+        {"type": "TextBlock", "text": title, "weight": "Bolder", "size": "Large"},
+        {"type": "TextBlock", "text": f"{len(entries)} updates", "isSubtle": True},
+    ]
+    for entry in entries[:MAX_DIGEST_ENTRIES]:
+        text = f"[{entry.summary}]({entry.url})" if entry.url else entry.summary
+        body.append({"type": "TextBlock", "text": f"• {text}", "wrap": True})
+    if len(entries) > MAX_DIGEST_ENTRIES:
+        body.append({"type": "TextBlock", "text": f"…and {len(entries) - MAX_DIGEST_ENTRIES} more", "isSubtle": True})
+
+    return {
+        "type": "message",
+        "attachments": [{
+            "contentType": "application/vnd.microsoft.card.adaptive",
+            "content": {
+                "type": "AdaptiveCard",
+                "body": body,
+                "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+                "version": "1.2",
+            },
+        }],
+    }
+
+
+class TeamsDispatcher:
+    """Bounded queue + one sender thread for a single webhook URL."""
+
+    def __init__(self, webhook_url: str, coalesce_seconds: float = COALESCE_SECONDS,
+                 max_queue: int = MAX_QUEUE, session=None):
+        self.webhook_url = webhook_url
+        self.coalesce_seconds = coalesce_seconds
+        self.session = session or metrics.instrument_session(requests.Session(), "teams")
+        self._queue: "queue.Queue[Optional[_Notification]]" = queue.Queue(maxsize=max_queue)
+        self._idle = threading.Condition()
+        self._in_flight = 0
+        self._thread = threading.Thread(target=self._run, name="teams-dispatcher", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def enqueue(self, card, group, summary, url=None, digest_title=None) -> bool:
+        """Queue a card; never blocks. Returns False if the queue is full."""
+        with self._idle:
+            self._in_flight += 1
+        try:
+            self._queue.put_nowait(_Notification(card, group, summary, url, digest_title))
+        except queue.Full:
+            self._done(1)
+            print(f"⚠️ [NOTIFY] Queue full; dropped Teams card: {summary}")
+            metrics.record_request("teams", "dropped")
+            return False
+        return True
+
+    def flush(self, timeout: float = 30) -> bool:
+        """Block until every queued card has been sent (or given up on)."""
+        deadline = time.monotonic() + timeout
+        with self._idle:
+            while self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 30):
+        self.flush(timeout)
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    # ------------------------------------------------------------------
+    # Sender thread
+    # ------------------------------------------------------------------
+
+    def _done(self, count):
+        with self._idle:
+            self._in_flight -= count
+            self._idle.notify_all()
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            # Collect the burst: everything arriving within the coalescing window
+            batch = [first]
+            deadline = time.monotonic() + self.coalesce_seconds
+            stop = False
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            groups: "OrderedDict[str, List[_Notification]]" = OrderedDict()
+            for item in batch:
+                groups.setdefault(item.group, []).append(item)
+            for group, entries in groups.items():
+                if len(entries) == 1:
+                    card = entries[0].card
+                else:
+                    card = digest_card(entries[0].digest_title or group, entries)
+                try:
+                    self._post(card)
+                except Exception as e:
+                    print(f"⚠️ [NOTIFY] Teams post failed for '{group}': {e}")
+            self._done(len(batch))
+            if stop:
+                return
+
+    def _post(self, card):
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                response = self.session.post(self.webhook_url, json=card, timeout=TIMEOUT)
+            except requests.RequestException as e:
+                error, retry_after = repr(e), None
+            else:
+                if response.status_code in (200, 202):
+                    return
+                if response.status_code != 429 and response.status_code < 500:
+                    raise RuntimeError(f"{response.status_code} - {response.text[:200]}")
+                error, retry_after = f"HTTP {response.status_code}", response.headers.get("Retry-After")
+            if attempt == MAX_RETRIES:
+                raise RuntimeError(error)
+            time.sleep(retry_after_seconds(retry_after, default=2 ** attempt))
+
+
+# =============================================================================
+# PROCESS-WIDE DISPATCHERS
+# =============================================================================
+
+_dispatchers: Dict[str, TeamsDispatcher] = {}
+_dispatchers_lock = threading.Lock()
+
+
+def get_dispatcher(webhook_url: str) -> TeamsDispatcher:
+    with _dispatchers_lock:
+        dispatcher = _dispatchers.get(webhook_url)
+        if dispatcher is None:
+            dispatcher = TeamsDispatcher(webhook_url)
+            _dispatchers[webhook_url] = dispatcher
+        return dispatcher
+
+
+def enqueue(webhook_url, card, group, summary, url=None, digest_title=None) -> bool:
+    """Queue a Teams card for background delivery (coalesced per group)."""
+    return get_dispatcher(webhook_url).enqueue(card, group, summary, url, digest_title)
+
+
+def flush(timeout: float = 30) -> bool:
+    with _dispatchers_lock:
+        dispatchers = list(_dispatchers.values())
+    return all(d.flush(timeout) for d in dispatchers)
+
+
+# Short-lived runs (standalone scanner/converter) still deliver what they queued
+atexit.register(flush)
@@ -0,0 +1,342 @@
+"""
+SHARED PEER INDEX MODULE
+------------------------
+Percentile index over stored financial metrics, for instant cohort
+comparisons ("expense ratio worse than 87% of midwest peers").
+
+For every slice (all institutions, each region, each NTEE code, each
+revenue band) and every metric, the index keeps one sorted array of peer
+values; a percentile is two binary searches. Profiles are added, moved or
+replaced incrementally (bisect remove + insort), and the whole index is a
+small JSON file rewritten atomically. The daemon, sweep and CLI Analyst
+can all write it, so each write-through re-reads the file under an
+exclusive fcntl lock (<index>.lock) before updating and saving. Readers
+keep it in memory and reload only when another process has rewritten it
+(one stat per profile).
+
+    benchmarks(profile)   -> {"peers": {...}, "metrics": {metric: {slice: {...}}}}
+    update_index(profile) -> best-effort write-through after a profile is saved
+
+CLI:
+    python -m shared.peer_index rebuild          (from the profile store)
+    python -m shared.peer_index stats
+    python -m shared.peer_index query expense_ratio 1.12 --region midwest
+"""
+
+import argparse
+import json
+import os
+import threading
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from shared.profile_store import normalize_ein
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, single writer assumed
+    fcntl = None
+
+# Default location: <project>/data/peer_index.json (override with PEER_INDEX_PATH)
+DEFAULT_INDEX_PATH = Path(os.getenv(
+    "PEER_INDEX_PATH",
+    Path(__file__).parent.parent / "data" / "peer_index.json"
+))
+
+# metric -> True when a higher value is worse
+METRICS = {
+    "expense_ratio": True,
+    "tuition_dependency": True,
+    "runway_years": False,
+    "revenue_cagr": False,
+}
+
+# (upper bound, label); revenue in dollars
+REVENUE_BANDS = [
+    (10_000_000, "under-10M"),
+    (50_000_000, "10M-50M"),
+    (100_000_000, "50M-100M"),
+    (500_000_000, "100M-500M"),
+    (float("inf"), "500M-plus"),
+]
+
+# Slices with fewer peers than this are not reported
+MIN_PEERS = 5
+
+
+def revenue_band(total_revenue: Optional[float]) -> Optional[str]:
+    if not isinstance(total_revenue, (int, float)) or total_revenue <= 0:
+        return None
+    return next(label for bound, label in REVENUE_BANDS if total_revenue < bound)
+
+
+def peer_record(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Slice keys and metric values of one profile."""
+    institution = profile.get("institution") or {}
+    financials = profile.get("financials") or {}
+    calculated = financials.get("calculated") or {}
+    trend = financials.get("trend") or {}
+    region = (institution.get("location") or {}).get("region")
+
+    slices = ["all"]
+    if region and region != "unknown":
+        slices.append(f"region:{region}")
+    if institution.get("ntee_code"):
+        slices.append(f"ntee:{institution['ntee_code']}")
+    band = revenue_band(financials.get("total_revenue"))
+    if band:
+        slices.append(f"revenue:{band}")
+
+    values = {**calculated, "revenue_cagr": trend.get("revenue_cagr")}
+    metrics = {
+        metric: values[metric] for metric in METRICS
+        if isinstance(values.get(metric), (int, float)) and not isinstance(values.get(metric), bool)
+    }
+    return {"slices": slices, "metrics": metrics}
+
+# =============================================================================
+# INDEX
+# =============================================================================
+
+class PeerIndex:
+    """slice -> metric -> sorted values, plus each member's current record."""
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.members: Dict[str, Dict[str, Any]] = {}
+        self.slices: Dict[str, Dict[str, List[float]]] = {}
+        self._mtime = None
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        try:
+            stat = self.path.stat()
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"⚠️ [PEERS] Index unreadable ({e}); run: python -m shared.peer_index rebuild")
+            return
+        self.members, self.slices, self._mtime = data["members"], data["slices"], stat.st_mtime_ns
+
+    def refresh(self, force: bool = False):
+        """Reload if another process rewrote the file (always, with force)."""
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return
+        if force or mtime != self._mtime:
+            with self._lock:
+                self._load()
+
+    @contextmanager
+    def file_lock(self):
+        """Exclusive cross-process lock around a read-modify-write of the file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(f"{self.path}.lock", "a") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"members": self.members, "slices": self.slices}, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+            self._mtime = self.path.stat().st_mtime_ns
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def _remove(self, record):
+        for slice_key in record["slices"]:
+            for metric, value in record["metrics"].items():
+                values = self.slices.get(slice_key, {}).get(metric)
+                if values:
+                    i = bisect_left(values, value)
+                    if i < len(values) and values[i] == value:
+                        values.pop(i)
+
+    def _add(self, record):
+        for slice_key in record["slices"]:
+            arrays = self.slices.setdefault(slice_key, {})
+            for metric, value in record["metrics"].items():
+                insort(arrays.setdefault(metric, []), value)
+
+    def update(self, profile: Dict[str, Any]) -> bool:
+        """Add or replace one institution; False if nothing changed."""
+        ein = normalize_ein((profile.get("institution") or {}).get("ein") or profile.get("ein"))
+        record = peer_record(profile)
+        with self._lock:
+            previous = self.members.get(ein)
+            if previous == record:
+                return False
+            if previous:
+                self._remove(previous)
+            self._add(record)
+            self.members[ein] = record
+        return True
+
+    def write_through(self, profile: Dict[str, Any]) -> bool:
+        """Merge one profile into the file's current content and save it."""
+        with self.file_lock():
+            self.refresh(force=True)
+            if not self.update(profile):
+                return False
+            self.save()
+        return True
+
+    def rebuild(self, profiles: Iterable[Dict[str, Any]]) -> int:
+        with self._lock:
+            self.members, self.slices = {}, {}
+        count = 0
+        for profile in profiles:
+            try:
+                self.update(profile)
+                count += 1
+            except ValueError:
+                continue  # no EIN
+        return count
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def percentile(self, metric: str, value: float, slice_key: str = "all",
+                   exclude: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Share of peers in `slice_key` with a better value than `value`
+        ('worse than N%'); `exclude` (an EIN) leaves that member's own value out.
+        None if the slice has fewer than MIN_PEERS peers.
+        """
+        values = self.slices.get(slice_key, {}).get(metric, [])
+        higher_is_worse = METRICS[metric]
+        better = bisect_left(values, value) if higher_is_worse else len(values) - bisect_right(values, value)
+        peers = len(values)
+
+        own = self.members.get(normalize_ein(exclude)) if exclude else None
+        if own and slice_key in own["slices"] and metric in own["metrics"]:
+            peers -= 1
+            own_value = own["metrics"][metric]
+            if (own_value < value) if higher_is_worse else (own_value > value):
+                better -= 1
+
+        if peers < MIN_PEERS:
+            return None
+        return {"peers": peers, "worse_than_pct": round(100 * better / peers)}
+
+    def benchmarks(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+        """Percentiles of every metric of `profile` in every slice it belongs to."""
+        record = peer_record(profile)
+        try:
+            ein = normalize_ein((profile.get("institution") or {}).get("ein") or profile.get("ein"))
+        except ValueError:
+            ein = None
+        result: Dict[str, Any] = {}
+        with self._lock:
+            for metric, value in record["metrics"].items():
+                by_slice = {}
+                for slice_key in record["slices"]:
+                    found = self.percentile(metric, value, slice_key, exclude=ein)
+                    if found:
+                        by_slice[slice_key] = found
+                if by_slice:
+                    result[metric] = {"value": value, "slices": by_slice}
+        return {"slices": record["slices"], "metrics": result}
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            slice_key: max((len(values) for values in arrays.values()), default=0)
+            for slice_key, arrays in sorted(self.slices.items())
+        }
+
+# =============================================================================
+# PROCESS-WIDE INDEX (used by the Analyst)
+# =============================================================================
+
+_index: Optional[PeerIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_peer_index() -> PeerIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = PeerIndex()
+        return _index
+
+
+def benchmarks(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Peer percentiles for a profile being built; empty if the index is unavailable."""
+    try:
+        index = get_peer_index()
+        index.refresh()
+        return index.benchmarks(profile)
+    except Exception as e:
+        print(f"⚠️ [PEERS] Benchmarks unavailable: {e}")
+        return {"slices": [], "metrics": {}}
+
+
+def update_index(profile: Dict[str, Any]) -> None:
+    """Write-through after a profile is saved; never raises."""
+    try:
+        get_peer_index().write_through(profile)
+    except Exception as e:
+        print(f"⚠️ [PEERS] Index update failed: {e} (run: python -m shared.peer_index rebuild)")
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Peer percentile index over stored profiles")
+    parser.add_argument("--path", default=str(DEFAULT_INDEX_PATH), help="Index file")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("rebuild", help="Rebuild from every profile in the profile store")
+    sub.add_parser("stats", help="Peers per slice")
+
+    query = sub.add_parser("query", help="Percentile of a value among peers")
+    query.add_argument("metric", choices=sorted(METRICS))
+    query.add_argument("value", type=float)
+    query.add_argument("--region")
+    query.add_argument("--ntee")
+    query.add_argument("--revenue-band", choices=[label for _, label in REVENUE_BANDS])
+
+    args = parser.parse_args(argv)
+    index = PeerIndex(args.path)
+
+    if args.command == "rebuild":
+        from shared.profile_store import get_profile_store
+
+        with index.file_lock():
+            count = index.rebuild(get_profile_store().iter_profiles())
+            index.save()
+        print(f"Indexed {count} profiles")
+    elif args.command == "stats":
+        for slice_key, peers in index.stats().items():
+            print(f"{slice_key:<28} {peers}")
+    elif args.command == "query":
+        slice_key = (f"region:{args.region}" if args.region else f"ntee:{args.ntee}" if args.ntee
+                     else f"revenue:{args.revenue_band}" if args.revenue_band else "all")
+        found = index.percentile(args.metric, args.value, slice_key)
+        if found:
+            print(f"{args.metric}={args.value} is worse than {found['worse_than_pct']}% "
+                  f"of {found['peers']} peers ({slice_key})")
+        else:
+            print(f"Fewer than {MIN_PEERS} peers in {slice_key}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+SHARED PROFILE DIFF MODULE
+--------------------------
+Compares two versions of a prospect profile and classifies what moved.
+
+    changes = diff_profiles(previous, current)
+    event = change_event(previous, current)   # None when nothing changed
+
+Every change carries a materiality:
+    material  distress/urgency escalation, score jump >= 15, runway lost
+              (>= 2 years or newly in deficit), expense ratio crossing 100%,
+              a new TRUSTED V2 signal
+    moderate  de-escalations, smaller score/runway moves, a longer deficit streak
+    minor     a newer filing year, a TRUSTED signal dropping out
+
+The Analyst attaches the event to its result and the daemon publishes it on
+PROFILE_CHANGED_TOPIC, so alerting and outreach react to real changes only.
+"""
+
+from typing import Any, Dict, List, Optional
+
+PROFILE_CHANGED_TOPIC = "profile.changed"
+
+MATERIALITY = {"minor": 1, "moderate": 2, "material": 3}
+
+DISTRESS_ORDER = ["stable", "watch", "elevated", "critical"]
+URGENCY_ORDER = ["MONITOR", "HIGH", "IMMEDIATE", "LIQUIDATION"]
+
+SCORE_JUMP_MATERIAL = 15
+SCORE_JUMP_MODERATE = 5
+RUNWAY_LOSS_MATERIAL = 2.0
+RUNWAY_MOVE_MODERATE = 0.5
+
+
+def _v2(profile: Dict[str, Any]) -> Dict[str, Any]:
+    block = profile.get("v2_signals")
+    return block if isinstance(block, dict) else {}
+
+
+def _score(profile):
+    return _v2(profile).get("composite_score", profile.get("composite_score"))
+
+
+def _urgency(profile):
+    return _v2(profile).get("urgency_flag") or profile.get("urgency_flag")
+
+
+def _financials(profile):
+    return profile.get("financials") or {}
+
+
+def _calculated(profile):
+    return _financials(profile).get("calculated") or {}
+
+
+def _change(field, old, new, materiality, note):
+    return {"field": field, "old": old, "new": new, "materiality": materiality, "note": note}
+
+
+def _ranked_transition(field, order, old, new) -> Optional[Dict[str, Any]]:
+    if old == new or new is None:
+        return None
+    if old not in order or new not in order:
+        return _change(field, old, new, "moderate", "changed")
+    if order.index(new) > order.index(old):
+        return _change(field, old, new, "material", "escalated")
+    return _change(field, old, new, "moderate", "de-escalated")
+
+
+def diff_profiles(previous: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Classified deltas between two versions of the same institution's profile."""
+    changes = []
+
+    changes.append(_ranked_transition(
+        "distress_level", DISTRESS_ORDER,
+        (previous.get("signals") or {}).get("distress_level"), (current.get("signals") or {}).get("distress_level"),
+    ))
+    changes.append(_ranked_transition("urgency_flag", URGENCY_ORDER, _urgency(previous), _urgency(current)))
+
+    old_score, new_score = _score(previous), _score(current)
+    if isinstance(old_score, (int, float)) and isinstance(new_score, (int, float)):
+        delta = new_score - old_score
+        if abs(delta) >= SCORE_JUMP_MATERIAL:
+            changes.append(_change("composite_score", old_score, new_score, "material", f"{delta:+g}"))
+        elif abs(delta) >= SCORE_JUMP_MODERATE:
+            changes.append(_change("composite_score", old_score, new_score, "moderate", f"{delta:+g}"))
+
+    old_runway, new_runway = _calculated(previous).get("runway_years"), _calculated(current).get("runway_years")
+    if old_runway is None and new_runway is not None:
+        changes.append(_change("runway_years", None, new_runway, "material", "entered deficit"))
+    elif old_runway is not None and new_runway is None:
+        changes.append(_change("runway_years", old_runway, None, "moderate", "back to surplus"))
+    elif old_runway is not None and new_runway != old_runway:
+        delta = round(new_runway - old_runway, 1)
+        if delta <= -RUNWAY_LOSS_MATERIAL:
+            changes.append(_change("runway_years", old_runway, new_runway, "material", f"{delta:+g} years"))
+        elif abs(delta) >= RUNWAY_MOVE_MODERATE:
+            changes.append(_change("runway_years", old_runway, new_runway, "moderate", f"{delta:+g} years"))
+
+    old_ratio, new_ratio = _calculated(previous).get("expense_ratio"), _calculated(current).get("expense_ratio")
+    if isinstance(old_ratio, (int, float)) and isinstance(new_ratio, (int, float)):
+        if old_ratio <= 1.0 < new_ratio:
+            changes.append(_change("expense_ratio", old_ratio, new_ratio, "material", "now deficit spending"))
+        elif new_ratio <= 1.0 < old_ratio:
+            changes.append(_change("expense_ratio", old_ratio, new_ratio, "moderate", "back within budget"))
+
+    old_streak = (_financials(previous).get("trend") or {}).get("consecutive_deficit_years", 0)
+    new_streak = (_financials(current).get("trend") or {}).get("consecutive_deficit_years", 0)
+    if new_streak > old_streak:
+        changes.append(_change("consecutive_deficit_years", old_streak, new_streak, "moderate", "deficit streak grew"))
+
+    old_year, new_year = _financials(previous).get("fiscal_year"), _financials(current).get("fiscal_year")
+    if old_year != new_year and new_year is not None:
+        changes.append(_change("fiscal_year", old_year, new_year, "minor", "new filing"))
+
+    old_intel = _v2(previous).get("real_time_intel") or {}
+    for key, signal in (_v2(current).get("real_time_intel") or {}).items():
+        before = old_intel.get(key) or {}
+        trusted_now = isinstance(signal, dict) and signal.get("credibility") == "TRUSTED"
+        trusted_before = before.get("credibility") == "TRUSTED"
+        if trusted_now and (not trusted_before or before.get("finding") != signal.get("finding")):
+            changes.append(_change(key, before.get("finding"), signal.get("finding"), "material", "new trusted signal"))
+        elif trusted_before and not trusted_now:
+            changes.append(_change(key, before.get("finding"), None, "minor", "trusted signal dropped"))
+
+    return [change for change in changes if change]
+
+
+def change_event(previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Compact change event for one EIN, or None if nothing changed.
+    A first-ever profile yields materiality 'new'.
+    """
+    institution = current.get("institution") or {}
+    event = {
+        "ein": institution.get("ein"),
+        "name": institution.get("name"),
+        "distress_level": (current.get("signals") or {}).get("distress_level"),
+        "urgency_flag": _urgency(current),
+    }
+    if previous is None:
+        return {**event, "materiality": "new", "changes": []}
+
+    changes = diff_profiles(previous, current)
+    if not changes:
+        return None
+    top = max(changes, key=lambda change: MATERIALITY[change["materiality"]])["materiality"]
+    return {**event, "materiality": top, "changes": changes}
+
+
+def is_material(event: Optional[Dict[str, Any]]) -> bool:
+    """True for first profiles and material changes (the ones worth acting on)."""
+    return bool(event) and event["materiality"] in ("new", "material")
+
+
+def describe(change: Dict[str, Any]) -> str:
+    """One-line summary, e.g. 'distress_level: watch → critical (escalated)'."""
+    return f"{change['field']}: {change['old']} → {change['new']} ({change['note']})"
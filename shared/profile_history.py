@@ -0,0 +1,369 @@
+"""
+SHARED PROFILE HISTORY MODULE
+-----------------------------
+Append-only version history of every prospect profile, per EIN.
+
+The first version of a profile is stored whole; later versions are stored
+as structural JSON deltas against the previous one (["set", path, value] /
+["del", path], lists replaced whole), with a fresh full snapshot every
+SNAPSHOT_EVERY versions or whenever a delta would be larger than half a
+snapshot. Identical re-runs are not recorded.
+
+Files in `root` (default data/profile_history/):
+    <ein>.jsonl        one snapshot or delta per line, append-only
+    <ein>.index.jsonl  per version: {v, at, kind, offset, length, fields}
+    <ein>.lock         fcntl lock held while appending
+
+The daemon, sweep and CLI Analyst can all append for one EIN, so an
+append re-reads the index under the exclusive <ein>.lock before choosing
+its version number and diffing against the previous version.
+
+`fields` holds the values of TRACKED_FIELDS for that version, so time
+series of the usual ranking fields come from the small index alone;
+other paths replay only the deltas, from the nearest snapshot.
+
+    history = get_history()
+    history.get("23-1352650", at="2026-03")                     # as of end of March
+    history.series("23-1352650", "v2_signals.composite_score")  # [(at, value), ...]
+
+CLI:
+    python -m shared.profile_history versions 23-1352650
+    python -m shared.profile_history show 23-1352650 --at 2026-03
+    python -m shared.profile_history series 23-1352650 v2_signals.urgency_flag
+"""
+
+import argparse
+import copy
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from shared.profile_store import normalize_ein
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, single writer assumed
+    fcntl = None
+
+# Default location: <project>/data/profile_history/ (override with PROFILE_HISTORY_PATH)
+DEFAULT_HISTORY_DIR = Path(os.getenv(
+    "PROFILE_HISTORY_PATH",
+    Path(__file__).parent.parent / "data" / "profile_history"
+))
+
+SNAPSHOT_EVERY = 30
+
+# Values copied into every index line (cheap series, no document decoding)
+TRACKED_FIELDS = (
+    "signals.distress_level",
+    "v2_signals.composite_score",
+    "v2_signals.urgency_flag",
+    "financials.calculated.runway_years",
+    "financials.calculated.expense_ratio",
+    "financials.fiscal_year",
+    "composite_score",
+    "urgency_flag",
+)
+
+# =============================================================================
+# STRUCTURAL DELTAS
+# =============================================================================
+
+def diff(old: Any, new: Any, path: Tuple = ()) -> List[list]:
+    """Ops turning `old` into `new`. Dicts are walked; anything else is replaced whole."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key, value in new.items():
+            if key not in old:
+                ops.append(["set", list(path + (key,)), value])
+            elif old[key] != value:
+                ops.extend(diff(old[key], value, path + (key,)))
+        ops.extend(["del", list(path + (key,))] for key in old if key not in new)
+        return ops
+    return [] if old == new else [["set", list(path), new]]
+
+
+def apply(document: Any, ops: List[list]) -> Any:
+    """Apply ops in place (a root-level 'set' replaces the document)."""
+    for op in ops:
+        action, path = op[0], op[1]
+        if not path:
+            document = op[2]
+            continue
+        parent = document
+        for key in path[:-1]:
+            parent = parent.setdefault(key, {})
+        if action == "set":
+            parent[path[-1]] = op[2]
+        else:
+            parent.pop(path[-1], None)
+    return document
+
+
+def lookup(document: Any, path: str, default: Any = None) -> Any:
+    """Value at a dotted path ('financials.calculated.runway_years')."""
+    for key in path.split("."):
+        if not isinstance(document, dict) or key not in document:
+            return default
+        document = document[key]
+    return document
+
+
+def _touches(op_path: List[str], keys: List[str]) -> bool:
+    """True if an op on op_path can change the value at keys."""
+    shortest = min(len(op_path), len(keys))
+    return op_path[:shortest] == keys[:shortest]
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+# =============================================================================
+# HISTORY STORE
+# =============================================================================
+
+class ProfileHistory:
+    """Per-EIN snapshot + delta log with a small side index."""
+
+    def __init__(self, root=DEFAULT_HISTORY_DIR, snapshot_every: int = SNAPSHOT_EVERY):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.snapshot_every = snapshot_every
+        self._lock = threading.Lock()
+        self._latest: Dict[str, Tuple[int, Any]] = {}  # ein -> (version, document): append fast path
+
+    def _paths(self, ein: str) -> Tuple[Path, Path]:
+        return self.root / f"{ein}.jsonl", self.root / f"{ein}.index.jsonl"
+
+    @contextmanager
+    def file_lock(self, ein: str):
+        """Exclusive cross-process lock around one EIN's read-modify-append."""
+        with open(self.root / f"{ein}.lock", "a") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def versions(self, ein) -> List[Dict[str, Any]]:
+        """Index entries, oldest first."""
+        _, index_path = self._paths(normalize_ein(ein))
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return []
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                break  # torn last line from a crash mid-append
+        return entries
+
+    def _read_record(self, data_file, entry) -> Dict[str, Any]:
+        data_file.seek(entry["offset"])
+        return json.loads(data_file.read(entry["length"]))
+
+    def _select(self, entries, version: Optional[int], at: Optional[str]) -> Optional[int]:
+        """Position in `entries` of the requested version (latest by default)."""
+        if not entries:
+            return None
+        if version is not None:
+            position = version - 1
+            return position if 0 <= position < len(entries) else None
+        if at is not None:
+            matching = [i for i, e in enumerate(entries) if e["at"][:len(at)] <= at]
+            return matching[-1] if matching else None
+        return len(entries) - 1
+
+    def get(self, ein, version: Optional[int] = None, at: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Reconstruct one version. `version` is 1-based; `at` is an ISO date or
+        prefix ('2026-03', '2026-03-15') and selects the last version recorded
+        at or before it. Neither: the latest version.
+        """
+        ein = normalize_ein(ein)
+        entries = self.versions(ein)
+        target = self._select(entries, version, at)
+        if target is None:
+            return None
+        start = max(i for i in range(target + 1) if entries[i]["kind"] == "snapshot")
+
+        data_path, _ = self._paths(ein)
+        with open(data_path, "rb") as data_file:
+            document = self._read_record(data_file, entries[start])["doc"]
+            for entry in entries[start + 1:target + 1]:
+                document = apply(document, self._read_record(data_file, entry)["ops"])
+        return document
+
+    def series(self, ein, path: str) -> List[Tuple[str, Any]]:
+        """
+        [(recorded_at, value)] for a dotted field path, one point per version.
+        Tracked fields come straight from the index; other paths replay only
+        the ops that touch them.
+        """
+        ein = normalize_ein(ein)
+        entries = self.versions(ein)
+        if path in TRACKED_FIELDS:
+            return [(entry["at"], entry["fields"].get(path)) for entry in entries]
+
+        keys = path.split(".")
+        points = []
+        value = None
+        data_path, _ = self._paths(ein)
+        with open(data_path, "rb") as data_file:
+            for entry in entries:
+                record = self._read_record(data_file, entry)
+                if entry["kind"] == "snapshot":
+                    value = lookup(record["doc"], path)
+                else:
+                    for op in record["ops"]:
+                        op_path = op[1]
+                        if not _touches(op_path, keys):
+                            continue
+                        if len(op_path) > len(keys):
+                            # Edit inside the value: apply it relative to the value
+                            base = copy.deepcopy(value) if isinstance(value, dict) else {}
+                            value = apply(base, [[op[0], op_path[len(keys):]] + op[2:]])
+                        elif op[0] == "del":
+                            value = None
+                        elif len(op_path) == len(keys):
+                            value = op[2]
+                        else:
+                            value = lookup(op[2], ".".join(keys[len(op_path):]))
+                points.append((entry["at"], value))
+        return points
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, profile: Dict[str, Any], at: Optional[str] = None) -> Optional[int]:
+        """Record a new version; returns its number, or None if nothing changed."""
+        ein = normalize_ein((profile.get("institution") or {}).get("ein") or profile.get("ein"))
+        at = at or datetime.now(timezone.utc).isoformat(timespec="seconds")
+        data_path, index_path = self._paths(ein)
+
+        with self._lock, self.file_lock(ein):
+            entries = self.versions(ein)
+            cached = self._latest.get(ein)
+            if cached and cached[0] == len(entries):
+                previous = cached[1]
+            else:
+                # First append in this process, or another process appended since
+                previous = self.get(ein) if entries else None
+
+            snapshot = _dumps({"doc": profile})
+            if previous is None:
+                kind, line = "snapshot", snapshot
+            else:
+                ops = diff(previous, profile)
+                if not ops:
+                    return None
+                last_snapshot = max(i for i, e in enumerate(entries) if e["kind"] == "snapshot")
+                delta = _dumps({"ops": ops})
+                if len(entries) - last_snapshot >= self.snapshot_every or len(delta) * 2 > len(snapshot):
+                    kind, line = "snapshot", snapshot
+                else:
+                    kind, line = "delta", delta
+
+            encoded = (line + "\n").encode("utf-8")
+            # Data first, then the index line that makes it visible
+            with open(data_path, "ab") as f:
+                offset = f.seek(0, os.SEEK_END)
+                f.write(encoded)
+                f.flush()
+                os.fsync(f.fileno())
+            entry = {
+                "v": len(entries) + 1, "at": at, "kind": kind, "offset": offset, "length": len(encoded) - 1,
+                "fields": {path: lookup(profile, path) for path in TRACKED_FIELDS},
+            }
+            with open(index_path, "a+b") as f:
+                # Drop a torn tail left by a crash so the new line starts cleanly
+                f.seek(0)
+                content = f.read()
+                if content and not content.endswith(b"\n"):
+                    f.truncate(content.rfind(b"\n") + 1)
+                f.write((_dumps(entry) + "\n").encode("utf-8"))
+            self._latest[ein] = (entry["v"], copy.deepcopy(profile))
+        return entry["v"]
+
+    def stats(self) -> Dict[str, int]:
+        institutions = sorted(self.root.glob("*.index.jsonl"))
+        versions = sum(len(self.versions(p.name.split(".")[0])) for p in institutions)
+        size = sum(p.stat().st_size for p in self.root.glob("*.jsonl"))
+        return {"institutions": len(institutions), "versions": versions, "bytes": size}
+
+# =============================================================================
+# PROCESS-WIDE HISTORY (used by the Analyst)
+# =============================================================================
+
+_history: Optional[ProfileHistory] = None
+_history_lock = threading.Lock()
+
+
+def get_history() -> ProfileHistory:
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = ProfileHistory()
+        return _history
+
+
+def record_profile(profile: Dict[str, Any]) -> Optional[int]:
+    """Write-through from generate_dossier; never raises."""
+    try:
+        return get_history().append(profile)
+    except Exception as e:
+        print(f"⚠️ [HISTORY] Profile version not recorded: {e}")
+        return None
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Browse prospect profile history")
+    parser.add_argument("--dir", default=str(DEFAULT_HISTORY_DIR), help="History directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    versions = sub.add_parser("versions", help="List recorded versions of one EIN")
+    versions.add_argument("ein")
+
+    show = sub.add_parser("show", help="Reconstruct one version")
+    show.add_argument("ein")
+    show.add_argument("--version", type=int)
+    show.add_argument("--at", help="ISO date or prefix, e.g. 2026-03")
+
+    series = sub.add_parser("series", help="Value of a dotted field path across versions")
+    series.add_argument("ein")
+    series.add_argument("path")
+
+    sub.add_parser("stats", help="Institutions, versions and bytes on disk")
+
+    args = parser.parse_args(argv)
+    history = ProfileHistory(args.dir)
+
+    if args.command == "versions":
+        for entry in history.versions(args.ein):
+            print(f"v{entry['v']:<4} {entry['at']}  {entry['kind']:<8}  "
+                  f"{entry['fields'].get('signals.distress_level') or '-'}")
+    elif args.command == "show":
+        profile = history.get(args.ein, version=args.version, at=args.at)
+        print(json.dumps(profile, indent=2) if profile else "Not found.")
+    elif args.command == "series":
+        for at, value in history.series(args.ein, args.path):
+            print(f"{at}  {value}")
+    elif args.command == "stats":
+        print(history.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""
+SHARED PROFILE STORE
+--------------------
+One SQLite database holding every prospect profile, keyed by EIN.
+
+Each row keeps the full profile as a JSON column (queryable with
+json_extract) plus the fields reports rank and filter on, extracted into
+indexed columns: region, state, distress_level, composite_score,
+urgency_flag, runway_years, expense_ratio. The Analyst writes through on
+every generate_dossier; `{ein}_profile.json` files stay as the export
+format and can be (re-)imported at any time.
+
+    store = get_profile_store()
+    store.rank(urgency="IMMEDIATE", region="northeast", max_runway=3, limit=50)
+
+CLI:
+    python -m shared.profile_store import knowledge_base/prospects data/live_fire_results
+    python -m shared.profile_store top --urgency IMMEDIATE --region northeast --max-runway 3
+    python -m shared.profile_store show 23-1352650
+    python -m shared.profile_store export out/
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+# Default location: <project>/data/profiles.db (override with PROFILE_STORE_PATH)
+DEFAULT_STORE_PATH = Path(os.getenv(
+    "PROFILE_STORE_PATH",
+    Path(__file__).parent.parent / "data" / "profiles.db"
+))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    ein TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    state TEXT,
+    region TEXT,
+    distress_level TEXT,
+    composite_score REAL,
+    urgency_flag TEXT,
+    runway_years REAL,
+    expense_ratio REAL,
+    fiscal_year INTEGER,
+    generated_at TEXT,
+    updated_at TEXT NOT NULL,
+    source_path TEXT,
+    profile TEXT NOT NULL CHECK (json_valid(profile))
+);
+CREATE INDEX IF NOT EXISTS idx_profiles_score ON profiles (composite_score DESC);
+CREATE INDEX IF NOT EXISTS idx_profiles_urgency ON profiles (urgency_flag, composite_score DESC);
+CREATE INDEX IF NOT EXISTS idx_profiles_region ON profiles (region, composite_score DESC);
+CREATE INDEX IF NOT EXISTS idx_profiles_distress ON profiles (distress_level, composite_score DESC);
+CREATE INDEX IF NOT EXISTS idx_profiles_name ON profiles (name COLLATE NOCASE);
+"""
+
+_COLUMNS = ("ein", "name", "state", "region", "distress_level", "composite_score", "urgency_flag",
+            "runway_years", "expense_ratio", "fiscal_year", "generated_at", "updated_at", "source_path")
+
+
+def normalize_ein(ein: Any) -> str:
+    """'23-1352650', '231352650' and 231352650 are the same organization."""
+    digits = re.sub(r"\D", "", str(ein or ""))
+    if not digits:
+        raise ValueError(f"not an EIN: {ein!r}")
+    return digits.zfill(9)
+
+
+def _number(value):
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def extract_columns(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Indexed columns for one profile.
+
+    Handles both shapes in the tree: Analyst profiles (scores under the
+    v2_signals block) and batch-report profiles (composite_score and
+    urgency_flag at the top level, v2_signals as a list).
+    """
+    institution = profile.get("institution") or {}
+    location = institution.get("location") or {}
+    financials = profile.get("financials") or {}
+    calculated = financials.get("calculated") or {}
+    signals = profile.get("signals") or {}
+    v2 = profile.get("v2_signals")
+    v2 = v2 if isinstance(v2, dict) else {}
+
+    score = v2.get("composite_score", profile.get("composite_score"))
+    fiscal_year = financials.get("fiscal_year")
+    return {
+        "ein": normalize_ein(institution.get("ein") or profile.get("ein")),
+        "name": institution.get("name") or "Unknown",
+        "state": location.get("state"),
+        "region": location.get("region"),
+        "distress_level": signals.get("distress_level"),
+        "composite_score": _number(score),
+        "urgency_flag": v2.get("urgency_flag") or profile.get("urgency_flag"),
+        "runway_years": _number(calculated.get("runway_years")),
+        "expense_ratio": _number(calculated.get("expense_ratio")),
+        "fiscal_year": int(fiscal_year) if str(fiscal_year or "").isdigit() else None,
+        "generated_at": (profile.get("meta") or {}).get("generated_at"),
+    }
+
+# =============================================================================
+# STORE
+# =============================================================================
+
+class ProfileStore:
+    """EIN-keyed profile table with indexed ranking columns."""
+
+    def __init__(self, db_path=DEFAULT_STORE_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _upsert(self, profile: Dict[str, Any], source_path=None) -> Dict[str, Any]:
+        record = extract_columns(profile)
+        record["updated_at"] = datetime.now().isoformat(timespec="seconds")
+        record["source_path"] = str(source_path) if source_path else None
+        record["profile"] = json.dumps(profile, ensure_ascii=False)
+        columns = _COLUMNS + ("profile",)
+        self._conn.execute(
+            f"INSERT OR REPLACE INTO profiles ({', '.join(columns)}) "
+            f"VALUES ({', '.join(':' + c for c in columns)})",
+            record,
+        )
+        return record
+
+    def upsert(self, profile: Dict[str, Any], source_path=None) -> str:
+        """Insert or replace one profile; returns its normalized EIN."""
+        with self._lock:
+            return self._upsert(profile, source_path)["ein"]
+
+    def import_files(self, paths: Iterable) -> Dict[str, int]:
+        """Load *_profile.json files (or directories of them) in one transaction."""
+        files = []
+        for path in map(Path, paths):
+            files.extend(sorted(path.glob("*_profile.json")) if path.is_dir() else [path])
+
+        stats = {"imported": 0, "skipped": 0}
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for path in files:
+                    try:
+                        with open(path, "r", encoding="utf-8") as f:
+                            self._upsert(json.load(f), path)
+                    except (OSError, ValueError) as e:
+                        print(f"⚠️ [PROFILES] Skipped {path.name}: {e}")
+                        stats["skipped"] += 1
+                        continue
+                    stats["imported"] += 1
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return stats
+
+    def delete(self, ein) -> bool:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM profiles WHERE ein = ?", (normalize_ein(ein),))
+        return cursor.rowcount > 0
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def get(self, ein) -> Optional[Dict[str, Any]]:
+        """Full profile JSON for one EIN (None if unknown)."""
+        with self._lock:
+            row = self._conn.execute("SELECT profile FROM profiles WHERE ein = ?", (normalize_ein(ein),)).fetchone()
+        return json.loads(row["profile"]) if row else None
+
+    def rank(self, urgency: Optional[str] = None, region: Optional[str] = None,
+             distress_level: Optional[str] = None, state: Optional[str] = None,
+             max_runway: Optional[float] = None, min_score: Optional[float] = None,
+             limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Highest composite_score first, filtered on the indexed columns.
+        Rows come back without the profile JSON (use get() for that).
+        """
+        where, params = [], []
+        for column, value in (("urgency_flag", urgency), ("region", region),
+                              ("distress_level", distress_level), ("state", state)):
+            if value:
+                where.append(f"{column} = ?")
+                params.append(value)
+        if max_runway is not None:
+            where.append("runway_years < ?")
+            params.append(max_runway)
+        if min_score is not None:
+            where.append("composite_score >= ?")
+            params.append(min_score)
+
+        sql = (
+            f"SELECT {', '.join(_COLUMNS)} FROM profiles "
+            f"{'WHERE ' + ' AND '.join(where) if where else ''} "
+            "ORDER BY composite_score IS NULL, composite_score DESC, name LIMIT ?"
+        )
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params + [limit])]
+
+    def iter_profiles(self) -> Iterable[Dict[str, Any]]:
+        """Every stored profile (full JSON), in EIN order."""
+        with self._lock:
+            rows = self._conn.execute("SELECT profile FROM profiles ORDER BY ein").fetchall()
+        for row in rows:
+            yield json.loads(row["profile"])
+
+    def counts(self, column: str = "urgency_flag") -> Dict[str, int]:
+        if column not in ("urgency_flag", "region", "distress_level", "state"):
+            raise ValueError(f"cannot group by {column!r}")
+        with self._lock:
+            return {
+                row["value"]: row["n"]
+                for row in self._conn.execute(
+                    f"SELECT {column} AS value, COUNT(*) AS n FROM profiles GROUP BY {column}"
+                )
+            }
+
+    def export(self, directory) -> int:
+        """Write every stored profile back out as {ein}_profile.json."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            rows = self._conn.execute("SELECT ein, profile FROM profiles").fetchall()
+        for row in rows:
+            with open(directory / f"{row['ein']}_profile.json", "w", encoding="utf-8") as f:
+                json.dump(json.loads(row["profile"]), f, indent=2, ensure_ascii=False)
+        return len(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+# =============================================================================
+# PROCESS-WIDE STORE (used by the Analyst)
+# =============================================================================
+
+_store: Optional[ProfileStore] = None
+_store_lock = threading.Lock()
+
+
+def get_profile_store() -> ProfileStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ProfileStore()
+        return _store
+
+
+def save_profile(profile: Dict[str, Any], source_path=None) -> None:
+    """Write-through from generate_dossier; never raises (the JSON file is already on disk)."""
+    try:
+        get_profile_store().upsert(profile, source_path)
+    except Exception as e:
+        print(f"⚠️ [PROFILES] Store update failed: {e} (run: python -m shared.profile_store import <dir>)")
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def _print_rows(rows):
+    if not rows:
+        print("No matches.")
+    for row in rows:
+        score = "-" if row["composite_score"] is None else f"{row['composite_score']:.0f}"
+        runway = "-" if row["runway_years"] is None else f"{row['runway_years']:.1f}y"
+        print(f"{score:>5}  {row['urgency_flag'] or '-':<12} {row['distress_level'] or '-':<9} "
+              f"{runway:>6}  {row['region'] or '-':<10} {row['name']} ({row['ein']})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query or load the prospect profile store")
+    parser.add_argument("--db", default=str(DEFAULT_STORE_PATH), help="Store database path")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    load = sub.add_parser("import", help="Load *_profile.json files or directories")
+    load.add_argument("paths", nargs="+")
+
+    top = sub.add_parser("top", help="Rank profiles by composite score")
+    top.add_argument("--urgency")
+    top.add_argument("--region")
+    top.add_argument("--distress")
+    top.add_argument("--state")
+    top.add_argument("--max-runway", type=float)
+    top.add_argument("--min-score", type=float)
+    top.add_argument("--limit", type=int, default=50)
+
+    show = sub.add_parser("show", help="Print one stored profile")
+    show.add_argument("ein")
+
+    export = sub.add_parser("export", help="Write every profile out as {ein}_profile.json")
+    export.add_argument("directory")
+
+    args = parser.parse_args(argv)
+    store = ProfileStore(args.db)
+
+    if args.command == "import":
+        print(store.import_files(args.paths))
+    elif args.command == "top":
+        _print_rows(store.rank(
+            urgency=args.urgency, region=args.region, distress_level=args.distress, state=args.state,
+            max_runway=args.max_runway, min_score=args.min_score, limit=args.limit,
+        ))
+    elif args.command == "show":
+        profile = store.get(args.ein)
+        print(json.dumps(profile, indent=2) if profile else "Not found.")
+    elif args.command == "export":
+        print(f"Exported {store.export(args.directory)} profiles")
+
+
+if __name__ == "__main__":
+    main()
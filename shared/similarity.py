@@ -0,0 +1,516 @@
+"""
+SHARED SIMILARITY MODULE
+------------------------
+Offline "more like this" search over knowledge base notes and prospect
+profiles. No network, no GPU, no model download.
+
+Text is embedded with signed feature hashing (words + bigrams, sublinear
+TF) weighted by IDF, L2-normalized, and stored as rows of a float32
+matrix in a memory-mapped file. New documents are appended in place; the
+IDF table is updated as documents arrive (`rebuild` re-weights every row
+with the final IDF). Queries are a brute-force matrix-vector product over
+the mapped rows, which stays in the low milliseconds for tens of
+thousands of documents (see scripts/ops/bench_similarity.py).
+
+    index = get_similarity_index()
+    index.add("signal:...", text, kind="signal", title=...)
+    index_kb_file(path)        # shared.memory write-through for signals and docs
+    index.query("enrollment collapse after accreditation warning", k=5, kind="signal")
+    similar_prospects(profile, k=5)
+
+CLI:
+    python -m shared.similarity build
+    python -m shared.similarity query "layoffs and program cuts" --kind signal
+    python -m shared.similarity similar prospect:131969305
+
+Requires numpy (in requirements.txt). The import is guarded so that an
+install without it still saves profiles and notes; the write-through
+hooks then skip indexing.
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import threading
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, single writer assumed
+    fcntl = None
+
+KB_ROOT = Path(__file__).parent.parent / "knowledge_base"
+
+# Default location: <project>/data/similarity/ (override with SIMILARITY_INDEX_PATH)
+DEFAULT_INDEX_DIR = Path(os.getenv(
+    "SIMILARITY_INDEX_PATH",
+    Path(__file__).parent.parent / "data" / "similarity"
+))
+
+# Hashed feature space: 4096 float32 = 16 KiB per document
+DIMENSIONS = 4096
+INITIAL_CAPACITY = 1024
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9'\-]+")
+_STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the this to was were will with
+""".split())
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("shared.similarity needs numpy: pip install numpy")
+
+# =============================================================================
+# EMBEDDING
+# =============================================================================
+
+def features(text: str) -> Dict[str, int]:
+    """Term counts for unigrams and adjacent bigrams (stopwords dropped)."""
+    words = [w for w in _TOKEN.findall(text.lower()) if w not in _STOPWORDS]
+    counts: Dict[str, int] = {}
+    for word in words:
+        counts[word] = counts.get(word, 0) + 1
+    for left, right in zip(words, words[1:]):
+        bigram = f"{left} {right}"
+        counts[bigram] = counts.get(bigram, 0) + 1
+    return counts
+
+
+def _slot(term: str, dimensions: int):
+    """Stable (process-independent) bucket and sign for a term."""
+    h = zlib.crc32(term.encode("utf-8"))
+    return h % dimensions, (1.0 if (h >> 31) & 1 else -1.0)
+
+
+def hashed_tf(text: str, dimensions: int = DIMENSIONS):
+    """Sparse sublinear-TF vector as {bucket: value} plus the set of touched buckets."""
+    vector: Dict[int, float] = {}
+    for term, count in features(text).items():
+        bucket, sign = _slot(term, dimensions)
+        vector[bucket] = vector.get(bucket, 0.0) + sign * (1.0 + math.log(count))
+    return vector
+
+# =============================================================================
+# INDEX
+# =============================================================================
+
+class SimilarityIndex:
+    """
+    Memory-mapped matrix of document vectors plus a JSONL row catalogue.
+
+    Files in `directory`:
+        vectors.f32   rows x DIMENSIONS float32 (grown by doubling)
+        rows.jsonl    one {"id", "kind", "title", "path", "row", "buckets", ...} per write, append-only
+                      (buckets: the row's hashed features, so a replace can undo its df)
+        df.npy        document frequency per bucket (for IDF)
+        state.json    {"dimensions", "count", "capacity"}
+        index.lock    fcntl lock held by writers
+
+    The Analyst, memory write-throughs and Sentinel pool workers all add to
+    the same directory, so every write takes the file lock and reloads the
+    files if another process flushed since, before choosing a row.
+    """
+
+    def __init__(self, directory=DEFAULT_INDEX_DIR, dimensions: int = DIMENSIONS):
+        _require_numpy()
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.dimensions = dimensions
+        self._lock = threading.Lock()
+        self._kind_masks: Dict[str, Any] = {}
+        self._matrix = None
+        self._state_version = None
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _state_stat(self):
+        try:
+            stat = (self.directory / "state.json").stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _load(self):
+        """(Re)read state.json, df.npy and rows.jsonl, and remap the vectors."""
+        self._state_version = self._state_stat()
+        state_path = self.directory / "state.json"
+        if state_path.exists():
+            state = json.loads(state_path.read_text(encoding="utf-8"))
+            if state["dimensions"] != self.dimensions:
+                raise ValueError(f"index built with {state['dimensions']} dimensions, not {self.dimensions}")
+        else:
+            state = {"dimensions": self.dimensions, "count": 0, "capacity": 0}
+        self.count = state["count"]
+        self.capacity = state["capacity"]
+
+        df_path = self.directory / "df.npy"
+        self.df = np.load(df_path) if df_path.exists() else np.zeros(self.dimensions, dtype=np.float64)
+        self.rows: List[Dict[str, Any]] = []
+        rows_path = self.directory / "rows.jsonl"
+        if rows_path.exists():
+            with open(rows_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    row = json.loads(line)
+                    if row.get("row") is not None and row["row"] < len(self.rows):
+                        self.rows[row["row"]] = row  # replace, or a row left unflushed by a crash
+                    else:
+                        self.rows.append(row)
+        # Rows appended after the last flushed state.json are dropped
+        self.rows = self.rows[:self.count]
+        self.positions: Dict[str, int] = {row["id"]: i for i, row in enumerate(self.rows)}
+        self._kind_masks.clear()
+        if self._matrix is not None:
+            del self._matrix
+        self._matrix = self._open(self.capacity) if self.capacity else None
+
+    def refresh(self, force: bool = False):
+        """Reload if another process flushed the index (always, with force)."""
+        if force or self._state_stat() != self._state_version:
+            self._load()
+
+    @contextmanager
+    def file_lock(self):
+        """Exclusive cross-process lock around a read-modify-write of the index."""
+        with open(self.directory / "index.lock", "a") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def _open(self, capacity):
+        return np.memmap(self.directory / "vectors.f32", dtype=np.float32, mode="r+",
+                         shape=(capacity, self.dimensions))
+
+    def _ensure_capacity(self, rows_needed):
+        if rows_needed <= self.capacity:
+            return
+        capacity = max(INITIAL_CAPACITY, self.capacity)
+        while capacity < rows_needed:
+            capacity *= 2
+        if self._matrix is not None:
+            self._matrix.flush()
+            del self._matrix
+        with open(self.directory / "vectors.f32", "ab") as f:
+            f.truncate(capacity * self.dimensions * 4)
+        self.capacity = capacity
+        self._matrix = self._open(capacity)
+
+    def _save_state(self):
+        np.save(self.directory / "df.npy", self.df)
+        state = {"dimensions": self.dimensions, "count": self.count, "capacity": self.capacity}
+        tmp = self.directory / f"state.json.{os.getpid()}.tmp"
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp, self.directory / "state.json")
+        self._state_version = self._state_stat()
+
+    # ------------------------------------------------------------------
+    # Vectors
+    # ------------------------------------------------------------------
+
+    def idf(self):
+        return np.log((1.0 + self.count) / (1.0 + self.df)) + 1.0
+
+    def _dense(self, sparse: Dict[int, float], idf=None):
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        if sparse:
+            buckets = np.fromiter(sparse.keys(), dtype=np.int64, count=len(sparse))
+            values = np.fromiter(sparse.values(), dtype=np.float64, count=len(sparse))
+            weights = (idf if idf is not None else self.idf())[buckets]
+            vector[buckets] = values * weights
+            norm = np.linalg.norm(vector)
+            if norm:
+                vector /= norm
+        return vector
+
+    def embed(self, text: str):
+        """Query-side embedding with the current IDF."""
+        return self._dense(hashed_tf(text, self.dimensions))
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _add(self, doc_id: str, text: str, kind: str, meta: Dict[str, Any]) -> int:
+        """Write one document (caller holds both locks and has refreshed)."""
+        sparse = hashed_tf(text, self.dimensions)
+        buckets = sorted(sparse)
+        row = self.positions.get(doc_id)
+        if row is None:
+            row = self.count
+            self._ensure_capacity(row + 1)
+            self.count += 1
+            record = {"id": doc_id, "kind": kind, **meta, "row": row, "buckets": buckets}
+            self.rows.append(record)
+        else:
+            # Undo the old document's df before counting the new one
+            old_buckets = self.rows[row].get("buckets")
+            if old_buckets:
+                self.df[old_buckets] -= 1
+            record = {"id": doc_id, "kind": kind, **meta, "row": row, "buckets": buckets}
+            self.rows[row] = record
+        self.df[buckets] += 1
+        self.positions[doc_id] = row
+        self._kind_masks.clear()
+        self._matrix[row] = self._dense(sparse)
+
+        with open(self.directory / "rows.jsonl", "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+        return row
+
+    def add(self, doc_id: str, text: str, kind: str = "document", **meta) -> int:
+        """Insert or replace a document; returns its row number."""
+        with self._lock, self.file_lock():
+            self.refresh()
+            row = self._add(doc_id, text, kind, meta)
+            self.flush()
+        return row
+
+    def flush(self):
+        if self._matrix is not None:
+            self._matrix.flush()
+        self._save_state()
+
+    def add_many(self, documents: Iterable[Dict[str, Any]]) -> int:
+        """Bulk add ({'id', 'text', 'kind', ...meta}) under one lock; flushes once at the end."""
+        added = 0
+        with self._lock, self.file_lock():
+            self.refresh()
+            for doc in documents:
+                doc = dict(doc)
+                self._add(doc.pop("id"), doc.pop("text"), doc.pop("kind", "document"), doc)
+                added += 1
+            self.flush()
+        return added
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _kind_mask(self, kind):
+        mask = self._kind_masks.get(kind)
+        if mask is None:
+            mask = np.fromiter((row["kind"] == kind for row in self.rows), dtype=bool, count=self.count)
+            self._kind_masks[kind] = mask
+        return mask
+
+    def _top_k(self, vector, k, kind=None, exclude=None):
+        if not self.count:
+            return []
+        scores = np.asarray(self._matrix[:self.count] @ vector)
+        if kind is not None:
+            scores = np.where(self._kind_mask(kind), scores, -np.inf)
+        if exclude is not None:
+            scores[exclude] = -np.inf
+        k = min(k, self.count)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            {**{k: v for k, v in self.rows[i].items() if k != "buckets"}, "score": float(scores[i])}
+            for i in top if np.isfinite(scores[i]) and scores[i] > 0
+        ]
+
+    def query(self, text: str, k: int = 10, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Top-k documents by cosine similarity to free text."""
+        return self._top_k(self.embed(text), k, kind)
+
+    def similar(self, doc_id: str, k: int = 10, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Top-k neighbours of an indexed document (itself excluded)."""
+        row = self.positions[doc_id]
+        return self._top_k(np.array(self._matrix[row]), k, kind, exclude=row)
+
+    def rebuild(self, documents: Iterable[Dict[str, Any]]):
+        """Recreate the index from scratch so every row uses the final IDF."""
+        docs = list(documents)
+        with self._lock, self.file_lock():
+            for name in ("vectors.f32", "rows.jsonl", "df.npy", "state.json"):
+                path = self.directory / name
+                if path.exists():
+                    path.unlink()
+            self._matrix = None
+            self.count = self.capacity = 0
+            self.rows, self.positions = [], {}
+            self._kind_masks.clear()
+            self.df = np.zeros(self.dimensions, dtype=np.float64)
+            # First pass: document frequencies only
+            sparse_docs = [hashed_tf(doc["text"], self.dimensions) for doc in docs]
+            for sparse in sparse_docs:
+                self.df[list(sparse.keys())] += 1
+            self._ensure_capacity(len(docs) or 1)
+            self.count = len(docs)
+            idf = self.idf()
+            with open(self.directory / "rows.jsonl", "w", encoding="utf-8") as f:
+                for row, (doc, sparse) in enumerate(zip(docs, sparse_docs)):
+                    record = {k: v for k, v in doc.items() if k != "text"}
+                    record.setdefault("kind", "document")
+                    record["row"] = row
+                    record["buckets"] = sorted(sparse)
+                    self._matrix[row] = self._dense(sparse, idf)
+                    self.rows.append(record)
+                    self.positions[record["id"]] = row
+                    f.write(json.dumps(record) + "\n")
+            self.flush()
+        return len(docs)
+
+# =============================================================================
+# DOCUMENT SOURCES
+# =============================================================================
+
+def profile_summary(profile: Dict[str, Any]) -> str:
+    """Flatten a prospect profile into text: who it is, how it looks, what is happening."""
+    institution = profile.get("institution", {})
+    location = institution.get("location", {}) or {}
+    signals = profile.get("signals", {}) or {}
+    calculated = (profile.get("financials", {}) or {}).get("calculated", {}) or {}
+
+    parts = [
+        str(institution.get("name", "")),
+        str(institution.get("type", "")),
+        str(location.get("state", "")),
+        f"distress {signals.get('distress_level', 'unknown')}",
+    ]
+    # Coarse buckets so similar financial shapes share tokens
+    expense_ratio = calculated.get("expense_ratio")
+    if isinstance(expense_ratio, (int, float)):
+        parts.append("deficit spending" if expense_ratio > 1.0 else "balanced budget")
+    runway = calculated.get("runway_years")
+    if isinstance(runway, (int, float)):
+        parts.append("runway critical" if runway < 2 else "runway limited" if runway < 4 else "runway stable")
+    for indicator in signals.get("indicators", []) or []:
+        parts.append(f"{indicator.get('type', '')} {indicator.get('signal', '')}")
+    v2 = profile.get("v2_signals")
+    v2 = v2 if isinstance(v2, dict) else {}  # batch-report profiles carry a bare list here
+    urgency = v2.get("urgency_flag") or profile.get("urgency_flag")
+    if urgency:
+        parts.append(f"urgency {urgency}")
+    return ". ".join(p for p in parts if p and p.strip())
+
+
+def profile_document(profile: Dict[str, Any], path=None) -> Dict[str, Any]:
+    institution = profile.get("institution", {}) or {}
+    ein = str(institution.get("ein") or "").replace("-", "")
+    name = institution.get("name", "Unknown")
+    doc_id = f"prospect:{ein or (Path(path).stem if path else name)}"
+    return {"id": doc_id, "text": profile_summary(profile), "kind": "prospect",
+            "title": name, "path": str(path) if path else None}
+
+
+_KB_KINDS = {"signals": "signal", "docs": "doc", "prospects": "dossier"}
+
+
+def kb_document(path, kb_root=KB_ROOT) -> Dict[str, Any]:
+    """One markdown note (signal, doc or dossier) as an index document."""
+    from shared.kb_index import parse_frontmatter
+
+    path, kb_root = Path(path), Path(kb_root)
+    meta, body = parse_frontmatter(path.read_text(encoding="utf-8", errors="replace"))
+    top = path.relative_to(kb_root).parts[0]
+    kind = _KB_KINDS.get(top, top)
+    return {"id": f"kb:{path.relative_to(kb_root).as_posix()}", "text": f"{meta.get('title', '')}\n{body}",
+            "kind": kind, "title": str(meta.get("title") or path.stem), "path": str(path)}
+
+
+def knowledge_base_documents(kb_root=KB_ROOT) -> Iterable[Dict[str, Any]]:
+    """Signals, docs and dossiers (markdown) plus prospect profiles (JSON) under `kb_root`."""
+    kb_root = Path(kb_root)
+    for path in sorted(kb_root.rglob("*.md")):
+        yield kb_document(path, kb_root)
+    for path in sorted(kb_root.rglob("*_profile.json")):
+        try:
+            profile = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            continue
+        yield profile_document(profile, path)
+
+# =============================================================================
+# AGENT HOOKS
+# =============================================================================
+
+_index: Optional[SimilarityIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_similarity_index() -> SimilarityIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SimilarityIndex()
+        return _index
+
+
+def index_profile(profile: Dict[str, Any], path=None) -> None:
+    """Analyst write-through; best effort (numpy may be missing)."""
+    try:
+        doc = profile_document(profile, path)
+        get_similarity_index().add(doc.pop("id"), doc.pop("text"), **doc)
+    except Exception as e:
+        print(f"⚠️ [SIMILARITY] Profile not indexed: {e}")
+
+
+def index_kb_file(path, kb_root=KB_ROOT) -> None:
+    """shared.memory write-through for a saved note; best effort (numpy may be missing)."""
+    if np is None:
+        return
+    try:
+        doc = kb_document(path, kb_root)
+        get_similarity_index().add(doc.pop("id"), doc.pop("text"), **doc)
+    except Exception as e:
+        print(f"⚠️ [SIMILARITY] {Path(path).name} not indexed: {e}")
+
+
+def similar_prospects(profile: Dict[str, Any], k: int = 5) -> List[Dict[str, Any]]:
+    """Indexed prospects that look most like `profile` (the profile itself excluded)."""
+    doc = profile_document(profile)
+    hits = get_similarity_index().query(doc["text"], k=k + 1, kind="prospect")
+    return [hit for hit in hits if hit["id"] != doc["id"]][:k]
+
+
+def similar_signals(text: str, k: int = 5) -> List[Dict[str, Any]]:
+    return get_similarity_index().query(text, k=k, kind="signal")
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+KINDS = ["signal", "doc", "dossier", "prospect"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline similarity search over the knowledge base")
+    parser.add_argument("--dir", default=str(DEFAULT_INDEX_DIR), help="Index directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="Rebuild from knowledge_base (markdown + prospect profiles)")
+    query = sub.add_parser("query", help="Documents similar to free text")
+    query.add_argument("text")
+    query.add_argument("--kind", choices=KINDS)
+    query.add_argument("-k", type=int, default=10)
+    similar = sub.add_parser("similar", help="Neighbours of an indexed document id")
+    similar.add_argument("doc_id")
+    similar.add_argument("--kind", choices=KINDS)
+    similar.add_argument("-k", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    index = SimilarityIndex(args.dir)
+    if args.command == "build":
+        print(f"Indexed {index.rebuild(knowledge_base_documents())} documents")
+        return
+    hits = index.query(args.text, args.k, args.kind) if args.command == "query" \
+        else index.similar(args.doc_id, args.k, args.kind)
+    for hit in hits:
+        print(f"{hit['score']:.3f}  [{hit['kind']}]  {hit.get('title', '')}  ({hit['id']})")
+
+
+if __name__ == "__main__":
+    main()
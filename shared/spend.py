@@ -0,0 +1,391 @@
+"""
+SHARED SPEND LEDGER
+-------------------
+Persistent record of every paid (or rate-limited) API call, with budget
+enforcement across runs, agents and processes.
+
+Every Perplexity, Anthropic and Graph call is written to one SQLite table
+with its agent, run, target, tokens, latency and estimated cost (PRICING,
+USD per million tokens plus per-request fees). Budgets:
+
+    daily    SPEND_DAILY_BUDGET_USD (unset = unlimited), all agents, UTC day
+    per run  budget_usd passed to run(...) (e.g. sweep --budget)
+
+Admission is priority-aware: lower priorities stop short of the budget,
+keeping PRIORITY_RESERVE of it for more urgent targets, so when money is
+tight IMMEDIATE targets are still served after MONITOR ones are refused.
+
+An admitted estimate is reserved in the same write transaction as the
+check, so concurrent sweeps and daemons cannot all be admitted past the
+budget. The caller releases the reservation once the real calls are
+recorded; unreleased ones expire after RESERVATION_TTL_SECONDS.
+
+    with spend.run("sweep", budget_usd=5):
+        decision = spend.admit(0.05, priority="HIGH")   -> {"admitted": True, "reservation_id": ...}
+        spend.record_call("perplexity", model="sonar", input_tokens=..., ...)
+        spend.release(decision)
+
+CLI:
+    python -m shared.spend status
+    python -m shared.spend report --days 7 --by agent
+    python -m shared.spend runs
+"""
+
+import argparse
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+# Default location: <project>/data/spend.db (override with SPEND_LEDGER_PATH)
+DEFAULT_LEDGER_PATH = Path(os.getenv(
+    "SPEND_LEDGER_PATH",
+    Path(__file__).parent.parent / "data" / "spend.db"
+))
+
+DAILY_BUDGET_USD = float(os.environ["SPEND_DAILY_BUDGET_USD"]) if os.getenv("SPEND_DAILY_BUDGET_USD") else None
+
+# provider -> model -> USD per million input/output tokens, plus per-request fee
+# ("*" = any other model of that provider)
+PRICING = {
+    "perplexity": {"sonar": {"input": 1.00, "output": 1.00, "request": 0.005}},
+    "anthropic": {
+        "claude-3-haiku-20240307": {"input": 0.25, "output": 1.25},
+        "claude-opus-4-1-20250805": {"input": 15.00, "output": 75.00},
+        "*": {"input": 3.00, "output": 15.00},
+    },
+    "graph": {"*": {}},
+}
+
+# Share of each budget a priority may not spend (held back for higher priorities)
+PRIORITY_RESERVE = {"IMMEDIATE": 0.0, "HIGH": 0.10, "MONITOR": 0.25}
+
+# Admitted-but-unreleased estimates stop counting against budgets after this
+RESERVATION_TTL_SECONDS = 900
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS calls (
+    id INTEGER PRIMARY KEY,
+    at REAL NOT NULL,
+    day TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    model TEXT,
+    agent TEXT,
+    run_id TEXT,
+    target TEXT,
+    status TEXT,
+    input_tokens INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    latency_ms REAL,
+    cost_usd REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_calls_day ON calls (day);
+CREATE INDEX IF NOT EXISTS idx_calls_run ON calls (run_id);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    agent TEXT,
+    started_at TEXT NOT NULL,
+    budget_usd REAL
+);
+CREATE TABLE IF NOT EXISTS reservations (
+    id INTEGER PRIMARY KEY,
+    expires_at REAL NOT NULL,
+    day TEXT NOT NULL,
+    run_id TEXT,
+    amount_usd REAL NOT NULL
+);
+"""
+
+REPORT_GROUPS = {"provider": "provider", "agent": "agent", "run": "run_id", "day": "day", "model": "model"}
+
+
+def estimate_cost(provider: str, model: Optional[str] = None,
+                  input_tokens: int = 0, output_tokens: int = 0, requests: int = 1) -> float:
+    models = PRICING.get(provider, {})
+    price = models.get(model) or models.get("*") or {}
+    return round(
+        (input_tokens * price.get("input", 0) + output_tokens * price.get("output", 0)) / 1_000_000
+        + requests * price.get("request", 0),
+        6,
+    )
+
+
+def _today() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+# =============================================================================
+# RUN CONTEXT (per thread)
+# =============================================================================
+
+_context = threading.local()
+
+
+def current_run() -> Dict[str, Any]:
+    """{'run_id', 'agent', 'budget_usd', 'target'} of the calling thread (empty outside a run)."""
+    return getattr(_context, "run", None) or {}
+
+
+@contextmanager
+def run(agent: str, budget_usd: Optional[float] = None, run_id: Optional[str] = None,
+        ledger: Optional["SpendLedger"] = None) -> Iterator[str]:
+    """Attribute calls on this thread to one run, optionally capped at budget_usd."""
+    run_id = run_id or f"{agent}-{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}"
+    previous = current_run()
+    _context.run = {"run_id": run_id, "agent": agent, "budget_usd": budget_usd, "target": None}
+    try:
+        (ledger or get_ledger()).start_run(run_id, agent, budget_usd)
+    except Exception as e:
+        print(f"⚠️ [SPEND] Could not register run {run_id}: {e}")
+    try:
+        yield run_id
+    finally:
+        _context.run = previous
+
+
+@contextmanager
+def target(name: Optional[str]):
+    """Attribute calls on this thread to one target (institution) within the current run."""
+    context = dict(current_run())
+    previous = getattr(_context, "run", None)
+    _context.run = {**context, "target": name}
+    try:
+        yield
+    finally:
+        _context.run = previous
+
+# =============================================================================
+# LEDGER
+# =============================================================================
+
+class SpendLedger:
+    """Append-only call table plus registered runs; safe across threads and processes."""
+
+    def __init__(self, db_path=DEFAULT_LEDGER_PATH, daily_budget_usd: Optional[float] = DAILY_BUDGET_USD):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.daily_budget_usd = daily_budget_usd
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def start_run(self, run_id: str, agent: str, budget_usd: Optional[float] = None):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO runs (run_id, agent, started_at, budget_usd) VALUES (?, ?, ?, ?)",
+                (run_id, agent, datetime.now(timezone.utc).isoformat(timespec="seconds"), budget_usd),
+            )
+
+    def record(self, provider: str, model: Optional[str] = None, input_tokens: int = 0,
+               output_tokens: int = 0, latency_ms: Optional[float] = None, status: str = "ok",
+               cost_usd: Optional[float] = None, agent: Optional[str] = None,
+               run_id: Optional[str] = None, target: Optional[str] = None) -> float:
+        """Append one call; cost is estimated from PRICING unless given. Returns the cost."""
+        if cost_usd is None:
+            cost_usd = estimate_cost(provider, model, input_tokens, output_tokens) if status == "ok" else 0.0
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO calls (at, day, provider, model, agent, run_id, target, status, "
+                "input_tokens, output_tokens, latency_ms, cost_usd) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (time.time(), _today(), provider, model, agent, run_id, target, str(status),
+                 int(input_tokens or 0), int(output_tokens or 0), latency_ms, cost_usd),
+            )
+        return cost_usd
+
+    def _spent(self, day: Optional[str] = None, run_id: Optional[str] = None, reserved: bool = False) -> float:
+        if run_id is not None:
+            where, args = "run_id = ?", (run_id,)
+        else:
+            where, args = "day = ?", (day or _today(),)
+        total = self._conn.execute(f"SELECT SUM(cost_usd) FROM calls WHERE {where}", args).fetchone()[0] or 0.0
+        if reserved:
+            total += self._conn.execute(
+                f"SELECT SUM(amount_usd) FROM reservations WHERE {where} AND expires_at > ?", args + (time.time(),)
+            ).fetchone()[0] or 0.0
+        return round(total, 6)
+
+    def spent(self, day: Optional[str] = None, run_id: Optional[str] = None) -> float:
+        """Total cost of one UTC day (default today) or, with run_id, of one run."""
+        with self._lock:
+            return self._spent(day, run_id)
+
+    def admit(self, estimate_usd: float, priority: str = "MONITOR", run_id: Optional[str] = None,
+              run_budget_usd: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Whether a call (or group of calls) costing about `estimate_usd` fits
+        the daily budget and the run's budget, after holding back
+        PRIORITY_RESERVE[priority] of each for more urgent work. Spend and
+        live reservations both count; an admitted estimate is reserved in
+        the same transaction (BEGIN IMMEDIATE serializes processes) and its
+        id returned as 'reservation_id' for release().
+        """
+        reserve = PRIORITY_RESERVE.get(str(priority).upper(), PRIORITY_RESERVE["MONITOR"])
+        decision = {"admitted": True, "reason": "ok", "priority": priority, "estimate_usd": estimate_usd,
+                    "daily_spent_usd": None, "daily_budget_usd": self.daily_budget_usd,
+                    "run_spent_usd": None, "run_budget_usd": run_budget_usd, "reservation_id": None}
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM reservations WHERE expires_at <= ?", (time.time(),))
+                decision["daily_spent_usd"] = self._spent(reserved=True)
+                if self.daily_budget_usd is not None and \
+                        decision["daily_spent_usd"] + estimate_usd > self.daily_budget_usd * (1 - reserve) + 1e-9:
+                    decision.update(admitted=False, reason="daily_budget")
+                elif run_id is not None and run_budget_usd is not None:
+                    decision["run_spent_usd"] = self._spent(run_id=run_id, reserved=True)
+                    if decision["run_spent_usd"] + estimate_usd > run_budget_usd * (1 - reserve) + 1e-9:
+                        decision.update(admitted=False, reason="run_budget")
+                if decision["admitted"] and estimate_usd > 0:
+                    decision["reservation_id"] = self._conn.execute(
+                        "INSERT INTO reservations (expires_at, day, run_id, amount_usd) VALUES (?, ?, ?, ?)",
+                        (time.time() + RESERVATION_TTL_SECONDS, _today(), run_id, estimate_usd),
+                    ).lastrowid
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return decision
+
+    def release(self, reservation_id: Optional[int]):
+        """Drop a reservation once its real calls are recorded (or it was not used)."""
+        if reservation_id is None:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM reservations WHERE id = ?", (reservation_id,))
+
+    def report(self, since_day: Optional[str] = None, group_by: str = "provider") -> List[Dict[str, Any]]:
+        column = REPORT_GROUPS[group_by]
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {column} AS key, COUNT(*) AS calls, SUM(input_tokens) AS input_tokens, "
+                f"SUM(output_tokens) AS output_tokens, AVG(latency_ms) AS avg_latency_ms, "
+                f"SUM(cost_usd) AS cost_usd FROM calls WHERE day >= ? "
+                f"GROUP BY {column} ORDER BY cost_usd DESC",
+                (since_day or "",),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def runs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT r.run_id, r.agent, r.started_at, r.budget_usd, COUNT(c.id) AS calls, "
+                "COALESCE(SUM(c.cost_usd), 0) AS cost_usd FROM runs r "
+                "LEFT JOIN calls c ON c.run_id = r.run_id GROUP BY r.run_id "
+                "ORDER BY r.started_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+# =============================================================================
+# PROCESS-WIDE LEDGER (used by the agents)
+# =============================================================================
+
+_ledger: Optional[SpendLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_ledger() -> SpendLedger:
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = SpendLedger()
+        return _ledger
+
+
+def record_call(provider: str, model: Optional[str] = None, input_tokens: int = 0,
+                output_tokens: int = 0, latency_ms: Optional[float] = None, status: str = "ok",
+                agent: Optional[str] = None) -> None:
+    """Record one call under the current run; never raises."""
+    context = current_run()
+    try:
+        get_ledger().record(
+            provider, model=model, input_tokens=input_tokens, output_tokens=output_tokens,
+            latency_ms=latency_ms, status=status, agent=agent or context.get("agent"),
+            run_id=context.get("run_id"), target=context.get("target"),
+        )
+    except Exception as e:
+        print(f"⚠️ [SPEND] Could not record {provider} call: {e}")
+
+
+def admit(estimate_usd: float, priority: str = "MONITOR") -> Dict[str, Any]:
+    """Budget admission for the current run; admits (fails open) if the ledger is unavailable."""
+    context = current_run()
+    try:
+        return get_ledger().admit(estimate_usd, priority, run_id=context.get("run_id"),
+                                  run_budget_usd=context.get("budget_usd"))
+    except Exception as e:
+        print(f"⚠️ [SPEND] Budget check unavailable: {e}")
+        return {"admitted": True, "reason": "ledger_unavailable", "priority": priority}
+
+
+def release(decision: Optional[Dict[str, Any]]) -> None:
+    """Release the reservation of an admit() decision; never raises."""
+    reservation_id = (decision or {}).get("reservation_id")
+    if reservation_id is None:
+        return
+    try:
+        get_ledger().release(reservation_id)
+    except Exception as e:
+        print(f"⚠️ [SPEND] Could not release reservation {reservation_id}: {e}")
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API spend ledger and budgets")
+    parser.add_argument("--db", default=str(DEFAULT_LEDGER_PATH), help="Ledger database path")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("status", help="Today's spend against the daily budget")
+
+    report = sub.add_parser("report", help="Calls, tokens, latency and cost")
+    report.add_argument("--days", type=int, default=7)
+    report.add_argument("--by", choices=sorted(REPORT_GROUPS), default="provider")
+
+    runs = sub.add_parser("runs", help="Recent runs with their spend and budget")
+    runs.add_argument("--limit", type=int, default=20)
+
+    args = parser.parse_args(argv)
+    ledger = SpendLedger(args.db)
+
+    if args.command == "status":
+        spent = ledger.spent()
+        if ledger.daily_budget_usd is None:
+            print(f"Today ({_today()}): ${spent:.2f} spent, no daily budget (SPEND_DAILY_BUDGET_USD)")
+        else:
+            print(f"Today ({_today()}): ${spent:.2f} of ${ledger.daily_budget_usd:.2f}")
+            for priority, reserve in PRIORITY_RESERVE.items():
+                limit = ledger.daily_budget_usd * (1 - reserve)
+                print(f"  {priority:<10} may spend up to ${limit:.2f} (${max(limit - spent, 0):.2f} left)")
+    elif args.command == "report":
+        since = (datetime.now(timezone.utc) - timedelta(days=args.days - 1)).strftime("%Y-%m-%d")
+        rows = ledger.report(since, args.by)
+        print(f"{args.by:<40} {'calls':>6} {'in tok':>9} {'out tok':>9} {'avg ms':>8} {'cost':>9}")
+        for row in rows:
+            latency = "-" if row["avg_latency_ms"] is None else f"{row['avg_latency_ms']:.0f}"
+            print(f"{str(row['key'] or '-'):<40} {row['calls']:>6} {row['input_tokens']:>9} "
+                  f"{row['output_tokens']:>9} {latency:>8} ${row['cost_usd']:>8.4f}")
+        print(f"{'total':<40} {sum(r['calls'] for r in rows):>6} {'':>9} {'':>9} {'':>8} "
+              f"${sum(r['cost_usd'] for r in rows):>8.4f}")
+    elif args.command == "runs":
+        for row in ledger.runs(args.limit):
+            budget = "-" if row["budget_usd"] is None else f"${row['budget_usd']:.2f}"
+            print(f"{row['started_at']}  {row['run_id']:<40} {row['calls']:>5} calls  "
+                  f"${row['cost_usd']:.4f} / {budget}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Integration test: daemon job scheduler overlap, catch-up and timeouts (fake clock)."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from agents.daemon.scheduler import JobScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _wait_idle(scheduler, name, timeout=2.0):
+    deadline = time.time() + timeout
+    while scheduler.jobs[name].running and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_slow_job_does_not_block_other_jobs_and_skips_overlap():
+    clock = FakeClock()
+    scheduler = JobScheduler(clock=clock)
+    release = threading.Event()
+    fast_runs = []
+
+    scheduler.add_job("slow", release.wait, 60, run_immediately=True)
+    scheduler.add_job("fast", lambda: fast_runs.append(clock()), 5, run_immediately=True)
+
+    scheduler.tick()
+    _wait_idle(scheduler, "fast")
+    for _ in range(3):
+        clock.now += 60
+        scheduler.tick()
+        _wait_idle(scheduler, "fast")
+
+    assert len(fast_runs) == 4
+    stats = scheduler.stats()
+    assert stats["slow"]["running"] is True
+    assert stats["slow"]["skipped"] == 3
+
+    release.set()
+    _wait_idle(scheduler, "slow")
+    assert scheduler.stats()["slow"]["runs"] == 1
+
+
+def test_catch_up_policies():
+    clock = FakeClock()
+    scheduler = JobScheduler(clock=clock)
+    coalesce = scheduler.add_job("coalesce", lambda: None, 60, catch_up="coalesce")
+    skip = scheduler.add_job("skip", lambda: None, 60, catch_up="skip")
+
+    clock.now += 60 * 3 + 10  # daemon was suspended for three intervals
+    scheduler.tick()
+    _wait_idle(scheduler, "coalesce")
+    _wait_idle(scheduler, "skip")
+
+    assert coalesce.next_run == clock.now + 60
+    assert skip.next_run == 1000.0 + 60 * 4
+    assert coalesce.history[-1].missed_ticks == 2
+    assert coalesce.history[-1].lag == 130
+
+
+def test_timeout_is_recorded_and_errors_do_not_escape():
+    clock = FakeClock()
+    scheduler = JobScheduler(clock=clock)
+    release = threading.Event()
+
+    def boom():
+        raise RuntimeError("graph down")
+
+    scheduler.add_job("stalled", release.wait, 60, timeout_seconds=30, run_immediately=True)
+    scheduler.add_job("broken", boom, 60, run_immediately=True)
+    scheduler.tick()
+    _wait_idle(scheduler, "broken")
+
+    clock.now += 31
+    scheduler.tick()
+    release.set()
+    _wait_idle(scheduler, "stalled")
+
+    assert scheduler.jobs["stalled"].history[-1].status == "timeout"
+    assert scheduler.jobs["broken"].history[-1].status == "error"
+    assert scheduler.jobs["broken"].history[-1].error == "graph down"
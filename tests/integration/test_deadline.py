@@ -0,0 +1,142 @@
+"""Integration test: one per-target deadline bounds the dossier pipeline."""
+
+import json
+import sys
+import time
+import types
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+ANALYST_ROOT = PROJECT_ROOT / "agents" / "analyst"
+
+for path in (str(PROJECT_ROOT), str(ANALYST_ROOT)):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from agents.analyst.analyst import generate_dossier
+from agents.daemon import pipeline
+from agents.analyst.sources.v2_lite.recon import PerplexityReconClient
+from agents.analyst.sources.v2_lite.synthesis import SynthesisEngine
+from shared.deadline import DOSSIER_DEADLINE_SECONDS, Deadline, DeadlineExceeded
+from shared.events import EventQueue, EventWorker
+
+
+def test_calls_get_the_remaining_budget():
+    deadline = Deadline(5)
+    assert 4 < deadline.timeout(10) <= 5
+    assert deadline.timeout(2) == 2
+    assert not deadline.allows(20) and not deadline.partial
+
+    deadline.expires_at = time.time() + 0.5
+    with pytest.raises(DeadlineExceeded):
+        deadline.timeout(10)
+
+    unbounded = Deadline(0)
+    assert unbounded.timeout(30) == 30 and unbounded.to_dict()["remaining_seconds"] is None
+
+
+def test_recon_and_synthesis_skip_when_the_budget_runs_out():
+    deadline = Deadline(60)
+    client = PerplexityReconClient(api_key="test")
+    response = MagicMock()
+    response.json.return_value = {"choices": []}
+
+    def slow_post(*args, **kwargs):
+        assert kwargs["timeout"] <= 30
+        deadline.expires_at = time.time()  # the first query used up the budget
+        return response
+
+    with patch.object(client.session, "post", side_effect=slow_post) as post, \
+            patch("agents.analyst.sources.v2_lite.recon.time.sleep"):
+        recon = client.execute_recon("Slow College", "12-3456789", deadline=deadline)
+
+    assert post.call_count == 1
+    assert recon["raw_results"]["leadership"]["status"] == "skipped"
+    assert deadline.skipped == ["recon:leadership", "recon:accreditation"]
+
+    engine = SynthesisEngine.__new__(SynthesisEngine)
+    engine.model, engine.system_prompt, engine.client = "claude-3-haiku-20240307", "system", MagicMock()
+    extracted = engine.extract_signals(recon["raw_results"], "Slow College", deadline=deadline)
+
+    engine.client.messages.create.assert_not_called()
+    assert extracted["status"] == "skipped"
+    assert deadline.skipped[-1] == "synthesis"
+
+
+class APITimeoutError(Exception):
+    """Stand-in for anthropic.APITimeoutError (anthropic is optional here)."""
+
+
+def test_calls_that_time_out_on_the_budget_are_skipped_stages():
+    deadline = Deadline(60)
+    client = PerplexityReconClient(api_key="test")
+    response = MagicMock()
+    response.json.return_value = {"choices": []}
+
+    with patch.object(client.session, "post",
+                      side_effect=[requests.exceptions.ReadTimeout("read timed out"),
+                                   requests.exceptions.ConnectionError("refused"), response]), \
+            patch("agents.analyst.sources.v2_lite.recon.time.sleep"):
+        recon = client.execute_recon("Slow College", "12-3456789", deadline=deadline)
+
+    assert recon["raw_results"]["enrollment_financial"]["status"] == "error"
+    assert deadline.skipped == ["recon:enrollment_financial"]  # a refused connection is not the deadline
+
+    engine = SynthesisEngine.__new__(SynthesisEngine)
+    engine.model, engine.system_prompt, engine.client = "claude-3-haiku-20240307", "system", MagicMock()
+    engine.client.messages.create.side_effect = APITimeoutError("Request timed out.")
+    extracted = engine.extract_signals(recon["raw_results"], "Slow College", deadline=deadline)
+
+    assert extracted["status"] == "error"
+    assert deadline.skipped == ["recon:enrollment_financial", "synthesis"]
+
+
+def test_dossier_is_marked_partial_when_v2_does_not_fit(tmp_path):
+    financials = {"filing_year": 2023, "total_revenue": 50_000_000, "total_expenses": 52_000_000,
+                  "net_assets": 30_000_000}
+    with patch("sources.propublica.ProPublicaAPI.get_organization_financials",
+               return_value=(financials, {"name": "Slow College", "state": "OH"})) as fetch, \
+            patch("agents.analyst.core.enhance_profile_with_v2_lite") as enhance, \
+            patch("agents.analyst.analyst.write_through"):
+        result = generate_dossier(target_name="Slow College", ein="12-3456789", output_dir=str(tmp_path),
+                                  enable_v2_lite=True, deadline=Deadline(10))
+
+    assert fetch.call_args.kwargs["timeout"] <= 10
+    enhance.assert_not_called()
+    assert result["partial"]
+    meta = json.loads(Path(result["json"]).read_text())["meta"]
+    assert meta["partial"] and meta["deadline"]["skipped_stages"] == ["v2_lite"]
+
+
+def _outreach(statuses):
+    """Stand-in agents.outreach module (the real one needs anthropic)."""
+    architect = MagicMock()
+    architect.process_prospect.side_effect = [{"status": status, "reason": "Deadline exceeded"}
+                                              for status in statuses]
+    return types.SimpleNamespace(OutreachArchitect=lambda: architect), architect
+
+
+def test_outreach_starts_its_own_deadline_at_dequeue(tmp_path, monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test")
+    queue = EventQueue(tmp_path / "events.db")
+    queue.publish(pipeline.DOSSIER_TOPIC, {"name": "Queued College", "ein": "12-3456789", "json": "p.json",
+                                           "markdown": "d.md"})
+    module, architect = _outreach(["skipped", "success"])
+    worker = EventWorker(queue, pipeline.DOSSIER_TOPIC, pipeline.handle_dossier)
+    later = time.time() + 3600  # an hour of backlog
+
+    with patch.dict(sys.modules, {"agents.outreach": module}), patch("time.time", return_value=later):
+        worker.process(queue.claim(pipeline.DOSSIER_TOPIC))
+        assert queue.counts()[pipeline.DOSSIER_TOPIC] == {"pending": 1}  # skipped is nacked, not acked
+
+    with patch.dict(sys.modules, {"agents.outreach": module}), patch("time.time", return_value=later + 600):
+        worker.process(queue.claim(pipeline.DOSSIER_TOPIC))
+        deadline = architect.process_prospect.call_args.kwargs["deadline"]
+        assert deadline.remaining() == pytest.approx(DOSSIER_DEADLINE_SECONDS)
+
+    assert architect.process_prospect.call_count == 2
+    assert queue.counts()[pipeline.DOSSIER_TOPIC] == {"done": 1}
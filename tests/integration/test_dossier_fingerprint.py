@@ -0,0 +1,152 @@
+"""Integration test: dossier regeneration is skipped when the inputs are unchanged."""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+ANALYST_ROOT = PROJECT_ROOT / "agents" / "analyst"
+
+for path in (str(PROJECT_ROOT), str(ANALYST_ROOT)):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from agents.analyst.analyst import generate_dossier
+from agents.daemon import pipeline
+
+FINANCIALS = {"filing_year": 2023, "total_revenue": 50_000_000, "total_expenses": 52_000_000,
+              "net_assets": 30_000_000}
+ORG_INFO = {"name": "Fingerprint College", "state": "OH"}
+
+
+def _run(tmp_path, financials, **kwargs):
+    with patch("sources.propublica.ProPublicaAPI.get_organization_financials",
+               return_value=(dict(financials), dict(ORG_INFO))), \
+            patch("agents.analyst.analyst.write_through") as write_through:
+        result = generate_dossier(target_name="Fingerprint College", ein="12-3456789",
+                                  output_dir=str(tmp_path), **kwargs)
+    return result, write_through
+
+
+def test_unchanged_inputs_touch_nothing(tmp_path):
+    first, _ = _run(tmp_path, FINANCIALS)
+    assert first["status"] == "written"
+    json_path, md_path = Path(first["json"]), Path(first["markdown"])
+    fingerprint = json.loads(json_path.read_text())["meta"]["input_fingerprint"]
+    mtimes = (json_path.stat().st_mtime_ns, md_path.stat().st_mtime_ns)
+
+    second, write_through = _run(tmp_path, FINANCIALS)
+    assert second["status"] == "unchanged"
+    assert (json_path.stat().st_mtime_ns, md_path.stat().st_mtime_ns) == mtimes
+    write_through.assert_not_called()
+
+    moved, _ = _run(tmp_path, {**FINANCIALS, "total_expenses": 55_000_000})
+    assert moved["status"] == "written"
+    assert json.loads(json_path.read_text())["meta"]["input_fingerprint"] != fingerprint
+
+    assert _run(tmp_path, {**FINANCIALS, "total_expenses": 55_000_000}, force=True)[0]["status"] == "written"
+
+
+def test_missing_dossier_forces_rewrite(tmp_path):
+    first, _ = _run(tmp_path, FINANCIALS)
+    Path(first["markdown"]).unlink()
+    assert _run(tmp_path, FINANCIALS)[0]["status"] == "written"
+
+
+def test_pipeline_does_not_redraft_outreach_for_unchanged_dossiers():
+    queue = MagicMock()
+    unchanged = {"json": "p.json", "markdown": "d.md", "elapsed_seconds": 0.1, "status": "unchanged"}
+    with patch("analyst.generate_dossier", return_value=unchanged):
+        pipeline.handle_prospect({"name": "Fingerprint College", "ein": "12-3456789"}, queue)
+    queue.publish.assert_not_called()
+
+    first = {"ein": "12-3456789", "name": "Fingerprint College", "materiality": "new", "changes": [],
+             "fingerprint": "abc"}
+    with patch("analyst.generate_dossier", return_value={**unchanged, "status": "written", "change": first}):
+        pipeline.handle_prospect({"name": "Fingerprint College", "ein": "12-3456789"}, queue)
+    assert queue.publish.call_args[0][0] == pipeline.DOSSIER_TOPIC
+
+
+def _enhance(finding):
+    def enhance(v1_profile, **kwargs):
+        intel = {"leadership_changes": {"finding": finding, "source": "https://news.example/cfo",
+                                        "credibility": "HIGH"}}
+        return {**v1_profile, "v2_signals": {"real_time_intel": intel, "composite_score": 80,
+                                             "urgency_flag": "HIGH"}}
+    return enhance
+
+
+def test_v2_runs_skip_paid_calls_when_v1_inputs_are_unchanged(tmp_path):
+    with patch("agents.analyst.core.enhance_profile_with_v2_lite", side_effect=_enhance("CFO resigned")) as enhance:
+        first, _ = _run(tmp_path, FINANCIALS, enable_v2_lite=True)
+        second, _ = _run(tmp_path, FINANCIALS, enable_v2_lite=True)
+        assert first["status"] == "written" and second["status"] == "unchanged"
+        assert enhance.call_count == 1
+
+        # Only the dossier is missing: rewritten from the stored V2 block
+        Path(first["markdown"]).unlink()
+        assert _run(tmp_path, FINANCIALS, enable_v2_lite=True)[0]["status"] == "written"
+        assert enhance.call_count == 1
+    assert json.loads(Path(first["json"]).read_text())["v2_signals"]["composite_score"] == 80
+
+
+def test_reworded_v2_prose_with_the_same_sources_is_not_a_change(tmp_path):
+    with patch("agents.analyst.core.enhance_profile_with_v2_lite", side_effect=_enhance("CFO resigned")):
+        first, _ = _run(tmp_path, FINANCIALS, enable_v2_lite=True)
+    with patch("agents.analyst.core.enhance_profile_with_v2_lite", side_effect=_enhance("The CFO stepped down")):
+        _run(tmp_path, {**FINANCIALS, "total_expenses": 55_000_000}, enable_v2_lite=True)
+
+    intel = json.loads(Path(first["json"]).read_text())["v2_signals"]["real_time_intel"]
+    assert intel["leadership_changes"]["finding"] == "CFO resigned"
+
+
+def test_failed_v2_phase_is_retried_on_the_next_run(tmp_path):
+    missing_key = ValueError("PERPLEXITY_API_KEY not found in environment or constructor")
+    with patch("agents.analyst.core.enhance_profile_with_v2_lite", side_effect=missing_key) as enhance:
+        first, _ = _run(tmp_path, FINANCIALS, enable_v2_lite=True)
+        second, _ = _run(tmp_path, FINANCIALS, enable_v2_lite=True)
+    assert first["status"] == second["status"] == "written"
+    assert enhance.call_count == 2
+    assert json.loads(Path(first["json"]).read_text())["meta"]["v2_status"] == "failed"
+
+
+def test_degraded_v2_intel_is_not_reused(tmp_path):
+    timed_out = {"status": "error", "error": "Read timed out.", "timed_out": True}
+    recon = {"raw_results": {key: dict(timed_out) for key in ("enrollment_financial", "leadership", "accreditation")},
+             "queries_executed": 0}
+    failed = {"signals": {}, "status": "error", "error": "Request timed out."}
+    succeeded = {"signals": {"leadership_changes": {"finding": "CFO resigned", "source": "https://news.example/cfo",
+                                                    "credibility": "TRUSTED"}}, "status": "success"}
+    gate = MagicMock()
+    gate.admit.return_value = {"run": True}
+
+    with patch("agents.analyst.core.orchestrator.get_v2_gate", return_value=gate), \
+            patch("agents.analyst.core.orchestrator.execute_recon", return_value=recon), \
+            patch("agents.analyst.core.orchestrator.extract_signals", side_effect=[failed, failed, succeeded]):
+        first, _ = _run(tmp_path, FINANCIALS, enable_v2_lite=True)
+        profile = json.loads(Path(first["json"]).read_text())
+        assert profile["meta"]["v2_status"] == "failed"
+        assert profile["metadata"]["v2_failed_stages"] == ["recon:enrollment_financial", "recon:leadership",
+                                                           "recon:accreditation", "synthesis"]
+        assert _run(tmp_path, FINANCIALS, enable_v2_lite=True)[0]["status"] == "written"
+
+        recon["raw_results"] = {key: {"status": "success", "response": {}} for key in recon["raw_results"]}
+        assert _run(tmp_path, FINANCIALS, enable_v2_lite=True)[0]["status"] == "written"
+        assert "v2_status" not in json.loads(Path(first["json"]).read_text())["meta"]
+        assert _run(tmp_path, FINANCIALS, enable_v2_lite=True)[0]["status"] == "unchanged"
+
+
+def _benchmarks(pct, peers):
+    return {"slices": ["all"], "metrics": {"expense_ratio": {"value": 1.04, "slices": {
+        "all": {"peers": peers, "worse_than_pct": pct}}}}}
+
+
+def test_peer_position_moves_refresh_the_dossier(tmp_path):
+    with patch("agents.analyst.analyst.peer_benchmarks", return_value=_benchmarks(61, 40)):
+        first, _ = _run(tmp_path, FINANCIALS)
+    with patch("agents.analyst.analyst.peer_benchmarks", return_value=_benchmarks(64, 41)):
+        assert _run(tmp_path, FINANCIALS)[0]["status"] == "unchanged"  # same decile, one more peer
+    with patch("agents.analyst.analyst.peer_benchmarks", return_value=_benchmarks(72, 45)):
+        assert _run(tmp_path, FINANCIALS)[0]["status"] == "written"
+    assert "Worse than 72%" in Path(first["markdown"]).read_text()
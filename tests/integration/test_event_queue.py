@@ -0,0 +1,75 @@
+"""Integration test: durable SQLite event queue and pipeline hand-off."""
+
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared.events import EventQueue, EventWorker
+
+
+def test_publish_claim_ack_and_dedupe(tmp_path):
+    queue = EventQueue(tmp_path / "events.db")
+
+    first = queue.publish("signal.detected", {"title": "A"}, dedupe_key="task:1")
+    assert queue.publish("signal.detected", {"title": "A again"}, dedupe_key="task:1") is None
+    assert queue.is_open("task:1")
+
+    event = queue.claim("signal.detected")
+    assert event.id == first and event.payload == {"title": "A"} and event.attempts == 1
+    assert queue.claim("signal.detected") is None, "leased event was handed out twice"
+
+    queue.ack(event.id)
+    assert not queue.is_open("task:1")
+    assert queue.counts() == {"signal.detected": {"done": 1}}
+
+
+def test_crash_recovery_reoffers_leased_events(tmp_path):
+    db = tmp_path / "events.db"
+    queue = EventQueue(db)
+    queue.publish("prospect.identified", {"ein": "231352607"})
+    assert queue.claim("prospect.identified") is not None
+    queue.close()  # process "crashes" without acking
+
+    restarted = EventQueue(db)
+    assert restarted.claim("prospect.identified") is None
+    assert restarted.recover(all_leases=True) == 1
+    event = restarted.claim("prospect.identified")
+    assert event.payload == {"ein": "231352607"} and event.attempts == 2
+
+
+def test_nack_retries_then_dead_letters(tmp_path):
+    queue = EventQueue(tmp_path / "events.db", max_attempts=2)
+    queue.publish("dossier.generated", {"json": "x.json"})
+
+    queue.nack(queue.claim("dossier.generated").id, "boom", retry_delay=0)
+    queue.nack(queue.claim("dossier.generated").id, "boom", retry_delay=0)
+
+    assert queue.claim("dossier.generated") is None
+    assert queue.counts() == {"dossier.generated": {"dead": 1}}
+
+
+def test_worker_chains_stages_within_seconds(tmp_path):
+    queue = EventQueue(tmp_path / "events.db")
+    seen = []
+
+    def research(payload, q):
+        q.publish("prospect.identified", {"ein": payload["ein"]})
+
+    workers = [
+        EventWorker(queue, "signal.detected", research, idle_seconds=0.05),
+        EventWorker(queue, "prospect.identified", lambda p, q: seen.append(p["ein"]), idle_seconds=0.05),
+    ]
+    for worker in workers:
+        worker.start()
+
+    queue.publish("signal.detected", {"ein": "63-0373104"})
+    deadline = time.time() + 2
+    while not seen and time.time() < deadline:
+        time.sleep(0.01)
+    for worker in workers:
+        worker.stop()
+
+    assert seen == ["63-0373104"]
@@ -0,0 +1,91 @@
+"""Integration test: multi-year financial trends from a single ProPublica response."""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+ANALYST_ROOT = PROJECT_ROOT / "agents" / "analyst"
+
+for path in (str(PROJECT_ROOT), str(ANALYST_ROOT)):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from agents.analyst.analyst import determine_distress_level, generate_dossier
+from agents.orchestrator.tools import get_most_recent_filing
+from sources.propublica import ProPublicaAPI
+from sources.trends import compute_trend, filing_history
+
+
+def _filing(year, revenue, expenses, net_assets):
+    return {"tax_prd_yr": year, "totrevenue": revenue, "totfuncexpns": expenses,
+            "totnetassetend": net_assets, "totassetsend": net_assets * 2}
+
+
+# Listed out of order, with an amended 2021 return after the original
+FILINGS = [
+    _filing(2021, 48_000_000, 50_000_000, 36_000_000),
+    _filing(2023, 45_000_000, 52_000_000, 28_000_000),
+    _filing(2020, 50_000_000, 49_000_000, 38_000_000),
+    _filing(2022, 46_000_000, 51_000_000, 32_000_000),
+    _filing(2021, 1, 1, 1),
+]
+
+
+def test_history_and_trend_metrics():
+    history = filing_history(FILINGS)
+    assert history["years"] == [2020, 2021, 2022, 2023]
+    assert history["revenue"][1] == 48_000_000
+
+    trend = compute_trend(history)
+    assert trend["years_covered"] == 4
+    assert trend["revenue_cagr"] == round((45 / 50) ** (1 / 3) - 1, 4)
+    assert trend["expense_cagr"] > 0
+    assert (trend["deficit_years"], trend["consecutive_deficit_years"]) == (3, 3)
+    assert trend["net_asset_burn_per_year"] == round(10_000_000 / 3)
+    assert [p["runway_years"] for p in trend["runway_trajectory"]] == [None, 18.0, 6.4, 4.0]
+    assert trend["runway_direction"] == "shortening"
+
+    assert compute_trend(None)["years_covered"] == 0
+
+
+def test_latest_filing_is_max_year_and_history_is_kept():
+    response = MagicMock()
+    response.json.return_value = {"organization": {"name": "Trend College", "state": "PA"},
+                                  "filings_with_data": FILINGS}
+    api = ProPublicaAPI()
+    with patch.object(api.session, "get", return_value=response):
+        financial_data, _ = api.get_organization_financials("12-3456789")
+
+    assert financial_data["filing_year"] == 2023
+    assert financial_data["history"]["years"] == [2020, 2021, 2022, 2023]
+    assert get_most_recent_filing({"filings_with_data": FILINGS})["tax_prd_yr"] == 2023
+    assert get_most_recent_filing({"filings_with_data": []}) is None
+
+
+def test_deficit_streak_raises_distress():
+    streak = {"consecutive_deficit_years": 3}
+    assert determine_distress_level(0.98, None, []) == "watch"
+    assert determine_distress_level(0.98, None, [], streak) == "elevated"
+
+
+@patch("sources.propublica.ProPublicaAPI.get_organization_financials")
+def test_profile_carries_trend_block(mock_get_financials, tmp_path):
+    latest = FILINGS[1]
+    financial_data = {
+        "filing_year": 2023,
+        "total_revenue": latest["totrevenue"],
+        "total_expenses": latest["totfuncexpns"],
+        "net_assets": latest["totnetassetend"],
+        "history": filing_history(FILINGS),
+    }
+    mock_get_financials.return_value = (financial_data, {"name": "Trend College", "state": "PA"})
+
+    with patch("agents.analyst.analyst.write_through"):
+        paths = generate_dossier(target_name="Trend College", ein="12-3456789",
+                                 output_dir=str(tmp_path), enable_v2_lite=False)
+
+    profile = json.loads(Path(paths["json"]).read_text(encoding="utf-8"))
+    assert profile["financials"]["trend"]["consecutive_deficit_years"] == 3
+    assert "Multi-Year Trend (FY2020–FY2023)" in Path(paths["markdown"]).read_text(encoding="utf-8")
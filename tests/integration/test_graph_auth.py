@@ -0,0 +1,72 @@
+"""Integration test: process-wide Graph token manager (MSAL mocked)."""
+
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared import auth
+
+
+def _manager_with(result):
+    authenticator = MagicMock()
+    authenticator.acquire_token.return_value = result
+    manager = auth.GraphTokenManager()
+    manager._authenticator = authenticator
+    return manager, authenticator
+
+
+def test_token_is_served_from_memory_until_near_expiry():
+    manager, authenticator = _manager_with({"access_token": "tok-1", "expires_in": 3600})
+
+    tokens = [manager.get_token() for _ in range(50)]
+
+    assert set(tokens) == {"tok-1"}
+    assert authenticator.acquire_token.call_count == 1
+
+
+def test_token_refreshes_inside_margin():
+    manager, authenticator = _manager_with({"access_token": "tok-1", "expires_in": 3600})
+    manager.get_token()
+
+    with patch("shared.auth.time.time", return_value=10**12):
+        authenticator.acquire_token.return_value = {"access_token": "tok-2", "expires_in": 3600}
+        assert manager.get_token() == "tok-2"
+    assert authenticator.acquire_token.call_count == 2
+
+
+def test_concurrent_callers_trigger_single_refresh():
+    manager, authenticator = _manager_with({"access_token": "tok-1", "expires_in": 3600})
+    threads = [threading.Thread(target=manager.get_token) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert authenticator.acquire_token.call_count == 1
+
+
+def test_headers_are_a_fresh_dict_each_call():
+    manager, _ = _manager_with({"access_token": "tok-1", "expires_in": 3600})
+    with patch.object(auth.GraphTokenManager, "instance", return_value=manager):
+        first = auth.get_graph_headers()
+        first["If-Match"] = "etag"
+        second = auth.get_graph_headers()
+
+    assert second == {"Authorization": "Bearer tok-1", "Content-Type": "application/json"}
+
+
+def test_cache_file_written_only_when_msal_state_changes(tmp_path):
+    cache_path = tmp_path / "token_cache.json"
+    with patch.object(auth, "TOKEN_CACHE_PATH", cache_path), \
+         patch("shared.auth.msal.PublicClientApplication"):
+        authenticator = auth.GraphAuthenticator()
+        authenticator._save_token_cache()
+        assert not cache_path.exists()
+
+        authenticator._token_cache.has_state_changed = True
+        authenticator._save_token_cache()
+        assert cache_path.exists()
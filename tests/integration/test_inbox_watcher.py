@@ -0,0 +1,83 @@
+"""Integration test: Sentinel inbox watcher (inotify + polling fallback)."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from agents.sentinel.inbox_watcher import InboxWatcher
+
+
+class _Collector:
+    def __init__(self):
+        self.batches = []
+        self.event = threading.Event()
+
+    def __call__(self, paths):
+        self.batches.append(paths)
+        self.event.set()
+
+
+def _write(path, text):
+    path.write_text(text, encoding="utf-8")
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_inotify_dispatches_closed_files_in_one_debounced_batch(tmp_path):
+    collector = _Collector()
+    watcher = InboxWatcher(tmp_path, collector, debounce_seconds=0.1).start()
+    try:
+        assert watcher.backend == "inotify"
+        started = time.monotonic()
+        _write(tmp_path / "a.md", "# A")
+        time.sleep(0.06)  # within the quiet period: pushes the batch deadline back
+        _write(tmp_path / "b.md", "# B")
+        _write(tmp_path / "ignored.txt", "nope")
+        assert collector.event.wait(2), "no batch dispatched"
+        latency = time.monotonic() - started
+    finally:
+        watcher.stop()
+
+    assert latency < 1.0
+    assert [Path(p).name for p in collector.batches[0]] == ["a.md", "b.md"]
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_startup_files_share_the_debounced_batch(tmp_path):
+    collector = _Collector()
+    _write(tmp_path / "existing.md", "# Already here")
+    watcher = InboxWatcher(tmp_path, collector, debounce_seconds=0.2).start()
+    try:
+        _write(tmp_path / "new.md", "# New")
+        assert collector.event.wait(2), "no batch dispatched"
+        time.sleep(0.3)
+    finally:
+        watcher.stop()
+
+    assert [[Path(p).name for p in batch] for batch in collector.batches] == [["existing.md", "new.md"]]
+
+
+def test_polling_fallback_waits_for_stable_files(tmp_path):
+    collector = _Collector()
+    _write(tmp_path / "existing.md", "# Already here")
+    watcher = InboxWatcher(tmp_path, collector, poll_seconds=0.1, use_inotify=False).start()
+    try:
+        assert watcher.backend == "polling"
+        # Files present at startup are dispatched straight away
+        assert collector.event.wait(2)
+        assert [Path(p).name for p in collector.batches[0]] == ["existing.md"]
+
+        collector.event.clear()
+        _write(tmp_path / "new.md", "# New")
+        assert collector.event.wait(2)
+    finally:
+        watcher.stop()
+
+    names = [Path(p).name for batch in collector.batches for p in batch]
+    assert names.count("existing.md") == 1
+    assert names.count("new.md") == 1
@@ -0,0 +1,102 @@
+"""Integration test: Planner Janitor paging, dedupe and batched deletes (Graph mocked)."""
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from agents.orchestrator import janitor
+
+
+def _task(task_id, title, created):
+    return {"id": task_id, "title": title, "createdDateTime": created, "@odata.etag": f'W/"{task_id}"'}
+
+
+def _page(items, next_link=None):
+    response = MagicMock()
+    response.json.return_value = {"value": items, **({"@odata.nextLink": next_link} if next_link else {})}
+    return response
+
+
+def _batch_response(payload):
+    response = MagicMock()
+    responses = []
+    for sub in payload["requests"]:
+        if sub["method"] == "GET":
+            task_id = sub["url"].split("/")[3]
+            url = "https://a.example/story" if task_id != "t4" else "https://b.example/other"
+            body = {"description": f"Triggered by Watchdog V2.2.\nSource: {url}"}
+            responses.append({"id": sub["id"], "status": 200, "body": body})
+        else:
+            responses.append({"id": sub["id"], "status": 204})
+    response.json.return_value = {"responses": responses}
+    return response
+
+
+def _run(dry_run):
+    pages = [
+        _page([_task("t1", "[🔴 DISTRESS] College Cuts Budget...", "2026-01-02T00:00:00Z"),
+               _task("t2", "[🔴 DISTRESS] college cuts budget", "2026-01-01T00:00:00Z")],
+              next_link="https://graph.microsoft.com/v1.0/next"),
+        _page([_task("t3", "[🔴 DISTRESS] College cuts budget!", "2026-01-03T00:00:00Z"),
+               _task("t4", "[🔴 DISTRESS] College Cuts Budget", "2026-01-04T00:00:00Z"),
+               _task("t5", "Unique task", "2026-01-05T00:00:00Z")]),
+    ]
+    post = MagicMock(side_effect=lambda url, headers, json, timeout: _batch_response(json))
+
+    with patch.object(janitor, "get_graph_headers", return_value={"Authorization": "Bearer x"}), \
+         patch("shared.graph.session.get", side_effect=pages) as get, \
+         patch("shared.graph.session.post", post):
+        report = janitor.cleanup_duplicates(bucket_id="bucket", dry_run=dry_run)
+    return report, get, post
+
+
+def test_normalize_title_ignores_case_punctuation_and_tags():
+    assert janitor.normalize_title("[🔴 DISTRESS] College Cuts Budget...") == \
+        janitor.normalize_title("[🔴 DISTRESS] college cuts  budget")
+
+
+def test_cleanup_pages_dedupes_on_title_and_source_and_batches_deletes():
+    report, get, post = _run(dry_run=False)
+
+    assert get.call_count == 2, "nextLink page was not followed"
+    assert report["tasks_scanned"] == 5
+    # t4 has a different source URL, t5 a unique title -> kept; t2 is oldest original
+    assert sorted(d["id"] for d in report["duplicates"]) == ["t1", "t3"]
+    assert all(d["original_id"] == "t2" for d in report["duplicates"])
+    assert report["deleted"] == 2
+
+    delete_payload = post.call_args_list[-1].kwargs["json"]["requests"]
+    assert [r["method"] for r in delete_payload] == ["DELETE", "DELETE"]
+    assert delete_payload[0]["headers"]["If-Match"].startswith('W/"')
+
+
+def test_cleanup_dry_run_reports_without_deleting():
+    report, _, post = _run(dry_run=True)
+
+    assert report["dry_run"] is True
+    assert len(report["duplicates"]) == 2
+    assert report["deleted"] == 0
+    methods = [r["method"] for call in post.call_args_list for r in call.kwargs["json"]["requests"]]
+    assert "DELETE" not in methods
+
+
+def test_tasks_without_fetched_details_are_never_deleted():
+    tasks = [_task("t1", "College Cuts Budget", "2026-01-01T00:00:00Z"),
+             _task("t2", "College Cuts Budget", "2026-01-02T00:00:00Z"),
+             _task("t3", "College Cuts Budget", "2026-01-03T00:00:00Z")]
+
+    # t2 and t3 failed to fetch: same title, unknown source -> both kept
+    duplicates, kept = janitor.find_duplicates(tasks, {"t1": "Source: https://a.example/story"})
+    assert duplicates == [] and kept == 3
+
+
+def test_retry_after_accepts_fractions_and_http_dates():
+    from shared.graph import retry_after_seconds
+
+    assert retry_after_seconds("1.5") == 1.5
+    assert retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert retry_after_seconds("soon", default=2) == 2
+    assert retry_after_seconds(None) == 1.0
@@ -0,0 +1,75 @@
+"""Integration test: Oracle knowledge base FTS5 index."""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared import kb_index, memory
+
+HAND_WRITTEN_SIGNAL = """---
+title: "Test Signal 01"
+source: "West Virginia University"
+tags:
+  - distress
+  - finance
+---
+# Distress Signal: WVU Budget Crisis
+
+WVU has reported a significant budget gap.
+"""
+
+
+def _index(tmp_path):
+    kb_root = tmp_path / "knowledge_base"
+    kb_root.mkdir()
+    return kb_root, kb_index.KnowledgeIndex(tmp_path / "kb_index.db", kb_root)
+
+
+def test_frontmatter_parsing_handles_json_metadata_and_lists():
+    meta, body = kb_index.parse_frontmatter(
+        '---\ntitle: "A: B"\nmetadata: {"keyword": "layoffs"}\ntags:\n  - x\n  - y\n---\n\n# Body\n'
+    )
+    assert meta == {"title": "A: B", "metadata": {"keyword": "layoffs"}, "tags": ["x", "y"]}
+    assert body == "# Body\n"
+
+
+def test_saves_are_indexed_and_ranked(tmp_path):
+    kb_root, index = _index(tmp_path)
+    with patch.object(memory, "KB_ROOT", kb_root), patch.object(kb_index, "_index", index), \
+            patch.object(memory, "index_kb_file"):
+        memory.save_signal("Albright College announces layoffs", "Albright College cuts 40 staff.",
+                           signal_type="distress", source_url="https://news.example/a",
+                           metadata={"keyword": "layoffs", "institution": "Albright College"})
+        memory.save_signal("Regional budget roundup", "Several colleges, including Albright College, trim budgets.",
+                           signal_type="distress", source_url="https://news.example/b",
+                           metadata={"keyword": "budget"})
+        memory.save_document_text("Playbook.md", "Turnaround playbook for enrollment decline.")
+
+    hits = index.search("Albright")
+    assert [h["title"] for h in hits][0] == "Albright College announces layoffs"
+    assert len(hits) == 2
+    assert hits[0]["institution"] == "Albright College" and hits[0]["keyword"] == "layoffs"
+
+    assert [h["type"] for h in index.search("enrollment decline")] == ["document_extraction"]
+    assert len(index.search(keyword="budget")) == 1
+    assert index.search("Albright", type="forecast") == []
+
+
+def test_sync_picks_up_manual_files_and_deletions(tmp_path):
+    kb_root, index = _index(tmp_path)
+    signal = kb_root / "signals" / "processed" / "wvu.md"
+    signal.parent.mkdir(parents=True)
+    signal.write_text(HAND_WRITTEN_SIGNAL, encoding="utf-8")
+
+    assert index.sync() == {"indexed": 1, "unchanged": 0, "removed": 0}
+    assert index.sync() == {"indexed": 0, "unchanged": 1, "removed": 0}
+    row = index.about("West Virginia University")[0]
+    assert row["institution"] == "West Virginia University"
+    assert row["keyword"] == "distress finance"
+
+    signal.unlink()
+    assert index.sync()["removed"] == 1
+    assert index.search("budget") == []
@@ -0,0 +1,90 @@
+"""Integration test: Sentinel single-pass markdown -> docx renderer."""
+
+import sys
+from pathlib import Path
+
+from docx import Document
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from agents.sentinel.md_renderer import render_markdown
+
+DOSSIER = """# Prospect Dossier: Example College
+
+---
+
+| Field | Value |
+|-------|------:|
+| **EIN** | 12-3456789 |
+| **Data Source** | IRS Form 990 (2023) |
+
+## Executive Summary
+
+**Institution:** Example College  
+**Health Status:** 🔴 CRITICAL
+
+### Calculated Indicators
+
+#### Notes
+Immediate outreach recommended with emphasis on:
+- Operational triage
+  - Cash-flow review
+    - Weekly forecast
+- Leadership *advisory* support
+
+1. First step
+2. Second step with `code`
+
+> Quoted line one
+> quoted line two
+
+```
+runway = net_assets / deficit
+```
+"""
+
+
+def _render():
+    return render_markdown(Document(), DOSSIER)
+
+
+def test_tables_are_rendered_with_bold_header_and_inline_formatting():
+    doc = _render()
+
+    assert len(doc.tables) == 1
+    table = doc.tables[0]
+    assert [c.text for c in table.rows[0].cells] == ["Field", "Value"]
+    assert all(run.bold for run in table.rows[0].cells[0].paragraphs[0].runs)
+    ein_cell = table.rows[1].cells[0].paragraphs[0]
+    assert ein_cell.text == "EIN" and ein_cell.runs[0].bold
+    assert table.rows[1].cells[1].paragraphs[0].alignment is not None  # ---: right aligned
+
+
+def test_headings_lists_quotes_and_code():
+    doc = _render()
+    styles = [(p.style.name, p.text) for p in doc.paragraphs]
+
+    assert ("Heading 3", "Calculated Indicators") in styles
+    assert ("Heading 4", "Notes") in styles
+    assert ("List Bullet", "Operational triage") in styles
+    assert ("List Bullet 2", "Cash-flow review") in styles
+    assert ("List Bullet 3", "Weekly forecast") in styles
+    assert ("List Number", "Second step with code") in styles
+    assert ("Quote", "Quoted line one quoted line two") in styles
+    assert any(p.text == "runway = net_assets / deficit" for p in doc.paragraphs)
+
+    summary = next(p for p in doc.paragraphs if p.text.startswith("Institution:"))
+    assert summary.runs[0].bold and summary.runs[0].text == "Institution:"
+    assert "Health Status" in summary.text  # hard line break kept in one paragraph
+
+    advisory = next(p for p in doc.paragraphs if p.text == "Leadership advisory support")
+    assert [r.italic for r in advisory.runs] == [None, True, None]
+
+
+def test_heading_keeps_hashes_that_are_part_of_the_text():
+    doc = render_markdown(Document(), "## Why C#\n\n### Closed heading ###\n")
+    styles = [(p.style.name, p.text) for p in doc.paragraphs]
+
+    assert ("Heading 2", "Why C#") in styles
+    assert ("Heading 3", "Closed heading") in styles
@@ -0,0 +1,57 @@
+"""Integration test: Oracle storage layout (partitions, hash suffixes, manifest)."""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared import kb_index, memory
+
+
+@pytest.fixture
+def kb_root(tmp_path):
+    root = tmp_path / "knowledge_base"
+    root.mkdir()
+    with patch.object(memory, "KB_ROOT", root), patch.object(memory, "index_saved_file"), \
+            patch.object(memory, "index_kb_file"):
+        yield root
+
+
+def test_same_headline_from_different_sources_does_not_collide(kb_root):
+    first = memory.save_signal("College Closes", "Story A", source_url="https://a.example/1")
+    second = memory.save_signal("College Closes", "Story B", source_url="https://b.example/2")
+    again = memory.save_signal("College Closes", "Story A", source_url="https://a.example/1")
+
+    assert first != second and first == again
+    partition = datetime.now().strftime("%Y/%m")
+    assert Path(first).parent == kb_root / "signals" / "distress" / partition
+    assert "Story B" in Path(second).read_text(encoding="utf-8")
+    assert not list(kb_root.rglob("*.tmp"))
+
+
+def test_manifest_is_read_incrementally(kb_root):
+    memory.save_signal("One", "a", source_url="https://x/1")
+    memory.save_document_text("Brief.md", "text")
+
+    entries, offset = memory.iter_manifest(0)
+    assert [e["path"].split("/")[0] for e in entries] == ["signals", "docs"]
+    assert all((kb_root / e["path"]).exists() for e in entries)
+
+    # A half-written line is left for the next read
+    with open(kb_root / memory.MANIFEST_NAME, "a", encoding="utf-8") as f:
+        f.write('{"path": "partial')
+    assert memory.iter_manifest(offset) == ([], offset)
+
+
+def test_index_catches_up_from_manifest(kb_root, tmp_path):
+    memory.save_signal("Layoffs at Example College", "Example College cuts staff", source_url="https://x/3")
+    index = kb_index.KnowledgeIndex(tmp_path / "kb.db", kb_root)
+
+    assert index.catch_up() == 1
+    assert index.catch_up() == 0
+    assert index.search("layoffs")[0]["title"] == "Layoffs at Example College"
@@ -0,0 +1,78 @@
+"""Integration test: shared metrics registry, hooks and the /metrics endpoint."""
+
+import sys
+import urllib.request
+from pathlib import Path
+from unittest.mock import MagicMock
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared import metrics
+
+
+def test_histogram_renders_cumulative_buckets_sum_and_count():
+    registry = metrics.Registry()
+    hist = registry.histogram("demo_seconds", "Demo", buckets=(1, 5))
+    hist.observe(0.5, job="Bridge")
+    hist.observe(3, job="Bridge")
+    hist.observe(9, job="Bridge")
+
+    text = registry.render()
+    assert "# TYPE demo_seconds histogram" in text
+    assert 'demo_seconds_bucket{job="Bridge",le="1"} 1' in text
+    assert 'demo_seconds_bucket{job="Bridge",le="5"} 2' in text
+    assert 'demo_seconds_bucket{job="Bridge",le="+Inf"} 3' in text
+    assert 'demo_seconds_sum{job="Bridge"} 12.5' in text
+    assert 'demo_seconds_count{job="Bridge"} 3' in text
+
+
+def test_session_hook_and_track_request_count_status_codes():
+    session = MagicMock()
+    session.hooks = {}
+    metrics.instrument_session(session, "test_http")
+    response = MagicMock(status_code=429)
+    response.elapsed.total_seconds.return_value = 0.2
+    session.hooks["response"][0](response)
+
+    try:
+        with metrics.track_request("test_sdk"):
+            raise TimeoutError("slow")
+    except TimeoutError:
+        pass
+
+    assert metrics.API_REQUESTS.value(provider="test_http", status="429") == 1
+    assert metrics.API_REQUESTS.value(provider="test_sdk", status="TimeoutError") == 1
+    assert metrics.API_LATENCY.count(provider="test_http") == 1
+
+
+def test_session_counts_connection_errors_and_timeouts():
+    import requests
+
+    session = metrics.instrument_session(requests.Session(), "test_unreachable")
+    try:
+        session.get("http://127.0.0.1:9/", timeout=1)
+    except requests.exceptions.ConnectionError:
+        pass
+
+    assert metrics.API_REQUESTS.value(provider="test_unreachable", status="ConnectionError") == 1
+    assert metrics.API_LATENCY.count(provider="test_unreachable") == 1
+
+
+def test_http_endpoint_serves_registry_and_collectors():
+    registry = metrics.Registry()
+    backlog = registry.gauge("demo_backlog", "Demo backlog")
+    registry.register_collector(lambda: backlog.set(7, topic="signal.detected"))
+
+    server = metrics.start_http_server(0, registry=registry)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            body = response.read().decode("utf-8")
+            content_type = response.headers["Content-Type"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert content_type.startswith("text/plain")
+    assert 'demo_backlog{topic="signal.detected"} 7' in body
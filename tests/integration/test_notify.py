@@ -0,0 +1,82 @@
+"""Integration test: background Teams dispatcher (coalescing, retries, bounded queue)."""
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared import notify
+
+
+def _session(*statuses):
+    session = MagicMock()
+    responses = []
+    for status in statuses:
+        response = MagicMock(status_code=status, text="", headers={"Retry-After": "0"} if status == 429 else {})
+        responses.append(response)
+    session.post.side_effect = responses
+    return session
+
+
+def _card(text):
+    return {"type": "message", "text": text}
+
+
+def test_burst_is_coalesced_into_one_digest_per_group():
+    session = _session(202, 202)
+    dispatcher = notify.TeamsDispatcher("https://hook", coalesce_seconds=0.2, session=session)
+
+    for i in range(5):
+        dispatcher.enqueue(_card(f"d{i}"), group="watchdog:DISTRESS", summary=f"College {i}",
+                           url=f"https://news/{i}", digest_title="DISTRESS SIGNALS")
+    dispatcher.enqueue(_card("only"), group="sentinel:published", summary="Report.docx")
+    assert dispatcher.flush(5)
+    dispatcher.close()
+
+    assert session.post.call_count == 2
+    digest = session.post.call_args_list[0].kwargs["json"]
+    texts = [block["text"] for block in digest["attachments"][0]["content"]["body"]]
+    assert texts[0] == "DISTRESS SIGNALS" and len(texts) == 2 + 5
+    assert "[College 0](https://news/0)" in texts[2]
+    # A group with a single card is sent unchanged
+    assert session.post.call_args_list[1].kwargs["json"] == _card("only")
+    assert all(call.kwargs["timeout"] == notify.TIMEOUT for call in session.post.call_args_list)
+
+
+def test_throttled_post_is_retried():
+    session = _session(429, 202)
+    dispatcher = notify.TeamsDispatcher("https://hook", coalesce_seconds=0, session=session)
+
+    with patch.object(notify.time, "sleep"):
+        dispatcher.enqueue(_card("x"), group="g", summary="x")
+        assert dispatcher.flush(5)
+    dispatcher.close()
+
+    assert session.post.call_count == 2
+
+
+def test_full_queue_drops_instead_of_blocking():
+    session = _session()
+    dispatcher = notify.TeamsDispatcher("https://hook", coalesce_seconds=0, max_queue=1, session=session)
+    dispatcher._queue.put(None)  # park the sender thread
+    dispatcher._thread.join(1)
+
+    assert dispatcher.enqueue(_card("a"), group="g", summary="a") is True
+    assert dispatcher.enqueue(_card("b"), group="g", summary="b") is False
+
+
+def test_date_form_retry_after_does_not_break_the_dispatcher():
+    session = MagicMock()
+    throttled = MagicMock(status_code=429, text="", headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+    session.post.side_effect = [throttled, MagicMock(status_code=202)]
+    dispatcher = notify.TeamsDispatcher("https://hook", coalesce_seconds=0, session=session)
+
+    with patch.object(notify.time, "sleep") as sleep:
+        dispatcher.enqueue(_card("x"), group="g", summary="x")
+        assert dispatcher.flush(5)
+    dispatcher.close()
+
+    assert session.post.call_count == 2
+    sleep.assert_called_once_with(0.0)
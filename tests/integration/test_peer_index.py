@@ -0,0 +1,99 @@
+"""Integration test: peer percentile index."""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+ANALYST_ROOT = PROJECT_ROOT / "agents" / "analyst"
+
+for path in (str(PROJECT_ROOT), str(ANALYST_ROOT)):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from agents.analyst.analyst import build_profile_json, generate_markdown_dossier
+from shared import peer_index
+
+
+def _profile(n, expense_ratio, region="midwest", revenue=40_000_000, runway=None):
+    return {
+        "institution": {"name": f"College {n}", "ein": f"{n:09d}", "ntee_code": "B43",
+                        "location": {"region": region}},
+        "financials": {"total_revenue": revenue,
+                       "calculated": {"expense_ratio": expense_ratio, "runway_years": runway}},
+    }
+
+
+def _index(tmp_path):
+    index = peer_index.PeerIndex(tmp_path / "peer_index.json")
+    # Ten midwest peers with expense ratios 0.90 .. 1.08, five in the northeast
+    index.rebuild([_profile(n, 0.90 + 0.02 * n) for n in range(10)] +
+                  [_profile(100 + n, 1.5, region="northeast") for n in range(5)])
+    return index
+
+
+def test_percentiles_by_binary_search(tmp_path):
+    index = _index(tmp_path)
+    assert index.slices["region:midwest"]["expense_ratio"] == sorted(
+        index.slices["region:midwest"]["expense_ratio"])
+
+    # 1.05 is worse (higher) than 8 of 10 midwest peers, better than all northeast ones
+    assert index.percentile("expense_ratio", 1.05, "region:midwest") == {"peers": 10, "worse_than_pct": 80}
+    assert index.percentile("expense_ratio", 1.05, "region:northeast")["worse_than_pct"] == 0
+    assert index.percentile("expense_ratio", 1.05, "revenue:10M-50M")["peers"] == 15
+    # Too few peers to say anything
+    assert index.percentile("expense_ratio", 1.05, "region:west") is None
+
+
+def test_incremental_update_moves_a_member(tmp_path):
+    index = _index(tmp_path)
+    assert index.update(_profile(0, 0.90)) is False  # unchanged
+
+    # College 0 moves from best to worst in the midwest
+    assert index.update(_profile(0, 1.30))
+    values = index.slices["region:midwest"]["expense_ratio"]
+    assert len(values) == 10 and values[-1] == 1.30 and 0.90 not in values
+
+    # Its own value is excluded when benchmarking it
+    result = index.benchmarks(_profile(0, 1.30))
+    assert result["metrics"]["expense_ratio"]["slices"]["region:midwest"] == {"peers": 9, "worse_than_pct": 100}
+
+    index.save()
+    reloaded = peer_index.PeerIndex(tmp_path / "peer_index.json")
+    assert reloaded.slices == index.slices and reloaded.members == index.members
+
+
+def test_profile_and_dossier_embed_benchmarks(tmp_path):
+    index = _index(tmp_path)
+    financial_data = {"filing_year": 2023, "total_revenue": 40_000_000, "total_expenses": 42_000_000,
+                      "net_assets": 10_000_000}
+    org_info = {"name": "Benchmark College", "state": "OH", "ntee_code": "B43"}
+
+    with patch.object(peer_index, "_index", index):
+        profile = build_profile_json("Benchmark College", "98-7654321", financial_data, [], org_info)
+
+    midwest = profile["benchmarks"]["metrics"]["expense_ratio"]["slices"]["region:midwest"]
+    assert midwest == {"peers": 10, "worse_than_pct": 80}
+    assert "ntee:B43" in profile["benchmarks"]["slices"]
+
+    dossier = generate_markdown_dossier("Benchmark College", "98-7654321", financial_data, [], profile)
+    assert "### Peer Benchmarking" in dossier
+    assert "| **Expense Ratio** | midwest | Worse than 80% | 10 |" in dossier
+
+
+def test_writers_in_different_processes_keep_each_others_members(tmp_path):
+    # Daemon and sweep each hold their own index object over one file
+    daemon = peer_index.PeerIndex(tmp_path / "peer_index.json")
+    sweep = peer_index.PeerIndex(tmp_path / "peer_index.json")
+
+    assert daemon.write_through(_profile(1, 0.95))
+    assert sweep.write_through(_profile(2, 1.05))
+    assert daemon.write_through(_profile(3, 1.10))
+
+    assert set(peer_index.PeerIndex(tmp_path / "peer_index.json").members) == {
+        "000000001", "000000002", "000000003"}
+
+    # A long-running reader picks up the other writer's members before benchmarking
+    with patch.object(peer_index, "_index", sweep):
+        peer_index.benchmarks(_profile(4, 1.0))
+    assert "000000003" in sweep.members
@@ -0,0 +1,112 @@
+"""Integration test: profile change detection and material-delta events."""
+
+import copy
+import json
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+ANALYST_ROOT = PROJECT_ROOT / "agents" / "analyst"
+
+for path in (str(PROJECT_ROOT), str(ANALYST_ROOT)):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from agents.analyst.analyst import generate_dossier
+from agents.daemon import pipeline
+from shared import profile_diff
+
+BASE = {
+    "institution": {"name": "Delta College", "ein": "12-3456789"},
+    "financials": {"fiscal_year": 2022, "calculated": {"expense_ratio": 0.98, "runway_years": None},
+                   "trend": {"consecutive_deficit_years": 0}},
+    "signals": {"distress_level": "watch"},
+    "v2_signals": {
+        "composite_score": 50, "urgency_flag": "MONITOR",
+        "real_time_intel": {"leadership_changes": {"finding": "No change", "credibility": "UNTRUSTED"}},
+    },
+}
+
+
+def _moved(**edits):
+    profile = copy.deepcopy(BASE)
+    for path, value in edits.items():
+        target = profile
+        keys = path.split("__")
+        for key in keys[:-1]:
+            target = target[key]
+        target[keys[-1]] = value
+    return profile
+
+
+def test_rerun_with_same_data_is_not_a_change():
+    assert profile_diff.diff_profiles(BASE, copy.deepcopy(BASE)) == []
+    assert profile_diff.change_event(BASE, copy.deepcopy(BASE)) is None
+
+
+def test_changes_are_classified_by_materiality():
+    current = _moved(signals__distress_level="critical",
+                     financials__calculated__expense_ratio=1.25,
+                     financials__calculated__runway_years=3.0,
+                     financials__fiscal_year=2023)
+    current["v2_signals"]["composite_score"] = 70
+    current["v2_signals"]["real_time_intel"]["leadership_changes"] = {
+        "finding": "CFO resigned", "credibility": "TRUSTED"}
+
+    by_field = {c["field"]: c for c in profile_diff.diff_profiles(BASE, current)}
+    assert by_field["distress_level"]["note"] == "escalated"
+    assert by_field["composite_score"]["materiality"] == "material"
+    assert by_field["runway_years"]["note"] == "entered deficit"
+    assert by_field["expense_ratio"]["materiality"] == "material"
+    assert by_field["leadership_changes"]["note"] == "new trusted signal"
+    assert by_field["fiscal_year"]["materiality"] == "minor"
+
+    event = profile_diff.change_event(BASE, current)
+    assert event["materiality"] == "material" and profile_diff.is_material(event)
+
+
+def test_runway_loss_and_de_escalation():
+    before = _moved(financials__calculated__runway_years=5.0, signals__distress_level="elevated")
+    lost = _moved(financials__calculated__runway_years=2.8, signals__distress_level="elevated")
+    assert profile_diff.change_event(before, lost)["changes"][0]["note"] == "-2.2 years"
+
+    calmer = _moved(financials__calculated__runway_years=5.2, signals__distress_level="watch")
+    event = profile_diff.change_event(before, calmer)
+    assert event["materiality"] == "moderate" and not profile_diff.is_material(event)
+
+
+def test_analyst_reports_changes_and_pipeline_acts_only_on_material_ones(tmp_path):
+    def run(total_expenses):
+        financials = {"filing_year": 2023, "total_revenue": 50_000_000,
+                      "total_expenses": total_expenses, "net_assets": 30_000_000}
+        with patch("sources.propublica.ProPublicaAPI.get_organization_financials",
+                   return_value=(financials, {"name": "Delta College", "state": "OH"})), \
+                patch("agents.analyst.analyst.write_through"):
+            return generate_dossier(target_name="Delta College", ein="12-3456789", output_dir=str(tmp_path))
+
+    first = run(49_000_000)
+    assert first["change"]["materiality"] == "new"
+
+    # Small cost increase: still a surplus, distress unchanged -> nothing worth acting on
+    tweak = run(49_500_000)
+    assert tweak["status"] == "written" and tweak["change"] is None
+
+    # Deficit with 5 years of runway -> elevated, runway appears
+    worse = run(56_000_000)
+    assert worse["change"]["materiality"] == "material"
+    assert json.loads(Path(worse["json"]).read_text())["signals"]["distress_level"] == "elevated"
+
+    queue = MagicMock()
+    for result, expected_topics in ((tweak, []), (worse, [profile_diff.PROFILE_CHANGED_TOPIC, pipeline.DOSSIER_TOPIC])):
+        queue.reset_mock()
+        with patch("analyst.generate_dossier", return_value=result):
+            pipeline.handle_prospect({"name": "Delta College", "ein": "12-3456789"}, queue)
+        assert [c[0][0] for c in queue.publish.call_args_list] == expected_topics
+
+    with patch.object(pipeline, "TEAMS_WEBHOOK_URL", "https://teams.example/hook"), \
+            patch.object(pipeline.notify, "enqueue") as enqueue:
+        pipeline.handle_profile_change(worse["change"], queue)
+        pipeline.handle_profile_change({**worse["change"], "materiality": "moderate"}, queue)
+    assert enqueue.call_count == 1
+    assert "runway_years" in enqueue.call_args[1]["summary"]
@@ -0,0 +1,126 @@
+"""Integration test: delta-encoded profile history."""
+
+import copy
+import multiprocessing
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared import profile_history
+
+EIN = "23-1352650"
+
+
+def _profile(day, score, urgency="MONITOR", distress="watch"):
+    return {
+        "meta": {"generated_at": f"2026-{day}T06:00:00Z"},
+        "institution": {"name": "Albright College", "ein": EIN, "location": {"state": "PA"}},
+        "financials": {"fiscal_year": 2023, "calculated": {"runway_years": 4.0, "expense_ratio": 1.05},
+                       "notes": ["long text " * 200]},
+        "signals": {"distress_level": distress},
+        "v2_signals": {"composite_score": score, "urgency_flag": urgency,
+                       "real_time_intel": {"leadership_changes": {"finding": "None", "credibility": "N/A"}}},
+    }
+
+
+def _record_year(history):
+    versions = []
+    for month, score, urgency in (("01-10", 40, "MONITOR"), ("02-10", 55, "HIGH"),
+                                  ("03-05", 62, "HIGH"), ("03-28", 81, "IMMEDIATE"), ("04-15", 90, "IMMEDIATE")):
+        profile = _profile(month, score, urgency)
+        versions.append(profile)
+        assert history.append(profile, at=f"2026-{month}T06:00:00+00:00") is not None
+    return versions
+
+
+def test_versions_round_trip_and_time_travel(tmp_path):
+    history = profile_history.ProfileHistory(tmp_path, snapshot_every=3)
+    versions = _record_year(history)
+
+    assert [e["kind"] for e in history.versions(EIN)] == ["snapshot", "delta", "delta", "snapshot", "delta"]
+    for number, expected in enumerate(versions, start=1):
+        assert history.get(EIN, version=number) == expected
+    assert history.get("231352650") == versions[-1]
+
+    # "What was the composite score in March?" -> last version recorded in March
+    assert history.get(EIN, at="2026-03")["v2_signals"]["composite_score"] == 81
+    assert history.get(EIN, at="2025-12") is None
+
+
+def test_series_from_index_and_from_deltas(tmp_path):
+    history = profile_history.ProfileHistory(tmp_path, snapshot_every=3)
+    _record_year(history)
+
+    urgency = history.series(EIN, "v2_signals.urgency_flag")
+    assert [value for _, value in urgency] == ["MONITOR", "HIGH", "HIGH", "IMMEDIATE", "IMMEDIATE"]
+
+    # Untracked path: replayed from deltas, without reconstructing documents
+    with patch.object(profile_history, "apply", side_effect=AssertionError("documents rebuilt")):
+        generated = history.series(EIN, "meta.generated_at")
+        intel = history.series(EIN, "v2_signals.real_time_intel.leadership_changes.finding")
+    assert generated[2] == ("2026-03-05T06:00:00+00:00", "2026-03-05T06:00:00Z")
+    assert {value for _, value in intel} == {"None"}
+
+
+def test_deltas_stay_small_and_reruns_are_not_recorded(tmp_path):
+    history = profile_history.ProfileHistory(tmp_path)
+    first = _profile("01-10", 40)
+    history.append(first)
+    assert history.append(copy.deepcopy(first)) is None
+
+    for day in range(1, 29):
+        history.append(_profile(f"02-{day:02d}", 40 + day % 3))
+
+    entries = history.versions(EIN)
+    snapshot, deltas = entries[0], entries[1:]
+    assert all(entry["kind"] == "delta" for entry in deltas)
+    assert max(entry["length"] for entry in deltas) * 10 < snapshot["length"]
+
+    # A second process appending sees the latest version from disk
+    other = profile_history.ProfileHistory(tmp_path)
+    other.append(_profile("03-01", 99))
+    assert history.append(_profile("03-02", 12)) == len(entries) + 2
+    assert history.get(EIN)["v2_signals"]["composite_score"] == 12
+
+
+def test_torn_index_line_is_ignored(tmp_path):
+    history = profile_history.ProfileHistory(tmp_path)
+    history.append(_profile("01-10", 40))
+    history.append(_profile("01-11", 45))
+    with open(tmp_path / "231352650.index.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"v": 3, "at": "2026-')
+
+    assert len(history.versions(EIN)) == 2
+    assert history.get(EIN)["v2_signals"]["composite_score"] == 45
+
+    # The next append replaces the torn tail instead of merging with it
+    assert history.append(_profile("01-12", 50)) == 3
+    assert [e["v"] for e in history.versions(EIN)] == [1, 2, 3]
+    assert history.get(EIN, version=3)["v2_signals"]["composite_score"] == 50
+
+
+def _append_versions(root, offset):
+    history = profile_history.ProfileHistory(root)
+    for day in range(1, 11):
+        history.append(_profile(f"05-{day:02d}", offset + day))
+
+
+def test_concurrent_processes_append_consistent_versions(tmp_path):
+    profile_history.ProfileHistory(tmp_path).append(_profile("04-30", 0))
+    ctx = multiprocessing.get_context("spawn")
+    workers = [ctx.Process(target=_append_versions, args=(tmp_path, offset)) for offset in (100, 200)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+
+    history = profile_history.ProfileHistory(tmp_path)
+    entries = history.versions(EIN)
+    assert [e["v"] for e in entries] == list(range(1, 22))
+    scores = [history.get(EIN, version=e["v"])["v2_signals"]["composite_score"] for e in entries]
+    # Every version rebuilds to the profile recorded under it
+    assert scores == [e["fields"]["v2_signals.composite_score"] for e in entries]
+    assert sorted(scores[1:]) == [offset + day for offset in (100, 200) for day in range(1, 11)]
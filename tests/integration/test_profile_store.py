@@ -0,0 +1,70 @@
+"""Integration test: SQLite prospect profile store."""
+
+import json
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared import profile_store
+
+
+def _analyst_profile(name, ein, region, runway, score, urgency, distress="critical"):
+    return {
+        "meta": {"generated_at": "2026-01-01T00:00:00Z"},
+        "institution": {"name": name, "ein": ein, "location": {"state": "PA", "region": region}},
+        "financials": {"fiscal_year": 2023, "calculated": {"runway_years": runway, "expense_ratio": 1.1}},
+        "signals": {"distress_level": distress},
+        "v2_signals": {"composite_score": score, "urgency_flag": urgency},
+    }
+
+
+def test_extracts_both_profile_shapes():
+    analyst = profile_store.extract_columns(_analyst_profile("A", "23-1352650", "northeast", 2.5, 91, "IMMEDIATE"))
+    assert analyst["ein"] == "231352650"
+    assert (analyst["composite_score"], analyst["urgency_flag"], analyst["runway_years"]) == (91, "IMMEDIATE", 2.5)
+
+    batch = profile_store.extract_columns({
+        "institution": {"name": "B", "ein": "04-2103589"},
+        "composite_score": 58, "urgency_flag": "HIGH", "v2_signals": [{"type": "signal_0"}],
+    })
+    assert (batch["composite_score"], batch["urgency_flag"], batch["region"]) == (58, "HIGH", None)
+
+
+def test_ranking_filters_on_indexed_columns(tmp_path):
+    store = profile_store.ProfileStore(tmp_path / "profiles.db")
+    store.upsert(_analyst_profile("Northeast Critical", "11-1111111", "northeast", 1.5, 95, "IMMEDIATE"))
+    store.upsert(_analyst_profile("Northeast Long Runway", "22-2222222", "northeast", 8.0, 99, "IMMEDIATE"))
+    store.upsert(_analyst_profile("Southern Critical", "33-3333333", "south", 1.0, 97, "IMMEDIATE"))
+    store.upsert(_analyst_profile("Northeast Watch", "44-4444444", "northeast", 2.0, 60, "HIGH"))
+
+    top = store.rank(urgency="IMMEDIATE", region="northeast", max_runway=3)
+    assert [row["name"] for row in top] == ["Northeast Critical"]
+    assert [row["ein"] for row in store.rank(limit=2)] == ["222222222", "333333333"]
+
+    plan = store._conn.execute(
+        "EXPLAIN QUERY PLAN SELECT ein FROM profiles WHERE urgency_flag = ? ORDER BY composite_score DESC",
+        ("IMMEDIATE",),
+    ).fetchall()
+    assert any("idx_profiles_urgency" in row["detail"] for row in plan)
+
+    # Upserting the same EIN (any formatting) replaces the row
+    store.upsert(_analyst_profile("Northeast Critical", "111111111", "northeast", 1.5, 40, "MONITOR"))
+    assert store.get("11-1111111")["v2_signals"]["urgency_flag"] == "MONITOR"
+    assert store.counts()["IMMEDIATE"] == 2
+
+
+def test_json_files_round_trip(tmp_path):
+    source = tmp_path / "prospects"
+    source.mkdir()
+    profile = _analyst_profile("Albright College", "23-1352650", "northeast", 2.5, 91, "IMMEDIATE")
+    (source / "231352650_profile.json").write_text(json.dumps(profile))
+    (source / "broken_profile.json").write_text("{not json")
+
+    store = profile_store.ProfileStore(tmp_path / "profiles.db")
+    assert store.import_files([source]) == {"imported": 1, "skipped": 1}
+
+    assert store.export(tmp_path / "export") == 1
+    exported = json.loads((tmp_path / "export" / "231352650_profile.json").read_text())
+    assert exported == profile
@@ -0,0 +1,146 @@
+"""Integration test: Sentinel claim protocol, orphan recovery and failure quarantine."""
+
+import os
+import subprocess
+import sys
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from agents.sentinel import converter
+from agents.sentinel.ledger import PublishLedger
+
+
+@pytest.fixture
+def inbox(tmp_path, monkeypatch):
+    inbox = tmp_path / "_INBOX"
+    inbox.mkdir()
+    monkeypatch.setattr(converter, "WATCH_FOLDER", str(inbox))
+    monkeypatch.setattr(converter, "PROCESSING_FOLDER", str(inbox / "processing"))
+    monkeypatch.setattr(converter, "FAILED_FOLDER", str(inbox / "failed"))
+    monkeypatch.setattr(converter, "TARGET_ROOT", str(tmp_path / "out"))
+    monkeypatch.setattr(converter, "TEMPLATE_PATH", str(tmp_path / "Reference.docx"))
+    monkeypatch.setattr(converter, "SENTINEL_WORKERS", 1)
+    monkeypatch.setattr(converter, "LEDGER", PublishLedger(str(tmp_path / "ledger.json")))
+    return inbox
+
+
+def test_claim_is_exclusive(inbox):
+    drop = inbox / "brief.md"
+    drop.write_text("# Brief", encoding="utf-8")
+
+    first = converter.claim_file(str(drop))
+    second = converter.claim_file(str(drop))
+
+    assert first and Path(first).parent.name == "processing"
+    assert second is None
+
+
+def test_orphaned_claims_from_dead_process_are_recovered(inbox):
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    processing = inbox / "processing"
+    processing.mkdir()
+    (processing / f"{dead.pid}__orphan.md").write_text("# Orphan", encoding="utf-8")
+    (processing / f"{os.getpid()}__mine.md").write_text("# Mine", encoding="utf-8")
+
+    assert converter.recover_orphaned_claims() == 1
+    assert (inbox / "orphan.md").exists()
+    assert (processing / f"{os.getpid()}__mine.md").exists()
+
+
+def test_process_inbox_publishes_once_and_quarantines_failures(inbox):
+    (inbox / "good.md").write_text("# Good\n\nBody", encoding="utf-8")
+    (inbox / "bad.md").write_bytes(b"\xff\xfe not utf-8")
+
+    with patch.object(converter, "notify_teams") as notify, \
+         patch.object(converter, "save_document_text", return_value="kb"):
+        published = converter.process_inbox()
+        again = converter.process_inbox()
+
+    assert published == 1 and again == 0
+    assert notify.call_count == 1
+    assert (inbox / "good.md.processed").exists()
+    assert (inbox / "failed" / "bad.md").exists()
+    assert (inbox / "failed" / "bad.md.error.txt").exists()
+    assert not any((inbox / "processing").iterdir())
+    assert len(list((inbox.parent / "out").glob("Report_good_*.docx"))) == 1
+
+
+def test_unchanged_redrop_is_not_republished(inbox):
+    (inbox / "dossier.md").write_text("# Dossier\r\n\r\n| A | B |\r\n|---|---|\r\n| 1 | 2 |\r\n", encoding="utf-8")
+
+    with patch.object(converter, "notify_teams") as notify, \
+         patch.object(converter, "save_document_text", return_value="kb") as archive:
+        assert converter.process_inbox() == 1
+        # Same body, different line endings and trailing whitespace, new name
+        (inbox / "dossier_rerun.md").write_text("# Dossier  \n\n| A | B |\n|---|---|\n| 1 | 2 |\n\n\n", encoding="utf-8")
+        assert converter.process_inbox() == 0
+
+    assert notify.call_count == 1 and archive.call_count == 1
+    assert (inbox / "dossier_rerun.md.processed").exists()
+    assert len(list((inbox.parent / "out").glob("Report_*.docx"))) == 1
+    entry = next(iter(converter.LEDGER._load().values()))
+    assert entry["sources"] == ["dossier.md", "dossier_rerun.md"]
+
+
+class _BrokenPool:
+    """Stands in for a pool whose worker was OOM-killed after the first job."""
+
+    def __init__(self, *args, **kwargs):
+        self.submitted = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, *args):
+        self.submitted += 1
+        future = Future()
+        if self.submitted == 1:
+            future.set_result(fn(*args))
+        else:
+            future.set_exception(BrokenProcessPool("A process in the process pool was terminated abruptly"))
+        return future
+
+
+def test_broken_pool_quarantines_unfinished_claims(inbox, monkeypatch):
+    monkeypatch.setattr(converter, "SENTINEL_WORKERS", 2)
+    (inbox / "a.md").write_text("# A", encoding="utf-8")
+    (inbox / "b.md").write_text("# B", encoding="utf-8")
+
+    with patch.object(converter, "ProcessPoolExecutor", _BrokenPool), \
+         patch.object(converter, "notify_teams"), \
+         patch.object(converter, "save_document_text", return_value="kb"):
+        assert converter.process_inbox() == 1
+
+    [processed] = inbox.glob("*.md.processed")
+    [failed] = (inbox / "failed").glob("*.md")
+    assert {processed.name, failed.name + ".processed"} == {"a.md.processed", "b.md.processed"}
+    assert "BrokenProcessPool" in Path(f"{failed}.error.txt").read_text(encoding="utf-8")
+    assert not any((inbox / "processing").iterdir())
+
+
+def test_ledger_writers_merge_instead_of_overwriting(tmp_path):
+    # Daemon and standalone Sentinel each hold their own ledger object
+    path = str(tmp_path / "ledger.json")
+    daemon, standalone = PublishLedger(path), PublishLedger(path)
+    assert daemon.lookup("a") is None and standalone.lookup("b") is None  # both caches warm
+
+    report = tmp_path / "Report.docx"
+    report.write_bytes(b"docx")
+    daemon.record_published("a", "a.md", str(report))
+    standalone.record_published("b", "b.md", str(report))
+    daemon.record_duplicate("b", "b_again.md")
+
+    assert standalone.lookup("a") is not None
+    assert set(PublishLedger(path)._load()) == {"a", "b"}
+    assert PublishLedger(path)._load()["b"]["sources"] == ["b.md", "b_again.md"]
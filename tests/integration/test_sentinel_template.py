@@ -0,0 +1,42 @@
+"""Integration test: Sentinel template cache (parse once, reload on mtime change)."""
+
+import os
+import sys
+from pathlib import Path
+
+from docx import Document
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from agents.sentinel import converter
+from shared import metrics
+
+
+def _misses():
+    return metrics.CACHE_LOOKUPS.value(cache="sentinel_template", result="miss")
+
+
+def test_template_is_cleaned_once_and_reloaded_when_modified(tmp_path):
+    template = tmp_path / "Reference.docx"
+    doc = Document()
+    doc.add_paragraph("Scaffold text to strip")
+    doc.save(template)
+
+    cache = converter.TemplateCache()
+    before = _misses()
+    first = cache.new_document(str(template))
+    second = cache.new_document(str(template))
+
+    assert _misses() - before == 1
+    assert first is not second
+    assert all(not p.text for p in first.paragraphs)
+
+    # Edits to one conversion's document never leak into the cached bytes
+    first.add_paragraph("only in first")
+    assert all(not p.text for p in cache.new_document(str(template)).paragraphs)
+
+    stat = template.stat()
+    os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    cache.new_document(str(template))
+    assert _misses() - before == 2
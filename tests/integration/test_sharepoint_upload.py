@@ -0,0 +1,139 @@
+"""Integration test: SharePoint upload sessions against a local stand-in server."""
+
+import base64
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+import requests
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from agents.sentinel import uploader
+
+
+def _reference_quick_xor_hash(data):
+    """Byte-at-a-time version of the algorithm, for cross-checking."""
+    register = 0
+    for i, value in enumerate(data):
+        shifted = value << ((i * 11) % 160)
+        register ^= (shifted & ((1 << 160) - 1)) | (shifted >> 160)
+    digest = bytearray(register.to_bytes(20, "little"))
+    for i, byte in enumerate(len(data).to_bytes(8, "little")):
+        digest[12 + i] ^= byte
+    return base64.b64encode(bytes(digest)).decode("ascii")
+
+
+class _StandIn:
+    """Minimal Graph upload-session server: one session, optional injected failure."""
+
+    def __init__(self, fail_put_number=None, wrong_hash=False, retry_after=None):
+        self.received = bytearray()
+        self.puts = 0
+        self.fail_put_number = fail_put_number
+        self.retry_after = retry_after
+        self.wrong_hash = wrong_hash
+        self.auth_on_upload = []
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _json(self, status, body, headers=None):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                assert self.path.endswith(":/createUploadSession")
+                self._json(200, {"uploadUrl": f"http://127.0.0.1:{stand_in.port}/upload/1"})
+
+            def do_GET(self):
+                self._json(200, {"nextExpectedRanges": [f"{len(stand_in.received)}-"]})
+
+            def do_PUT(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                stand_in.puts += 1
+                stand_in.auth_on_upload.append(self.headers.get("Authorization"))
+                if stand_in.puts == stand_in.fail_put_number:
+                    if stand_in.retry_after:
+                        self._json(503, {"error": "throttled"}, {"Retry-After": stand_in.retry_after})
+                    else:
+                        self._json(500, {"error": "transient"})
+                    return
+                start, end_total = self.headers["Content-Range"].split(" ")[1].split("-")
+                end, total = (int(x) for x in end_total.split("/"))
+                assert int(start) == len(stand_in.received), "fragment out of order"
+                stand_in.received.extend(body)
+                if len(stand_in.received) < total:
+                    self._json(202, {"nextExpectedRanges": [f"{end + 1}-"]})
+                    return
+                digest = uploader.quick_xor_hash(bytes(stand_in.received))
+                if stand_in.wrong_hash:
+                    digest = uploader.quick_xor_hash(b"something else")
+                self._json(201, {"id": "item-1", "file": {"hashes": {"quickXorHash": digest}}})
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _upload(tmp_path, monkeypatch, sleeps=None, **stand_in_options):
+    monkeypatch.setattr(uploader.time, "sleep", (sleeps if sleeps is not None else []).append)
+    data = os.urandom(int(uploader.CHUNK_ALIGNMENT * 3.5))
+    path = tmp_path / "Report_test.docx"
+    path.write_bytes(data)
+    stand_in = _StandIn(**stand_in_options)
+    client = uploader.SharePointUploader(
+        drive_id="drive", folder="Reports", base_url=f"http://127.0.0.1:{stand_in.port}/v1.0",
+        headers_fn=lambda: {"Authorization": "Bearer x"}, chunk_size=uploader.CHUNK_ALIGNMENT,
+        http=requests.Session(),
+    )
+    try:
+        return data, stand_in, client.upload(str(path))
+    finally:
+        stand_in.close()
+
+
+def test_quick_xor_hash_matches_reference():
+    for data in (b"", b"a", os.urandom(159), os.urandom(161), os.urandom(5000)):
+        assert uploader.quick_xor_hash(data) == _reference_quick_xor_hash(data)
+
+
+def test_chunked_upload_resumes_after_failed_fragment(tmp_path, monkeypatch):
+    data, stand_in, item = _upload(tmp_path, monkeypatch, fail_put_number=2)
+
+    assert item["id"] == "item-1"
+    assert bytes(stand_in.received) == data
+    assert stand_in.puts == 5  # 4 fragments + 1 retried
+    assert set(stand_in.auth_on_upload) == {None}
+
+
+def test_checksum_mismatch_raises(tmp_path, monkeypatch):
+    with pytest.raises(uploader.UploadError, match="checksum mismatch"):
+        _upload(tmp_path, monkeypatch, wrong_hash=True)
+
+
+def test_http_date_retry_after_is_honoured(tmp_path, monkeypatch):
+    sleeps = []
+    data, stand_in, item = _upload(tmp_path, monkeypatch, sleeps=sleeps, fail_put_number=2,
+                                   retry_after="Wed, 21 Oct 2015 07:28:00 GMT")
+
+    assert bytes(stand_in.received) == data
+    assert sleeps == [0.0]  # a date in the past: retry at once
@@ -0,0 +1,156 @@
+"""Integration test: offline similarity index (hashed TF-IDF + memory-mapped matrix)."""
+
+import json
+import multiprocessing
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+pytest.importorskip("numpy")
+
+from shared import similarity
+
+SIGNALS = {
+    "layoffs": "Albright College announces faculty layoffs and program cuts after enrollment decline",
+    "accreditation": "Regional accreditor places college on probation over financial instability",
+    "athletics": "University breaks ground on new football stadium funded by donor gift",
+}
+
+
+def _profile(name, ein, distress, runway, indicators):
+    return {
+        "institution": {"name": name, "ein": ein, "type": "private_nonprofit", "location": {"state": "PA"}},
+        "financials": {"calculated": {"expense_ratio": 1.3 if distress == "critical" else 0.9,
+                                      "runway_years": runway}},
+        "signals": {"distress_level": distress,
+                    "indicators": [{"type": t, "signal": s} for t, s in indicators]},
+    }
+
+
+def test_query_ranks_related_documents_first(tmp_path):
+    index = similarity.SimilarityIndex(tmp_path / "sim")
+    for doc_id, text in SIGNALS.items():
+        index.add(doc_id, text, kind="signal", title=doc_id)
+
+    hits = index.query("layoffs and program cuts", k=2)
+    # Documents sharing no terms with the query are not returned at all
+    assert [hit["id"] for hit in hits] == ["layoffs"]
+    assert index.similar("layoffs", k=3)[0]["id"] != "layoffs"
+
+
+def test_appends_persist_and_grow_the_memmap(tmp_path, monkeypatch):
+    monkeypatch.setattr(similarity, "INITIAL_CAPACITY", 2)
+    index = similarity.SimilarityIndex(tmp_path / "sim", dimensions=256)
+    for doc_id, text in SIGNALS.items():
+        index.add(doc_id, text, kind="signal")
+    assert index.capacity == 4
+
+    # Re-adding an id replaces its row instead of appending
+    index.add("athletics", "college cancels football program amid budget deficit", kind="signal")
+
+    reopened = similarity.SimilarityIndex(tmp_path / "sim", dimensions=256)
+    assert reopened.count == 3
+    assert reopened.query("football deficit", k=1)[0]["id"] == "athletics"
+    with pytest.raises(ValueError):
+        similarity.SimilarityIndex(tmp_path / "sim", dimensions=512)
+
+
+def test_kind_filter_and_prospect_lookalikes(tmp_path, monkeypatch):
+    index = similarity.SimilarityIndex(tmp_path / "sim")
+    monkeypatch.setattr(similarity, "_index", index)
+    index.add("layoffs", SIGNALS["layoffs"], kind="signal")
+
+    bsc = _profile("Birmingham-Southern College", "63-0288829", "critical", 1.0,
+                   [("financial", "Failed state bridge loan"), ("enrollment", "Enrollment decline")])
+    similar_shape = _profile("Struggling College", "11-1111111", "critical", 1.5,
+                             [("enrollment", "Enrollment decline"), ("financial", "Bridge loan denied")])
+    healthy = _profile("Thriving University", "22-2222222", "stable", 12.0,
+                       [("growth", "Record applications")])
+    for profile in (bsc, similar_shape, healthy):
+        similarity.index_profile(profile)
+
+    assert all(hit["kind"] == "signal" for hit in index.query("enrollment decline", kind="signal"))
+    lookalikes = similarity.similar_prospects(bsc, k=2)
+    assert [hit["id"] for hit in lookalikes][0] == "prospect:111111111"
+    assert "prospect:630288829" not in [hit["id"] for hit in lookalikes]
+
+
+def test_rebuild_from_knowledge_base(tmp_path):
+    kb_root = tmp_path / "knowledge_base"
+    (kb_root / "signals").mkdir(parents=True)
+    (kb_root / "prospects").mkdir()
+    (kb_root / "signals" / "a.md").write_text('---\ntitle: "Layoffs at Albright"\n---\nFaculty layoffs.\n')
+    (kb_root / "prospects" / "630288829_profile.json").write_text(
+        json.dumps(_profile("Birmingham-Southern College", "63-0288829", "critical", 1.0, [])))
+
+    index = similarity.SimilarityIndex(tmp_path / "sim")
+    assert index.rebuild(similarity.knowledge_base_documents(kb_root)) == 2
+    assert {row["kind"] for row in index.rows} == {"signal", "prospect"}
+    assert index.query("albright layoffs", k=1)[0]["title"] == "Layoffs at Albright"
+
+
+def test_replacing_a_document_keeps_document_frequencies_exact(tmp_path):
+    index = similarity.SimilarityIndex(tmp_path / "sim", dimensions=256)
+    for doc_id, text in SIGNALS.items():
+        index.add(doc_id, text, kind="signal")
+    index.add("athletics", "college cancels football program amid budget deficit", kind="signal")
+    index.add("athletics", "college cancels football program amid budget deficit", kind="signal")
+
+    fresh = similarity.SimilarityIndex(tmp_path / "fresh", dimensions=256)
+    fresh.add("layoffs", SIGNALS["layoffs"])
+    fresh.add("accreditation", SIGNALS["accreditation"])
+    fresh.add("athletics", "college cancels football program amid budget deficit")
+    assert (index.df == fresh.df).all()
+    assert (similarity.SimilarityIndex(tmp_path / "sim", dimensions=256).df == fresh.df).all()
+    assert "buckets" not in index.query("football", k=1)[0]
+
+
+def test_saved_signals_are_indexed_incrementally(tmp_path, monkeypatch):
+    from shared import memory
+
+    kb_root = tmp_path / "knowledge_base"
+    kb_root.mkdir()
+    index = similarity.SimilarityIndex(tmp_path / "sim")
+    monkeypatch.setattr(similarity, "_index", index)
+    monkeypatch.setattr(memory, "KB_ROOT", kb_root)
+    monkeypatch.setattr(memory, "index_saved_file", lambda path: None)
+
+    memory.save_signal("Albright College announces layoffs", "Faculty layoffs and program cuts.",
+                       source_url="https://news.example/a")
+
+    [hit] = index.query("layoffs program cuts", kind="signal")
+    assert hit["title"] == "Albright College announces layoffs"
+    assert hit["id"].startswith("kb:signals/distress/")
+
+
+def _add_documents(directory, prefix, n):
+    index = similarity.SimilarityIndex(directory, dimensions=256)
+    for i in range(n):
+        index.add(f"{prefix}{i}", f"{prefix} document number {prefix}{i}", kind="signal")
+
+
+def test_concurrent_writers_never_share_a_row(tmp_path):
+    a = similarity.SimilarityIndex(tmp_path / "sim", dimensions=256)
+    b = similarity.SimilarityIndex(tmp_path / "sim", dimensions=256)  # opened before a writes
+    a.add("kb:A", SIGNALS["layoffs"], kind="signal")
+    b.add("kb:B", SIGNALS["athletics"], kind="signal")
+
+    reopened = similarity.SimilarityIndex(tmp_path / "sim", dimensions=256)
+    assert reopened.count == 2
+    assert reopened.query(SIGNALS["layoffs"], k=1)[0]["id"] == "kb:A"
+    assert reopened.query(SIGNALS["athletics"], k=1)[0]["id"] == "kb:B"
+
+    ctx = multiprocessing.get_context("spawn")
+    workers = [ctx.Process(target=_add_documents, args=(tmp_path / "sim", prefix, 10)) for prefix in ("x", "y")]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+    reopened = similarity.SimilarityIndex(tmp_path / "sim", dimensions=256)
+    assert reopened.count == 22
+    for doc_id in ("x3", "y7"):
+        assert reopened.query(f"document number {doc_id}", k=1)[0]["id"] == doc_id
@@ -0,0 +1,137 @@
+"""Integration test: API spend ledger, budgets and priority admission."""
+
+import json
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from agents.analyst.sources.v2_lite.recon import PerplexityReconClient
+from agents.analyst.sources.v2_lite.synthesis import SynthesisEngine
+from shared import spend
+
+
+def test_calls_are_costed_and_attributed_to_runs(tmp_path):
+    ledger = spend.SpendLedger(tmp_path / "spend.db")
+
+    assert spend.estimate_cost("perplexity", "sonar", 1_000, 1_000) == 0.007
+    assert spend.estimate_cost("anthropic", "claude-3-haiku-20240307", 4_000, 800) == 0.002
+    assert spend.estimate_cost("graph") == 0
+
+    with patch.object(spend, "_ledger", ledger):
+        with spend.run("sweep", budget_usd=1.0) as run_id, spend.target("Albright College"):
+            spend.record_call("perplexity", model="sonar", input_tokens=1_000, output_tokens=1_000, latency_ms=900)
+            spend.record_call("perplexity", model="sonar", status="Timeout", latency_ms=30_000)
+        spend.record_call("graph", status="200", agent="bridge", latency_ms=120)
+        assert spend.current_run() == {}
+
+    assert ledger.spent(run_id=run_id) == 0.007
+    assert ledger.spent() == 0.007
+    by_agent = {row["key"]: row for row in ledger.report(group_by="agent")}
+    assert by_agent["sweep"]["calls"] == 2 and by_agent["bridge"]["cost_usd"] == 0
+    [sweep_run] = ledger.runs()
+    assert sweep_run["run_id"] == run_id and sweep_run["budget_usd"] == 1.0 and sweep_run["calls"] == 2
+
+
+def test_priority_admission_keeps_headroom_for_immediate(tmp_path):
+    ledger = spend.SpendLedger(tmp_path / "spend.db", daily_budget_usd=1.00)
+    ledger.record("anthropic", cost_usd=0.70)
+
+    # MONITOR may only use 75% of the day, HIGH 90%, IMMEDIATE all of it
+    refused = ledger.admit(0.10, "MONITOR")
+    assert not refused["admitted"] and refused["reason"] == "daily_budget"
+    high = ledger.admit(0.10, "HIGH")
+    assert high["admitted"]
+    ledger.release(high["reservation_id"])
+    assert not ledger.admit(0.25, "HIGH")["admitted"]
+    immediate = ledger.admit(0.25, "IMMEDIATE")
+    assert immediate["admitted"]
+    ledger.release(immediate["reservation_id"])
+
+    # A run budget applies on top of the daily one
+    ledger.record("perplexity", cost_usd=0.04, run_id="run-1")
+    decision = ledger.admit(0.05, "IMMEDIATE", run_id="run-1", run_budget_usd=0.08)
+    assert decision["reason"] == "run_budget" and decision["run_spent_usd"] == 0.04
+
+
+def test_v2_clients_record_token_usage(tmp_path):
+    ledger = spend.SpendLedger(tmp_path / "spend.db")
+    response = MagicMock()
+    response.json.return_value = {"choices": [], "usage": {"prompt_tokens": 20, "completion_tokens": 400}}
+
+    with patch.object(spend, "_ledger", ledger), spend.run("analyst"):
+        recon = PerplexityReconClient(api_key="test")
+        with patch.object(recon.session, "post", return_value=response):
+            recon._call_perplexity("query")
+
+        engine = SynthesisEngine.__new__(SynthesisEngine)
+        engine.model, engine.system_prompt = "claude-3-haiku-20240307", "system"
+        engine.client = MagicMock()
+        engine.client.messages.create.return_value = SimpleNamespace(
+            usage=SimpleNamespace(input_tokens=3_000, output_tokens=500),
+            content=[SimpleNamespace(text="{}")],
+        )
+        engine.extract_signals({}, "Albright College")
+
+    by_provider = {row["key"]: row for row in ledger.report(group_by="provider")}
+    assert by_provider["perplexity"]["output_tokens"] == 400
+    assert by_provider["anthropic"]["input_tokens"] == 3_000
+    assert ledger.spent() == round(0.005 + 420 / 1_000_000 + (3_000 * 0.25 + 500 * 1.25) / 1_000_000, 6)
+
+
+def test_admitted_estimates_are_reserved_until_released(tmp_path):
+    # Two processes share one ledger file
+    first = spend.SpendLedger(tmp_path / "spend.db", daily_budget_usd=0.10)
+    second = spend.SpendLedger(tmp_path / "spend.db", daily_budget_usd=0.10)
+
+    decision = first.admit(0.06, "IMMEDIATE")
+    assert decision["admitted"] and decision["reservation_id"] is not None
+    assert second.admit(0.06, "IMMEDIATE")["reason"] == "daily_budget"
+
+    first.record("anthropic", cost_usd=0.03)
+    first.release(decision["reservation_id"])
+    assert second.admit(0.06, "IMMEDIATE")["admitted"]
+    assert first.spent() == 0.03  # reservations never show up as spend
+
+    # A caller that never releases (crashed) holds its estimate only until the TTL
+    assert not first.admit(0.07, "IMMEDIATE")["admitted"]
+    with patch("shared.spend.time.time", return_value=time.time() + spend.RESERVATION_TTL_SECONDS + 1):
+        assert first.admit(0.07, "IMMEDIATE")["admitted"]
+
+
+def test_outreach_generation_is_admitted_and_recorded(tmp_path):
+    pytest.importorskip("anthropic")
+    pytest.importorskip("jsonschema")
+    from agents.outreach.outreach import OutreachArchitect
+
+    ledger = spend.SpendLedger(tmp_path / "spend.db", daily_budget_usd=1.0)
+    architect = OutreachArchitect.__new__(OutreachArchitect)
+    architect.model, architect.system_prompt = "claude-opus-4-1-20250805", "system"
+    architect.client = MagicMock()
+    architect.client.messages.create.return_value = SimpleNamespace(
+        usage=SimpleNamespace(input_tokens=3_000, output_tokens=1_500),
+        content=[SimpleNamespace(text='{"email_1": {}}')],
+    )
+    profile = {"institution": {"name": "Albright College"}, "signals": {"distress_level": "critical"}}
+
+    with patch.object(spend, "_ledger", ledger), \
+            patch.object(architect, "build_generation_prompt", return_value="prompt"):
+        architect.generate_emails(profile)
+    [row] = ledger.report(group_by="agent")
+    assert row["key"] == "outreach" and row["output_tokens"] == 1_500
+
+    # Over budget: outreach is skipped before the paid call
+    ledger.record("anthropic", cost_usd=0.95)
+    path = tmp_path / "profile.json"
+    path.write_text(json.dumps(profile))
+    architect.client.messages.create.reset_mock()
+    with patch.object(spend, "_ledger", ledger), patch.object(architect, "validate_profile"):
+        result = architect.process_prospect(str(path))
+    assert result["status"] == "skipped" and "daily_budget" in result["reason"]
+    architect.client.messages.create.assert_not_called()
@@ -0,0 +1,88 @@
+"""Integration test: national V1 sweep and top-K promotion."""
+
+import csv
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+ANALYST_ROOT = PROJECT_ROOT / "agents" / "analyst"
+
+for path in (str(PROJECT_ROOT), str(ANALYST_ROOT)):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+import sweep
+from shared import spend
+
+# EIN, name, state, NTEE, year, revenue, expenses, net assets
+ROWS = [
+    ("111111111", "Steady College", "OH", "B43", 2023, 50_000_000, 45_000_000, 80_000_000),
+    ("222222222", "Overspent University", "PA", "B43", 2023, 40_000_000, 52_000_000, 10_000_000),
+    ("333333333", "Food Bank", "PA", "K31", 2023, 10_000_000, 20_000_000, 1_000_000),
+    # Three straight deficits, modest ones -> elevated on the streak
+    ("444444444", "Slow Burn College", "IA", "B42", 2021, 30_000_000, 30_500_000, 90_000_000),
+    ("444444444", "Slow Burn College", "IA", "B42", 2022, 30_000_000, 30_500_000, 89_500_000),
+    ("444444444", "Slow Burn College", "IA", "B42", 2023, 30_000_000, 30_500_000, 89_000_000),
+    ("555555555", "Borderline College", "CA", "B43", 2023, 20_000_000, 19_500_000, 5_000_000),
+    ("666666666", "Empty Filer", "CA", "B43", 2023, 0, 0, 0),
+]
+
+
+def _write_extract(path):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["EIN", "NAME", "STATE", "NTEE_CD", "tax_pd", "totrevenue", "totfuncexpns", "totnetassetend"])
+        for ein, name, state, ntee, year, revenue, expenses, net_assets in ROWS:
+            writer.writerow([ein, name, state, ntee, f"{year}06", revenue, expenses, net_assets])
+
+
+def test_extract_is_filtered_grouped_and_ranked(tmp_path):
+    extract = tmp_path / "extract.csv"
+    _write_extract(extract)
+
+    institutions = list(sweep.iter_extract(extract))
+    assert [org["name"] for _, org in institutions] == [
+        "Steady College", "Overspent University", "Slow Burn College", "Borderline College", "Empty Filer"]
+    slow_burn = institutions[2][0]
+    assert slow_burn["filing_year"] == 2023 and slow_burn["history"]["years"] == [2021, 2022, 2023]
+
+    ranked, stats = sweep.sweep(iter(institutions), top_k=3)
+    assert stats["scanned"] == 5 and stats["scored"] == 4
+    assert stats["distress_levels"] == {"stable": 1, "watch": 1, "elevated": 1, "critical": 1}
+    assert [(c["rank"], c["name"], c["distress_level"]) for c in ranked] == [
+        (1, "Overspent University", "critical"),
+        (2, "Slow Burn College", "elevated"),
+        (3, "Borderline College", "watch"),
+    ]
+    assert ranked[0]["expense_ratio"] == 1.3 and ranked[0]["runway_years"] == 0.8
+    assert ranked[1]["consecutive_deficit_years"] == 3 and ranked[1]["region"] == "midwest"
+
+    out = sweep.write_candidates(ranked, tmp_path / "candidates.csv")
+    with open(out, newline="") as f:
+        assert [row["ein"] for row in csv.DictReader(f)] == ["22-2222222", "44-4444444", "55-5555555"]
+
+
+def test_crawl_pages_and_promotes_only_top_k(tmp_path):
+    api = MagicMock()
+    api.search_organizations.side_effect = lambda ntee_id, state=None, page=0: {
+        "num_pages": 2,
+        "organizations": [{"ein": 222222222 + page, "name": f"College {page}", "ntee_code": "B43"},
+                          {"ein": 999999999, "name": "Museum", "ntee_code": "A51"}],
+    }
+    api.get_organization_financials.side_effect = lambda ein: (
+        {"filing_year": 2023, "total_revenue": 10_000_000,
+         "total_expenses": 13_000_000 if ein.endswith("2") else 9_000_000, "net_assets": 5_000_000},
+        {"name": None, "ein": ein, "state": "PA", "ntee_code": "B43"},
+    )
+
+    ranked, stats = sweep.sweep(sweep.crawl_propublica(api, rate=0), top_k=1)
+    assert [call[1]["page"] for call in api.search_organizations.call_args_list] == [0, 1]
+    assert api.get_organization_financials.call_count == 2  # the museum is never fetched
+    assert stats["scored"] == 2
+    assert [c["name"] for c in ranked] == ["College 0"]
+
+    with patch("analyst.generate_dossier", return_value={"status": "written"}) as generate, \
+            patch.object(spend, "_ledger", spend.SpendLedger(tmp_path / "spend.db")):
+        sweep.promote(ranked)
+    generate.assert_called_once_with("College 0", "22-2222222", output_dir=None, enable_v2_lite=True)
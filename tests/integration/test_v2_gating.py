@@ -0,0 +1,68 @@
+"""Integration test: V1-score-driven V2 gating under a spend budget."""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from agents.analyst.core import AnalystV2Orchestrator, V2Gate
+from agents.analyst.sources.v2_lite.classification import calculate_composite_score, reachable_urgency_flags
+from shared import spend
+
+
+@pytest.fixture(autouse=True)
+def ledger(tmp_path):
+    ledger = spend.SpendLedger(tmp_path / "spend.db")
+    with patch.object(spend, "_ledger", ledger):
+        yield ledger
+
+
+def _profile(**signals):
+    return {"institution": {"name": "Gate College"}, "signals": signals}
+
+
+def test_reachable_flags_follow_the_score_caps():
+    assert reachable_urgency_flags(100) == ["IMMEDIATE"]
+    assert reachable_urgency_flags(90) == ["IMMEDIATE"]
+    assert reachable_urgency_flags(85) == ["HIGH", "IMMEDIATE"]
+    assert reachable_urgency_flags(25) == ["MONITOR"]  # 25 + 45 = 70
+    assert reachable_urgency_flags(30) == ["MONITOR", "HIGH"]
+
+    # The Analyst's distress_level feeds the base score when no pain_level is set
+    assert calculate_composite_score({"distress_level": "critical"}, {})["v1_base_score"] == 85
+    assert calculate_composite_score({"pain_level": 40, "distress_level": "critical"}, {})["v1_base_score"] == 40
+
+
+def test_gate_skips_locked_flags_and_enforces_budget():
+    gate = V2Gate(budget_usd=0.10, cost_per_run_usd=0.05)
+
+    assert gate.admit(_profile(pain_level_score=100))["reason"] == "flag_locked"
+    assert gate.admit(_profile(distress_level="stable"))["reason"] == "flag_locked"
+    assert gate.admit(_profile(distress_level="watch"))["run"]
+    assert gate.admit(_profile(distress_level="critical"))["run"]
+    assert gate.admit(_profile(distress_level="elevated"))["reason"] == "budget_exhausted"
+
+    assert gate.report() == {
+        "runs": 2, "spent_usd": 0.1, "budget_usd": 0.10, "remaining_usd": 0.0,
+        "skipped": {"flag_locked": 2, "budget_exhausted": 1}, "skipped_spend_usd": 0.15,
+    }
+
+
+def test_gated_target_makes_no_paid_calls():
+    gate = V2Gate()
+    orchestrator = AnalystV2Orchestrator(enable_v2_lite=True, gate=gate)
+
+    with patch("agents.analyst.core.orchestrator.execute_recon") as recon, \
+            patch("agents.analyst.core.orchestrator.extract_signals") as extract:
+        profile, metadata = orchestrator.run_full_pipeline(_profile(pain_level=95), "Gate College", "12-3456789")
+
+    recon.assert_not_called()
+    extract.assert_not_called()
+    assert metadata["status"] == "gated" and metadata["phases_executed"] == ["V1 only"]
+    assert "v2_signals" not in profile
+    assert profile["metadata"]["v2_gate"]["v1_urgency_flag"] == "IMMEDIATE"
+    assert gate.report()["skipped"] == {"flag_locked": 1}